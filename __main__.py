@@ -5,10 +5,14 @@ Importez les modules nécessaires et démarrez votre programme à partir d'ici.
 """
 from echecs.partie import Partie
 from interface.HUD import Fenetre
+import sys
 
 if __name__ == '__main__':
     # Création d'une instance de Partie.
     p = Partie()
 
+    # Le moteur joue la couleur (blanc ou noir) reçue en argument, s'il y en a une.
+    couleur_moteur = sys.argv[1] if len(sys.argv) > 1 and sys.argv[1] in ('blanc', 'noir') else None
+
     # Création et affichage d'une fenêtre (aucun lien avec la partie ci-haut).
-    Fenetre().mainloop()
+    Fenetre(couleur_moteur=couleur_moteur).mainloop()
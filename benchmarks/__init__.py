@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+"""Package contenant les mesures de temps des règles du jeu (micro-benchmarks). Chaque mesure exécute une fonction
+des règles sur un ensemble fixe de positions, afin que les résultats puissent être comparés d'un changement à l'autre.
+
+Utilisation:
+    python -m benchmarks --sauvegarder reference.json
+    python -m benchmarks --comparer reference.json --seuil 0.1
+
+"""
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""Point d'entrée des mesures de temps: python -m benchmarks --help.
+
+"""
+from benchmarks.regles import MESURES, mesurer, comparer
+from echecs.partie import REPRESENTATIONS
+from argparse import ArgumentParser
+import platform
+import json
+import sys
+
+
+def principal(arguments=None):
+    """Effectue les mesures, les affiche, puis les sauvegarde ou les compare à une référence selon les arguments.
+
+    Args:
+        arguments (list): Les arguments de la ligne de commande, ou None pour utiliser ceux de sys.argv.
+
+    Returns:
+        int: Le code de sortie: 1 si une mesure a ralenti de plus que le seuil, et 0 autrement.
+
+    """
+    analyseur = ArgumentParser(prog='python -m benchmarks', description='Chronomètre les règles du jeu.')
+    analyseur.add_argument('--sauvegarder', metavar='FICHIER', help='enregistre les résultats comme référence (JSON)')
+    analyseur.add_argument('--comparer', metavar='FICHIER', help='compare les résultats à une référence (JSON)')
+    analyseur.add_argument('--seuil', type=float, default=0.1,
+                           help='le ralentissement toléré lors de la comparaison, en fraction (0.1 pour 10%%)')
+    analyseur.add_argument('--repetitions', type=int, default=5, help='le nombre de passages par mesure')
+    analyseur.add_argument('--representation', choices=sorted(REPRESENTATIONS), default='dictionnaire',
+                           help="la représentation de l'échiquier")
+    analyseur.add_argument('mesures', nargs='*', metavar='MESURE',
+                           help='les mesures à effectuer, parmi: {} (toutes par défaut)'.format(', '.join(MESURES)))
+    options = analyseur.parse_args(arguments)
+
+    for nom in options.mesures:
+        if nom not in MESURES:
+            analyseur.error("mesure inconnue: '{}'".format(nom))
+
+    resultats = mesurer(options.representation, options.repetitions, options.mesures)
+
+    for nom, temps in resultats.items():
+        print('{:<45} {:>10.3f} µs'.format(nom, temps))
+
+    if options.sauvegarder:
+        with open(options.sauvegarder, 'w') as fichier:
+            json.dump({'representation': options.representation, 'python': platform.python_version(),
+                       'resultats': resultats}, fichier, indent=4)
+
+    if options.comparer:
+        with open(options.comparer, 'r') as fichier:
+            reference = json.load(fichier)
+
+        if reference['representation'] != options.representation:
+            print("Attention: la référence a été mesurée avec la représentation '{}'."
+                  .format(reference['representation']))
+
+        regressions = comparer(resultats, reference['resultats'], options.seuil)
+        print()
+        for nom, ralentissement in regressions.items():
+            print('RÉGRESSION {:<45} +{:.1%}'.format(nom, ralentissement))
+        if not regressions:
+            print('Aucune régression au-delà de {:.0%}.'.format(options.seuil))
+        else:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(principal())
@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""Module contenant les mesures de temps des fonctions des règles du jeu, ainsi que les positions sur lesquelles elles
+sont exécutées.
+
+Chaque mesure est exprimée en microsecondes par opération: le temps total d'un passage sur toutes les positions est
+divisé par le nombre d'appels effectués. Le meilleur temps de plusieurs passages est conservé, puisque c'est celui
+qui est le moins affecté par le reste du système.
+
+"""
+from echecs.partie import Partie, REPRESENTATIONS
+from echecs.piece import TYPES_PIECES, position_split
+from echecs.cases import CASES
+from time import perf_counter
+
+# Les positions mesurées, sous forme de déplacements à jouer à partir de la position de départ. Elles ne doivent pas
+# être modifiées, sans quoi les résultats ne peuvent plus être comparés à ceux d'une référence existante.
+POSITIONS = {
+    'depart': (),
+    'ouverture': (('e2', 'e4'), ('e7', 'e5'), ('g1', 'f3'), ('b8', 'c6'), ('f1', 'c4'), ('g8', 'f6')),
+    'milieu': (('e2', 'e4'), ('d7', 'd5'), ('e4', 'd5'), ('d8', 'd5'), ('b1', 'c3'), ('d5', 'a5'), ('d2', 'd4'),
+               ('c7', 'c6'), ('g1', 'f3'), ('c8', 'g4'), ('f1', 'e2'), ('e7', 'e6'), ('c1', 'd2'), ('f8', 'b4'),
+               ('f3', 'e5'), ('g4', 'e2'), ('d1', 'e2'), ('b4', 'c3'), ('d2', 'c3'), ('a5', 'a2')),
+}
+
+
+def construire_echiquiers(representation):
+    """Construit un échiquier pour chacune des positions mesurées.
+
+    Args:
+        representation (str): La représentation de l'échiquier (voir REPRESENTATIONS).
+
+    Returns:
+        list: Les échiquiers, dans l'ordre de POSITIONS.
+
+    """
+    echiquiers = []
+    for deplacements in POSITIONS.values():
+        echiquier = REPRESENTATIONS[representation]()
+        for position_source, position_cible in deplacements:
+            echiquier.deplacer(position_source, position_cible)
+        echiquiers.append(echiquier)
+
+    return echiquiers
+
+
+def _paires_depuis_pieces(echiquiers, condition=lambda piece: True):
+    """Retourne, pour chaque échiquier, les paires formées de la position de chaque pièce respectant une condition et
+    de chacune des 64 positions de l'échiquier.
+
+    Args:
+        echiquiers (list): Les échiquiers.
+        condition (function): La condition que doit respecter une pièce.
+
+    Returns:
+        list: Pour chaque échiquier, une paire (échiquier, liste de paires (position source, position cible)).
+
+    """
+    return [(echiquier, [(position_source, position_cible)
+                         for position_source, piece in echiquier.dictionnaire_pieces.items() if condition(piece)
+                         for position_cible in CASES])
+            for echiquier in echiquiers]
+
+
+def _mesure_position_split(echiquiers):
+    paires = [paire for _, paires_echiquier in _paires_depuis_pieces(echiquiers) for paire in paires_echiquier]
+
+    def executer():
+        for position_source, position_cible in paires:
+            position_split(position_source, position_cible)
+
+    return executer, len(paires)
+
+
+def _mesure_piece(type_piece, nom_methode):
+    def construire(echiquiers):
+        paires = [(echiquier.dictionnaire_pieces[position_source], position_source, position_cible)
+                  for echiquier, paires_echiquier in
+                  _paires_depuis_pieces(echiquiers, lambda piece: isinstance(piece, type_piece))
+                  for position_source, position_cible in paires_echiquier]
+
+        def executer():
+            for piece, position_source, position_cible in paires:
+                getattr(piece, nom_methode)(position_source, position_cible)
+
+        return executer, len(paires)
+
+    return construire
+
+
+def _mesure_echiquier(nom_methode):
+    def construire(echiquiers):
+        paires = _paires_depuis_pieces(echiquiers)
+
+        def executer():
+            for echiquier, paires_echiquier in paires:
+                methode = getattr(echiquier, nom_methode)
+                for position_source, position_cible in paires_echiquier:
+                    methode(position_source, position_cible)
+
+        return executer, sum(len(paires_echiquier) for _, paires_echiquier in paires)
+
+    return construire
+
+
+def _mesure_deplacer(echiquiers):
+    # Chaque déplacement valide est effectué, puis défait afin de retrouver la position mesurée.
+    deplacements = [(echiquier, [deplacement for couleur in ('blanc', 'noir')
+                                 for deplacement in echiquier.generer_deplacements(couleur)])
+                    for echiquier in echiquiers]
+
+    def executer():
+        for echiquier, deplacements_echiquier in deplacements:
+            for position_source, position_cible in deplacements_echiquier:
+                piece_prise = echiquier.recuperer_piece_a_position(position_cible)
+                echiquier.deplacer(position_source, position_cible)
+                echiquier.annuler_deplacement(position_source, position_cible, piece_prise)
+
+    return executer, sum(len(deplacements_echiquier) for _, deplacements_echiquier in deplacements)
+
+
+def _mesure_joueur_suivant(echiquiers):
+    partie = Partie()
+    appels = 1000
+
+    def executer():
+        for _ in range(appels):
+            partie.joueur_suivant()
+
+    return executer, appels
+
+
+# Les mesures, par nom. Chacune construit, à partir des échiquiers mesurés, la fonction à chronométrer et le nombre
+# d'opérations qu'elle effectue.
+MESURES = {'position_split': _mesure_position_split}
+for _type_piece in TYPES_PIECES:
+    for _nom_methode in ('peut_se_deplacer_vers', 'peut_faire_une_prise_vers'):
+        MESURES['{}.{}'.format(_type_piece.__name__, _nom_methode)] = _mesure_piece(_type_piece, _nom_methode)
+for _nom_methode in ('chemin_libre_entre_positions', 'deplacement_est_valide'):
+    MESURES['Echiquier.{}'.format(_nom_methode)] = _mesure_echiquier(_nom_methode)
+MESURES['Echiquier.deplacer'] = _mesure_deplacer
+MESURES['Partie.joueur_suivant'] = _mesure_joueur_suivant
+
+
+def mesurer(representation='dictionnaire', repetitions=5, noms=None):
+    """Chronomètre les mesures demandées.
+
+    Args:
+        representation (str): La représentation de l'échiquier (voir REPRESENTATIONS).
+        repetitions (int): Le nombre de passages effectués pour chaque mesure. Le meilleur temps est conservé.
+        noms (list): Les noms des mesures à effectuer, ou None pour les effectuer toutes.
+
+    Returns:
+        dict: Pour chaque mesure, le temps en microsecondes par opération.
+
+    """
+    echiquiers = construire_echiquiers(representation)
+    resultats = {}
+
+    for nom in noms or MESURES:
+        executer, operations = MESURES[nom](echiquiers)
+        meilleur_temps = float('inf')
+        for _ in range(repetitions):
+            debut = perf_counter()
+            executer()
+            meilleur_temps = min(meilleur_temps, perf_counter() - debut)
+        resultats[nom] = meilleur_temps * 1e6 / operations
+
+    return resultats
+
+
+def comparer(resultats, reference, seuil):
+    """Compare des résultats à ceux d'une référence, et retourne les mesures qui ont ralenti de plus que le seuil. Les
+    mesures absentes de la référence sont ignorées.
+
+    Args:
+        resultats (dict): Les temps mesurés, par nom de mesure.
+        reference (dict): Les temps de référence, par nom de mesure.
+        seuil (float): Le ralentissement toléré, en fraction du temps de référence (0.1 pour 10%).
+
+    Returns:
+        dict: Pour chaque mesure qui a ralenti, le ralentissement en fraction du temps de référence.
+
+    """
+    return {nom: temps / reference[nom] - 1 for nom, temps in resultats.items()
+            if nom in reference and temps > reference[nom] * (1 + seuil)}
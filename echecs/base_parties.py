@@ -0,0 +1,349 @@
+# -*- coding: utf-8 -*-
+"""Module contenant la base de parties: un fichier SQLite où chaque partie est conservée avec ses déplacements, et où
+chaque position atteinte est indexée par sa clé de Zobrist (voir le module zobrist). Trouver toutes les parties qui
+ont atteint une position ne demande alors qu'une recherche dans un index, quel que soit le nombre de parties.
+
+Le schéma contient deux tables:
+    parties: les en-têtes principaux de chaque partie, sa position de départ en notation FEN (NULL pour la position
+        de départ habituelle), et ses déplacements, encodés sur deux octets chacun (voir sauvegarde.encoder_deplacement).
+    positions: une ligne par position atteinte dans chaque partie (la clé, la partie et le numéro du demi-déplacement).
+        Sa clé primaire commence par la clé de la position, et la table est sans rowid: les lignes d'une même position
+        sont rangées ensemble dans le fichier.
+
+Les parties sont ajoutées par lots (voir TAILLE_LOT), chacun dans une seule transaction.
+
+Utilisation:
+    python -m echecs.base_parties base.db importer archive.pgn
+    python -m echecs.base_parties base.db chercher "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - - 0 1"
+
+"""
+from echecs.echiquier import Echiquier
+from echecs.fen import lire_fen, FEN_DEPART
+from echecs.sauvegarde import encoder_deplacement, decoder_deplacement
+from echecs.pgn import lire_fichier_pgn
+from echecs.exceptions import ExceptionDeplacer
+from argparse import ArgumentParser
+from collections import Counter
+from time import perf_counter
+import sqlite3
+import struct
+
+# Le nombre de parties ajoutées dans chaque transaction.
+TAILLE_LOT = 1000
+
+# Les réglages de la connexion: la journalisation WAL permet de lire pendant une écriture, et la synchronisation
+# NORMAL n'écrit sur le disque qu'aux points de contrôle du WAL. Les tailles sont en kibioctets (cache) et en octets.
+PRAGMAS = ('PRAGMA journal_mode = WAL', 'PRAGMA synchronous = NORMAL', 'PRAGMA temp_store = MEMORY',
+           'PRAGMA cache_size = -65536', 'PRAGMA mmap_size = 268435456')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parties (
+    id INTEGER PRIMARY KEY,
+    evenement TEXT,
+    date TEXT,
+    blanc TEXT,
+    noir TEXT,
+    resultat TEXT,
+    fen TEXT,
+    deplacements BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS positions (
+    cle INTEGER NOT NULL,
+    partie INTEGER NOT NULL,
+    ply INTEGER NOT NULL,
+    PRIMARY KEY (cle, partie, ply)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS parties_blanc ON parties (blanc);
+CREATE INDEX IF NOT EXISTS parties_noir ON parties (noir);
+"""
+
+# Les en-têtes PGN conservés, dans l'ordre des colonnes de la table parties.
+ENTETES_CONSERVEES = ('Event', 'Date', 'White', 'Black', 'Result')
+
+COULEUR_ADVERSE = {'blanc': 'noir', 'noir': 'blanc'}
+
+
+def _cle_signee(cle):
+    # SQLite conserve des entiers signés de 64 bits: les clés de 2**63 et plus deviennent négatives.
+    return cle - (1 << 64) if cle >> 63 else cle
+
+
+class PartieBase:
+    """Une partie lue dans la base.
+
+    Attributes:
+        identifiant (int): L'identifiant de la partie dans la base.
+        entetes (dict): Les en-têtes conservés (voir ENTETES_CONSERVEES), ainsi que FEN si la partie ne commence pas à
+            la position de départ habituelle.
+        deplacements (list): Les déplacements, sous forme de paires (position source, position cible).
+
+    """
+    __slots__ = ('identifiant', 'entetes', 'deplacements')
+
+    def __init__(self, identifiant, entetes, deplacements):
+        self.identifiant = identifiant
+        self.entetes = entetes
+        self.deplacements = deplacements
+
+    def __repr__(self):
+        return 'PartieBase({}: {} - {}, {} déplacements)'.format(self.identifiant, self.entetes.get('White'),
+                                                                  self.entetes.get('Black'), len(self.deplacements))
+
+
+class BaseParties:
+    """Une base de parties. Elle doit être fermée avec la méthode fermer, ou utilisée dans un bloc with.
+
+    Args:
+        chemin (str): Le chemin du fichier de la base. Il est créé, avec son schéma, s'il n'existe pas.
+
+    """
+
+    def __init__(self, chemin):
+        self.connexion = sqlite3.connect(chemin)
+        for pragma in PRAGMAS:
+            self.connexion.execute(pragma)
+        self.connexion.executescript(SCHEMA)
+        # L'échiquier sur lequel les parties ajoutées sont rejouées.
+        self._echiquier = Echiquier({})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_exception, exception, trace):
+        self.fermer()
+
+    def __len__(self):
+        return self.connexion.execute('SELECT COUNT(*) FROM parties').fetchone()[0]
+
+    @staticmethod
+    def _encoder(echiquier, deplacements):
+        """Rejoue une partie pour encoder ses déplacements et retrouver la clé de chacune de ses positions.
+
+        Args:
+            echiquier (Echiquier): L'échiquier, à la position de départ de la partie.
+            deplacements (list): Les déplacements, sous forme de paires (position source, position cible).
+
+        Returns:
+            tuple: Les déplacements encodés, et la clé signée de chaque position, de la position de départ à la
+                position finale.
+
+        Raises:
+            ExceptionDeplacer: Si un déplacement n'a pas de pièce à sa position source.
+
+        """
+        codes = []
+        cles = [_cle_signee(echiquier.cle_hash)]
+
+        for position_source, position_cible in deplacements:
+            piece = echiquier.recuperer_piece_a_position(position_source)
+            if piece is None:
+                raise ExceptionDeplacer("Il n'y a pas de pièce à la position {}".format(position_source))
+            codes.append(encoder_deplacement(position_source, position_cible,
+                                             echiquier.effectuer_deplacement(position_source, position_cible)))
+            echiquier.definir_trait(COULEUR_ADVERSE[piece.couleur])
+            cles.append(_cle_signee(echiquier.cle_hash))
+
+        return struct.pack('<{}H'.format(len(codes)), *codes), cles
+
+    def ajouter_parties(self, parties, taille_lot=TAILLE_LOT):
+        """Ajoute des parties à la base, par lots de taille_lot parties, chacun dans une transaction.
+
+        Args:
+            parties (iterable): Les parties, chacune avec un attribut entetes (un dictionnaire d'en-têtes PGN, dont FEN
+                pour une position de départ différente de l'habituelle) et un attribut deplacements (une liste de
+                paires (position source, position cible)), par exemple celles du module pgn.
+            taille_lot (int): Le nombre de parties ajoutées dans chaque transaction.
+
+        Returns:
+            int: Le nombre de parties ajoutées.
+
+        Raises:
+            FenInvalide: Si la position de départ d'une partie n'est pas valide.
+            ExceptionDeplacer: Si un déplacement n'a pas de pièce à sa position source. Le lot de la partie n'est pas
+                ajouté.
+
+        """
+        nombre = 0
+        lot = []
+        for partie in parties:
+            lot.append(partie)
+            if len(lot) >= taille_lot:
+                nombre += len(self._ajouter_lot(lot))
+                lot = []
+
+        if lot:
+            nombre += len(self._ajouter_lot(lot))
+        return nombre
+
+    def _ajouter_lot(self, parties):
+        echiquier = self._echiquier
+        identifiants = []
+        positions = []
+
+        with self.connexion:
+            curseur = self.connexion.cursor()
+            for partie in parties:
+                fen = partie.entetes.get('FEN')
+                pieces, trait = lire_fen(fen if fen is not None else FEN_DEPART)
+                echiquier.dictionnaire_pieces = pieces
+                echiquier.definir_trait(trait)
+                deplacements, cles = self._encoder(echiquier, partie.deplacements)
+
+                curseur.execute('INSERT INTO parties (evenement, date, blanc, noir, resultat, fen, deplacements) '
+                                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                                [partie.entetes.get(nom) for nom in ENTETES_CONSERVEES] + [fen, deplacements])
+                identifiant = curseur.lastrowid
+                identifiants.append(identifiant)
+                positions.extend((cle, identifiant, ply) for ply, cle in enumerate(cles))
+
+            curseur.executemany('INSERT OR IGNORE INTO positions (cle, partie, ply) VALUES (?, ?, ?)', positions)
+
+        return identifiants
+
+    def ajouter_partie(self, partie, entetes=None):
+        """Ajoute une partie en cours (ou terminée) à la base, dans sa propre transaction.
+
+        Args:
+            partie (Partie): La partie.
+            entetes (dict): Les en-têtes PGN de la partie (White, Black, Result, etc.).
+
+        Returns:
+            int: L'identifiant de la partie dans la base.
+
+        """
+        # La position de départ est retrouvée en défaisant les déplacements de l'historique sur une copie.
+        echiquier = Echiquier(dict(partie.echiquier.dictionnaire_pieces))
+        for enregistrement in reversed(partie.historique):
+            echiquier.annuler_deplacement(enregistrement.position_source, enregistrement.position_cible,
+                                          enregistrement.piece_prise)
+        echiquier.definir_trait(partie.historique[0].piece.couleur if partie.historique else partie.joueur_actif)
+
+        entetes = dict(entetes or {})
+        fen = echiquier.vers_fen()
+        if fen != FEN_DEPART:
+            entetes['FEN'] = fen
+
+        deplacements = [(enregistrement.position_source, enregistrement.position_cible)
+                        for enregistrement in partie.historique]
+        return self._ajouter_lot([PartieBase(None, entetes, deplacements)])[0]
+
+    def parties_avec_position(self, cle, limite=None):
+        """Retourne les identifiants des parties qui ont atteint une position.
+
+        Args:
+            cle (int): La clé de Zobrist de la position (voir Echiquier.cle_hash).
+            limite (int): Le nombre maximal d'identifiants retournés, ou None pour tous.
+
+        Returns:
+            list: Les identifiants des parties, en ordre croissant.
+
+        """
+        requete = 'SELECT DISTINCT partie FROM positions WHERE cle = ? ORDER BY partie'
+        parametres = [_cle_signee(cle)]
+        if limite is not None:
+            requete += ' LIMIT ?'
+            parametres.append(limite)
+
+        return [identifiant for identifiant, in self.connexion.execute(requete, parametres)]
+
+    def compter_position(self, cle):
+        """Compte les parties qui ont atteint une position.
+
+        Args:
+            cle (int): La clé de Zobrist de la position.
+
+        Returns:
+            int: Le nombre de parties.
+
+        """
+        return self.connexion.execute('SELECT COUNT(DISTINCT partie) FROM positions WHERE cle = ?',
+                                      (_cle_signee(cle),)).fetchone()[0]
+
+    def deplacements_suivants(self, cle):
+        """Compte les déplacements joués à partir d'une position, dans toutes les parties qui l'ont atteinte.
+
+        Args:
+            cle (int): La clé de Zobrist de la position.
+
+        Returns:
+            Counter: Le nombre de fois où chaque déplacement, sous forme de paire (position source, position cible), a
+                été joué.
+
+        """
+        compteur = Counter()
+        lignes = self.connexion.execute('SELECT positions.ply, parties.deplacements FROM positions '
+                                        'JOIN parties ON parties.id = positions.partie WHERE positions.cle = ?',
+                                        (_cle_signee(cle),))
+        for ply, deplacements in lignes:
+            if 2 * ply < len(deplacements):
+                position_source, position_cible, _ = decoder_deplacement(
+                    struct.unpack_from('<H', deplacements, 2 * ply)[0])
+                compteur[position_source, position_cible] += 1
+
+        return compteur
+
+    def lire_partie(self, identifiant):
+        """Lit une partie de la base.
+
+        Args:
+            identifiant (int): L'identifiant de la partie.
+
+        Returns:
+            PartieBase or None: La partie, ou None si elle n'est pas dans la base.
+
+        """
+        ligne = self.connexion.execute('SELECT evenement, date, blanc, noir, resultat, fen, deplacements '
+                                       'FROM parties WHERE id = ?', (identifiant,)).fetchone()
+        if ligne is None:
+            return None
+
+        entetes = {nom: valeur for nom, valeur in zip(ENTETES_CONSERVEES + ('FEN',), ligne) if valeur is not None}
+        deplacements = [decoder_deplacement(code)[:2]
+                        for code in struct.unpack('<{}H'.format(len(ligne[-1]) // 2), ligne[-1])]
+
+        return PartieBase(identifiant, entetes, deplacements)
+
+    def fermer(self):
+        """Ferme la base.
+
+        """
+        self.connexion.close()
+
+
+def principal(arguments=None):
+    """Point d'entrée de la ligne de commande: importe une archive PGN dans une base, ou cherche les parties qui ont
+    atteint une position.
+
+    Args:
+        arguments (list): Les arguments de la ligne de commande, ou None pour utiliser ceux de sys.argv.
+
+    """
+    analyseur = ArgumentParser(prog='python -m echecs.base_parties', description='Gère une base de parties.')
+    analyseur.add_argument('base', help='le fichier de la base')
+    commandes = analyseur.add_subparsers(dest='commande', required=True)
+    importer = commandes.add_parser('importer', help='importe les parties d\'une archive PGN')
+    importer.add_argument('archive', help='le fichier PGN')
+    importer.add_argument('--taille-lot', type=int, default=TAILLE_LOT,
+                          help='le nombre de parties ajoutées dans chaque transaction')
+    chercher = commandes.add_parser('chercher', help='cherche les parties qui ont atteint une position')
+    chercher.add_argument('fen', help='la position, en notation FEN')
+    options = analyseur.parse_args(arguments)
+
+    with BaseParties(options.base) as base:
+        debut = perf_counter()
+        if options.commande == 'importer':
+            nombre = base.ajouter_parties(lire_fichier_pgn(options.archive), options.taille_lot)
+            duree = perf_counter() - debut
+            print('Parties ajoutées: {} ({:.0f} parties par seconde)'.format(nombre, nombre / duree if duree else 0))
+        else:
+            cle = Echiquier.depuis_fen(options.fen).cle_hash
+            nombre = base.compter_position(cle)
+            suivants = base.deplacements_suivants(cle)
+            duree = perf_counter() - debut
+            print('Parties: {} ({:.1f} ms)'.format(nombre, 1000 * duree))
+            for (position_source, position_cible), compte in suivants.most_common(10):
+                print('{}{}: {}'.format(position_source, position_cible, compte))
+
+
+if __name__ == '__main__':
+    principal()
@@ -0,0 +1,722 @@
+# -*- coding: utf-8 -*-
+"""Module contenant la classe EchiquierBitboard, une seconde représentation de l'échiquier. Elle offre les mêmes
+méthodes publiques que la classe Echiquier, mais conserve la position dans douze entiers de 64 bits (un par type de
+pièce et par couleur) plutôt que dans un dictionnaire de pièces.
+
+Le bit i d'un bitboard est à 1 si une pièce du type correspondant occupe la case d'index i. La case a1 a l'index 0,
+la case h1 a l'index 7 et la case h8 a l'index 63.
+
+"""
+from collections.abc import Mapping
+
+from echecs.echiquier import Echiquier
+from echecs.piece import Roi, COULEURS, PIECES, INDEX_PIECES
+from echecs.cases import (CASES, INDEX_CASES, POSITIONS_ENTRE, ENTRE, ATTAQUES_CAVALIER, ATTAQUES_ROI, ATTAQUES_PION,
+                          MASQUES_RAYONS, DIRECTIONS_CROISSANTES)
+from echecs.zobrist import CLES_PIECES, CLE_TRAIT
+from echecs.evaluation import SCORES_PIECES
+from echecs.exceptions import ExceptionDeplacer
+
+# Contenu des douze bitboards au départ d'une partie, dans l'ordre de PIECES.
+BITBOARDS_DEPART = (
+    0x000000000000ff00, 0x0000000000000081, 0x0000000000000042, 0x0000000000000024, 0x0000000000000008,
+    0x0000000000000010,
+    0x00ff000000000000, 0x8100000000000000, 0x4200000000000000, 0x2400000000000000, 0x0800000000000000,
+    0x1000000000000000,
+)
+
+
+# Masques des rangées 3 et 6, que doit traverser un pion qui avance de deux cases depuis sa case départ.
+RANGEE_3 = 0x0000000000ff0000
+RANGEE_6 = 0x0000ff0000000000
+
+
+def attaques_glissantes(case, directions, occupation):
+    """Calcule le bitboard des cases attaquées par une pièce qui glisse, en s'arrêtant à la première case occupée
+    dans chaque direction (cette case est incluse).
+
+    Args:
+        case (int): L'index de la case de la pièce.
+        directions (range): Les index des directions à parcourir, dans DIRECTIONS.
+        occupation (int): Le bitboard de toutes les cases occupées.
+
+    Returns:
+        int: Le bitboard des cases attaquées.
+
+    """
+    attaques = 0
+
+    for direction in directions:
+        rayon = MASQUES_RAYONS[case][direction]
+        bloqueurs = rayon & occupation
+
+        if bloqueurs:
+            # Le premier bloqueur est le bit le plus faible si les index augmentent, et le plus fort autrement
+            if DIRECTIONS_CROISSANTES[direction]:
+                premier = (bloqueurs & -bloqueurs).bit_length() - 1
+            else:
+                premier = bloqueurs.bit_length() - 1
+            rayon ^= MASQUES_RAYONS[premier][direction]
+
+        attaques |= rayon
+
+    return attaques
+
+
+INDEX_COULEURS = {couleur: index for index, couleur in enumerate(COULEURS)}
+
+# Directions parcourues par la tour et le fou, selon leur index dans TYPES_PIECES. La dame attaque comme les deux.
+DIRECTIONS_PAR_TYPE = {1: range(4), 3: range(4, 8)}
+
+
+def _masque_bloqueurs(case, directions):
+    # Les cases des rayons dont l'occupation change les attaques: toutes, sauf la dernière de chaque rayon.
+    masque = 0
+    for direction in directions:
+        rayon = MASQUES_RAYONS[case][direction]
+        if rayon:
+            rayon ^= 1 << (rayon.bit_length() - 1) if DIRECTIONS_CROISSANTES[direction] else rayon & -rayon
+        masque |= rayon
+
+    return masque
+
+
+# Pour la tour et le fou, et pour chaque case, le masque des cases qui peuvent bloquer leurs rayons.
+MASQUES_BLOQUEURS = {type_piece: tuple(_masque_bloqueurs(case, directions) for case in range(64))
+                     for type_piece, directions in DIRECTIONS_PAR_TYPE.items()}
+
+# Les attaques de la tour et du fou déjà calculées, pour chaque case, selon les bloqueurs présents (voir
+# MASQUES_BLOQUEURS). Elles sont calculées à la première demande: au plus 4096 occupations différentes par case pour
+# la tour, et 512 pour le fou.
+ATTAQUES_CALCULEES = {type_piece: tuple({} for _ in range(64)) for type_piece in DIRECTIONS_PAR_TYPE}
+
+# Pour chaque pièce de PIECES et chaque case source, un octet par case cible: 1 si les règles de la pièce permettent
+# le déplacement sur un échiquier vide (voir Piece.peut_se_deplacer_vers_case), et 0 autrement. Les prises des pions
+# ont leur propre table. Lire un octet coûte moins cher que d'extraire un bit d'un entier de 64 bits.
+DEPLACEMENTS_PERMIS = tuple(tuple(bytes(piece.peut_se_deplacer_vers_case(source, cible) for cible in range(64))
+                                  for source in range(64))
+                            for piece in PIECES)
+PRISES_PERMISES_PION = {couleur: tuple(bytes(ATTAQUES_PION[couleur][source] >> cible & 1 for cible in range(64))
+                                       for source in range(64))
+                        for couleur in COULEURS}
+SAUTEUSES = tuple(piece.peut_sauter for piece in PIECES)
+
+
+def attaques_glissantes_calculees(type_piece, case, occupation):
+    """Retourne le bitboard des cases attaquées par une tour ou un fou (voir attaques_glissantes), en le calculant
+    seulement la première fois qu'une même occupation de ses rayons est rencontrée.
+
+    Args:
+        type_piece (int): L'index du type de la pièce dans TYPES_PIECES (1 pour la tour, 3 pour le fou).
+        case (int): L'index de la case de la pièce.
+        occupation (int): Le bitboard de toutes les cases occupées.
+
+    Returns:
+        int: Le bitboard des cases attaquées.
+
+    """
+    bloqueurs = occupation & MASQUES_BLOQUEURS[type_piece][case]
+    calculees = ATTAQUES_CALCULEES[type_piece][case]
+    attaques = calculees.get(bloqueurs)
+
+    if attaques is None:
+        attaques = calculees[bloqueurs] = attaques_glissantes(case, DIRECTIONS_PAR_TYPE[type_piece], bloqueurs)
+
+    return attaques
+
+
+class VueDictionnairePieces(Mapping):
+    """Vue de compatibilité présentant un EchiquierBitboard comme le dictionnaire de pièces de la classe Echiquier.
+    Comme le dictionnaire de la classe Echiquier, la vue est en lecture seule: on modifie l'échiquier avec les
+    méthodes placer_piece et retirer_piece.
+
+    Args:
+        echiquier (EchiquierBitboard): L'échiquier à présenter.
+
+    """
+
+    def __init__(self, echiquier):
+        self.echiquier = echiquier
+
+    def __getitem__(self, position):
+        case = INDEX_CASES.get(position)
+        index_piece = self.echiquier.pieces_par_case[case] if case is not None else -1
+
+        if index_piece < 0:
+            raise KeyError(position)
+
+        return PIECES[index_piece]
+
+    def get(self, position, defaut=None):
+        case = INDEX_CASES.get(position)
+        index_piece = self.echiquier.pieces_par_case[case] if case is not None else -1
+
+        return PIECES[index_piece] if index_piece >= 0 else defaut
+
+    def __contains__(self, position):
+        case = INDEX_CASES.get(position)
+
+        return case is not None and self.echiquier.pieces_par_case[case] >= 0
+
+    def __iter__(self):
+        occupation = self.echiquier.occupations[0] | self.echiquier.occupations[1]
+
+        while occupation:
+            bit = occupation & -occupation
+            yield CASES[bit.bit_length() - 1]
+            occupation ^= bit
+
+    def items(self):
+        pieces_par_case = self.echiquier.pieces_par_case
+        return [(CASES[case], PIECES[index_piece]) for case, index_piece in enumerate(pieces_par_case)
+                if index_piece >= 0]
+
+    def __len__(self):
+        return bin(self.echiquier.occupations[0] | self.echiquier.occupations[1]).count('1')
+
+
+class EchiquierBitboard(Echiquier):
+    """Classe Echiquier, implémentée avec douze bitboards.
+
+    Attributes:
+        bitboards (list): Les douze bitboards, un par pièce de PIECES et dans le même ordre.
+        occupations (list): Le bitboard des cases occupées par les pièces blanches, puis par les pièces noires.
+        pieces_par_case (list): Pour chacune des 64 cases, l'index (dans PIECES) de la pièce qui l'occupe, ou -1. Ce
+            tableau est tenu à jour avec les bitboards: trouver la pièce d'une case n'en parcourt aucun.
+        dictionnaire_pieces (VueDictionnairePieces): Une vue des bitboards se comportant comme le dictionnaire de
+            pièces de la classe Echiquier.
+
+    Args:
+        pieces (dict): Les pièces à placer, par position, ou None pour commencer à la position de départ.
+
+    """
+    def __init__(self, pieces=None):
+        self.bitboards = [0] * 12
+        self.occupations = [0, 0]
+        self.pieces_par_case = [-1] * 64
+        self._vue = VueDictionnairePieces(self)
+
+        super().__init__(pieces)
+
+    @property
+    def dictionnaire_pieces(self):
+        return self._vue
+
+    @dictionnaire_pieces.setter
+    def dictionnaire_pieces(self, pieces):
+        # Remplace tout le contenu de l'échiquier par celui du dictionnaire reçu.
+        self.bitboards = [0] * 12
+        self.occupations = [0, 0]
+        self.pieces_par_case = [-1] * 64
+        self.cle_hash = CLE_TRAIT if self.trait == 'noir' else 0
+        self.score = 0
+
+        for position, piece in pieces.items():
+            self.placer_piece(position, piece)
+
+    def index_piece_a_case(self, case):
+        """Retourne l'index (dans PIECES) de la pièce située sur une case.
+
+        Args:
+            case (int): L'index de la case.
+
+        Returns:
+            int: L'index du bitboard contenant la pièce, ou -1 si la case est vide.
+
+        """
+        return self.pieces_par_case[case]
+
+    def piece_a_case(self, case):
+        """Retourne la pièce située sur une case.
+
+        Args:
+            case (int): L'index de la case.
+
+        Returns:
+            Piece or None: La pièce, ou None si la case est vide.
+
+        """
+        index_piece = self.pieces_par_case[case]
+
+        return PIECES[index_piece] if index_piece >= 0 else None
+
+    def placer_piece_a_case(self, case, index_piece):
+        """Place une pièce sur une case, en retirant d'abord la pièce qui s'y trouvait.
+
+        Args:
+            case (int): L'index de la case.
+            index_piece (int): L'index (dans PIECES) de la pièce à placer.
+
+        """
+        self.retirer_piece_a_case(case)
+
+        bit = 1 << case
+        self.bitboards[index_piece] |= bit
+        self.occupations[index_piece // 6] |= bit
+        self.pieces_par_case[case] = index_piece
+        self.cle_hash ^= CLES_PIECES[index_piece][case]
+        self.score += SCORES_PIECES[index_piece][case]
+
+    def retirer_piece_a_case(self, case):
+        """Retire la pièce située sur une case, s'il y en a une.
+
+        Args:
+            case (int): L'index de la case.
+
+        Returns:
+            int: L'index (dans PIECES) de la pièce retirée, ou -1 si la case était vide.
+
+        """
+        index_piece = self.pieces_par_case[case]
+
+        if index_piece >= 0:
+            bit = 1 << case
+            self.bitboards[index_piece] ^= bit
+            self.occupations[index_piece // 6] ^= bit
+            self.pieces_par_case[case] = -1
+            self.cle_hash ^= CLES_PIECES[index_piece][case]
+            self.score -= SCORES_PIECES[index_piece][case]
+
+        return index_piece
+
+    def placer_piece(self, position, piece):
+        """Place une pièce à une position, en retirant d'abord la pièce qui s'y trouvait.
+
+        Args:
+            position (str): La position où placer la pièce.
+            piece (Piece): La pièce à placer.
+
+        """
+        self.placer_piece_a_case(INDEX_CASES[position], piece.index)
+
+    def retirer_piece(self, position):
+        """Retire la pièce située à une position, s'il y en a une.
+
+        Args:
+            position (str): La position où retirer la pièce.
+
+        Returns:
+            Piece or None: La pièce retirée, ou None si aucune pièce n'était à cette position.
+
+        """
+        index_piece = self.retirer_piece_a_case(INDEX_CASES[position])
+
+        if index_piece < 0:
+            return None
+
+        return PIECES[index_piece]
+
+    def recuperer_piece_a_position(self, position):
+        """Retourne la pièce qui est située à une position particulière, reçue en argument. Si aucune pièce n'est
+        située à cette position, retourne None.
+
+        Args:
+            position (str): La position où récupérer la pièce.
+
+        Returns:
+            Piece or None: Une instance de type Piece si une pièce était située à cet endroit, et None autrement.
+
+        """
+        case = INDEX_CASES.get(position)
+
+        if case is None:
+            return None
+
+        index_piece = self.pieces_par_case[case]
+
+        if index_piece < 0:
+            return None
+
+        return PIECES[index_piece]
+
+    def couleur_piece_a_position(self, position):
+        """Retourne la couleur de la pièce située à la position reçue en argument, et une chaîne vide si aucune
+        pièce n'est à cet endroit.
+
+        Args:
+            position (str): La position où récupérer la couleur de la pièce.
+
+        Returns:
+            str: La couleur de la pièce s'il y en a une, et '' autrement.
+
+        """
+        case = INDEX_CASES.get(position)
+
+        if case is not None:
+            if self.occupations[0] >> case & 1:
+                return 'blanc'
+
+            if self.occupations[1] >> case & 1:
+                return 'noir'
+
+        return ""
+
+    def chemin_libre_entre_positions(self, position_source, position_cible):
+        """Vérifie si la voie est libre entre deux positions, reçues en argument. Retourne toujours False si les
+        positions ne sont ni sur une même rangée, ni sur une même colonne, ni sur une même diagonale.
+
+        Args:
+            position_source (str): La position source.
+            position_cible (str): La position cible.
+
+        Returns:
+            bool: True si aucune pièce n'est située entre les deux positions, et False autrement (ou si les positions
+                ne permettaient pas la vérification).
+
+        """
+        source = INDEX_CASES.get(position_source)
+        cible = INDEX_CASES.get(position_cible)
+
+        if source is None or cible is None or POSITIONS_ENTRE[source][cible] is None:
+            return False
+
+        return not ENTRE[source][cible] & (self.occupations[0] | self.occupations[1])
+
+    def deplacement_est_valide(self, position_source, position_cible):
+        """Vérifie si un déplacement serait valide dans l'échiquier actuel, selon les mêmes règles que la méthode
+        Echiquier.deplacement_est_valide.
+
+        Args:
+            position_source (str): La position source du déplacement.
+            position_cible (str): La position cible du déplacement.
+
+        Returns:
+            bool: True si le déplacement est valide, et False autrement.
+
+        """
+        source = INDEX_CASES.get(position_source)
+        if source is None:
+            return False
+
+        pieces_par_case = self.pieces_par_case
+        index_piece = pieces_par_case[source]
+        cible = INDEX_CASES.get(position_cible)
+        if index_piece < 0 or cible is None:
+            return False
+
+        # La case cible ne doit pas être occupée par une pièce de la même couleur. Le pion, lui, prend seulement en
+        # diagonale, et avance seulement vers une case vide.
+        index_cible = pieces_par_case[cible]
+        if index_cible >= 0:
+            if index_cible // 6 == index_piece // 6:
+                return False
+            if index_piece % 6 == 0:
+                return PRISES_PERMISES_PION[COULEURS[index_piece // 6]][source][cible] == 1
+
+        if not DEPLACEMENTS_PERMIS[index_piece][source][cible]:
+            return False
+
+        # Dans le cas ou la piece ne peut pas sauter, aucune case entre la source et la cible ne doit être occupée.
+        return SAUTEUSES[index_piece] or not ENTRE[source][cible] & (self.occupations[0] | self.occupations[1])
+
+    def attaques_piece(self, index_piece, case, occupation):
+        """Calcule le bitboard des cases attaquées par une pièce, en considérant les cases occupées.
+
+        Args:
+            index_piece (int): L'index (dans PIECES) de la pièce.
+            case (int): L'index de la case de la pièce.
+            occupation (int): Le bitboard de toutes les cases occupées.
+
+        Returns:
+            int: Le bitboard des cases attaquées.
+
+        """
+        type_piece = index_piece % 6
+
+        if type_piece in DIRECTIONS_PAR_TYPE:
+            return attaques_glissantes_calculees(type_piece, case, occupation)
+
+        if type_piece == 4:
+            return (attaques_glissantes_calculees(1, case, occupation)
+                    | attaques_glissantes_calculees(3, case, occupation))
+
+        if type_piece == 0:
+            return ATTAQUES_PION[COULEURS[index_piece // 6]][case]
+
+        if type_piece == 2:
+            return ATTAQUES_CAVALIER[case]
+
+        return ATTAQUES_ROI[case]
+
+    def _attaques_pieces(self, index_couleur, occupation):
+        """Calcule les cases attaquées par chacune des pièces d'une couleur, sauf les pions.
+
+        Args:
+            index_couleur (int): L'index de la couleur des pièces dans COULEURS.
+            occupation (int): Le bitboard de toutes les cases occupées.
+
+        Returns:
+            list: Les paires (position de la pièce, bitboard des cases attaquées), dans l'ordre de PIECES.
+
+        """
+        attaques_pieces = []
+        debut = 6 * index_couleur
+        # Les attaques de la tour et du fou sont lues directement dans leurs tables (voir
+        # attaques_glissantes_calculees): cette méthode est appelée à chaque génération de déplacements.
+        masques_tour, calculees_tour = MASQUES_BLOQUEURS[1], ATTAQUES_CALCULEES[1]
+        masques_fou, calculees_fou = MASQUES_BLOQUEURS[3], ATTAQUES_CALCULEES[3]
+
+        for type_piece in range(1, 6):
+            bitboard = self.bitboards[debut + type_piece]
+
+            while bitboard:
+                bit = bitboard & -bitboard
+                bitboard ^= bit
+                case = bit.bit_length() - 1
+
+                if type_piece == 2:
+                    attaques = ATTAQUES_CAVALIER[case]
+                elif type_piece == 5:
+                    attaques = ATTAQUES_ROI[case]
+                else:
+                    attaques = 0
+                    # La tour et la dame glissent sur les rangées et les colonnes
+                    if type_piece != 3:
+                        bloqueurs = occupation & masques_tour[case]
+                        attaques = calculees_tour[case].get(bloqueurs)
+                        if attaques is None:
+                            attaques = attaques_glissantes_calculees(1, case, occupation)
+                    # Le fou et la dame glissent sur les diagonales
+                    if type_piece != 1:
+                        bloqueurs = occupation & masques_fou[case]
+                        attaques_fou = calculees_fou[case].get(bloqueurs)
+                        if attaques_fou is None:
+                            attaques_fou = attaques_glissantes_calculees(3, case, occupation)
+                        attaques |= attaques_fou
+
+                attaques_pieces.append((CASES[case], attaques))
+
+        return attaques_pieces
+
+    def generer_deplacements(self, couleur):
+        """Génère les déplacements valides des pièces d'une couleur, les prises en premier (voir
+        Echiquier.generer_deplacements). Les cases attaquées par chaque pièce ne sont calculées qu'une fois pour les
+        prises et les déplacements vers des cases vides.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) des pièces à déplacer.
+
+        Yields:
+            tuple: La position source et la position cible de chaque déplacement.
+
+        """
+        index_couleur = INDEX_COULEURS[couleur]
+        attaques_pieces = self._attaques_pieces(index_couleur, self.occupations[0] | self.occupations[1])
+
+        yield from self._generer_prises(index_couleur, attaques_pieces)
+        yield from self._generer_deplacements_tranquilles(index_couleur, attaques_pieces)
+
+    def generer_prises(self, couleur):
+        """Génère les déplacements valides des pièces d'une couleur qui mangent une pièce adverse.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) des pièces à déplacer.
+
+        Yields:
+            tuple: La position source et la position cible de chaque prise.
+
+        """
+        index_couleur = INDEX_COULEURS[couleur]
+        return self._generer_prises(index_couleur, self._attaques_pieces(
+            index_couleur, self.occupations[0] | self.occupations[1]))
+
+    def generer_deplacements_tranquilles(self, couleur):
+        """Génère les déplacements valides des pièces d'une couleur vers des cases vides.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) des pièces à déplacer.
+
+        Yields:
+            tuple: La position source et la position cible de chaque déplacement.
+
+        """
+        index_couleur = INDEX_COULEURS[couleur]
+        return self._generer_deplacements_tranquilles(index_couleur, self._attaques_pieces(
+            index_couleur, self.occupations[0] | self.occupations[1]))
+
+    def _generer_prises(self, index_couleur, attaques_pieces):
+        ennemis = self.occupations[1 - index_couleur]
+
+        # Les pions d'abord, puis les autres pièces
+        pions = self.bitboards[6 * index_couleur]
+        attaques_pion = ATTAQUES_PION[COULEURS[index_couleur]]
+        while pions:
+            bit = pions & -pions
+            pions ^= bit
+            case = bit.bit_length() - 1
+
+            prises = attaques_pion[case] & ennemis
+            while prises:
+                bit_cible = prises & -prises
+                prises ^= bit_cible
+                yield CASES[case], CASES[bit_cible.bit_length() - 1]
+
+        for position, attaques in attaques_pieces:
+            prises = attaques & ennemis
+            while prises:
+                bit_cible = prises & -prises
+                prises ^= bit_cible
+                yield position, CASES[bit_cible.bit_length() - 1]
+
+    def _generer_deplacements_tranquilles(self, index_couleur, attaques_pieces):
+        vides = ~(self.occupations[0] | self.occupations[1]) & 0xffffffffffffffff
+
+        # Les pions avancent d'une case, ou de deux à partir de leur case départ, si le chemin est libre
+        pions = self.bitboards[6 * index_couleur]
+        if index_couleur == 0:
+            simples = pions << 8 & vides
+            doubles = (simples & RANGEE_3) << 8 & vides
+            pas = 8
+        else:
+            simples = pions >> 8 & vides
+            doubles = (simples & RANGEE_6) >> 8 & vides
+            pas = -8
+
+        for cibles, distance in ((simples, pas), (doubles, 2 * pas)):
+            while cibles:
+                bit = cibles & -cibles
+                cibles ^= bit
+                cible = bit.bit_length() - 1
+                yield CASES[cible - distance], CASES[cible]
+
+        for position, attaques in attaques_pieces:
+            deplacements = attaques & vides
+            while deplacements:
+                bit_cible = deplacements & -deplacements
+                deplacements ^= bit_cible
+                yield position, CASES[bit_cible.bit_length() - 1]
+
+    def deplacer(self, position_source, position_cible):
+        """Effectue le déplacement d'une pièce en position source, vers la case en position cible. Lance une
+        exception ExceptionDeplacer si le déplacement n'est pas valide.
+
+        Args:
+            position_source (str): La position source.
+            position_cible (str): La position cible.
+
+        """
+        if not self.deplacement_est_valide(position_source, position_cible):
+            raise ExceptionDeplacer("Ce déplacement n'est pas valide")
+
+        self.effectuer_deplacement(position_source, position_cible)
+
+    def effectuer_deplacement(self, position_source, position_cible):
+        """Effectue un déplacement sans vérifier s'il est valide. Le déplacement peut être défait avec la méthode
+        annuler_deplacement.
+
+        Args:
+            position_source (str): La position source.
+            position_cible (str): La position cible.
+
+        Returns:
+            Piece or None: La pièce mangée par le déplacement, ou None si la position cible était vide.
+
+        """
+        source = INDEX_CASES[position_source]
+        cible = INDEX_CASES[position_cible]
+        pieces_par_case = self.pieces_par_case
+        index_piece = pieces_par_case[source]
+        index_prise = pieces_par_case[cible]
+
+        bit_source = 1 << source
+        bit_cible = 1 << cible
+        pieces_par_case[source] = -1
+        pieces_par_case[cible] = index_piece
+        self.bitboards[index_piece] ^= bit_source | bit_cible
+        self.occupations[index_piece // 6] ^= bit_source | bit_cible
+        cles = CLES_PIECES[index_piece]
+        scores = SCORES_PIECES[index_piece]
+        self.cle_hash ^= cles[source] ^ cles[cible]
+        self.score += scores[cible] - scores[source]
+
+        if index_prise < 0:
+            return None
+
+        self.bitboards[index_prise] ^= bit_cible
+        self.occupations[index_prise // 6] ^= bit_cible
+        self.cle_hash ^= CLES_PIECES[index_prise][cible]
+        self.score -= SCORES_PIECES[index_prise][cible]
+
+        return PIECES[index_prise]
+
+    def annuler_deplacement(self, position_source, position_cible, piece_prise):
+        """Défait un déplacement effectué par effectuer_deplacement (ou deplacer).
+
+        Args:
+            position_source (str): La position source du déplacement à défaire.
+            position_cible (str): La position cible du déplacement à défaire.
+            piece_prise (Piece or None): La pièce mangée par le déplacement, ou None.
+
+        """
+        source = INDEX_CASES[position_source]
+        cible = INDEX_CASES[position_cible]
+        pieces_par_case = self.pieces_par_case
+        index_piece = pieces_par_case[cible]
+        bit_source = 1 << source
+        bit_cible = 1 << cible
+        pieces_par_case[source] = index_piece
+        self.bitboards[index_piece] ^= bit_source | bit_cible
+        self.occupations[index_piece // 6] ^= bit_source | bit_cible
+        cles = CLES_PIECES[index_piece]
+        scores = SCORES_PIECES[index_piece]
+        self.cle_hash ^= cles[source] ^ cles[cible]
+        self.score += scores[source] - scores[cible]
+
+        if piece_prise is None:
+            pieces_par_case[cible] = -1
+            return
+
+        index_prise = piece_prise.index
+        pieces_par_case[cible] = index_prise
+        self.bitboards[index_prise] ^= bit_cible
+        self.occupations[index_prise // 6] ^= bit_cible
+        self.cle_hash ^= CLES_PIECES[index_prise][cible]
+        self.score += SCORES_PIECES[index_prise][cible]
+
+    def roi_de_couleur_est_dans_echiquier(self, couleur):
+        """Vérifie si un roi de la couleur reçue en argument est présent dans l'échiquier.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) du roi à rechercher.
+
+        Returns:
+            bool: True si un roi de cette couleur est dans l'échiquier, et False autrement.
+
+        """
+        return self.bitboards[INDEX_PIECES[(Roi, couleur)]] != 0
+
+    def position_roi(self, couleur):
+        """Retourne la position du roi de la couleur reçue en argument.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) du roi à rechercher.
+
+        Returns:
+            str or None: La position du roi, ou None s'il n'est pas dans l'échiquier.
+
+        """
+        rois = self.bitboards[INDEX_PIECES[(Roi, couleur)]]
+
+        if not rois:
+            return None
+
+        return CASES[rois.bit_length() - 1]
+
+    def initialiser_echiquier_depart(self):
+        """Initialise l'échiquier à son contenu initial.
+
+        """
+        self.bitboards = list(BITBOARDS_DEPART)
+        self.occupations = [0, 0]
+
+        self.pieces_par_case = [-1] * 64
+
+        for index_piece, bitboard in enumerate(self.bitboards):
+            self.occupations[index_piece // 6] |= bitboard
+            while bitboard:
+                bit = bitboard & -bitboard
+                bitboard ^= bit
+                self.pieces_par_case[bit.bit_length() - 1] = index_piece
+
+        self.cle_hash = self.calculer_cle_hash()
+        self.score = self.calculer_evaluation()
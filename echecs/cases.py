@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Module contenant la représentation des cases de l'échiquier par des index entiers, ainsi que des tables
+précalculées sur ces index.
+
+Une case est un entier entre 0 et 63: l'index de a1 est 0, celui de h1 est 7, celui de a2 est 8 et celui de h8 est 63.
+La colonne d'une case est donc son index modulo 8, et sa rangée est son index divisé par 8. Les positions sous forme
+de chaînes de caractères ('e4', 'h8', etc.) ne sont converties en index qu'à l'entrée des méthodes publiques.
+
+"""
+LETTRES_COLONNES = 'abcdefgh'
+CHIFFRES_RANGEES = '12345678'
+
+# Nom de chaque case dans l'ordre des index, puis index de chaque nom de case.
+CASES = tuple(lettre + chiffre for chiffre in CHIFFRES_RANGEES for lettre in LETTRES_COLONNES)
+INDEX_CASES = {case: index for index, case in enumerate(CASES)}
+
+# Colonne (0 pour a, 7 pour h) et rangée (0 pour 1, 7 pour 8) de chaque case.
+COLONNES = tuple(case & 7 for case in range(64))
+RANGEES = tuple(case >> 3 for case in range(64))
+
+# DELTAS_COLONNES[source][cible] et DELTAS_RANGEES[source][cible] contiennent le nombre de colonnes et de rangées
+# à parcourir pour aller de la case source à la case cible.
+DELTAS_COLONNES = tuple(tuple(COLONNES[cible] - COLONNES[source] for cible in range(64)) for source in range(64))
+DELTAS_RANGEES = tuple(tuple(RANGEES[cible] - RANGEES[source] for cible in range(64)) for source in range(64))
+
+
+def _entre(debut, fin):
+    """Retourne les index situés entre deux index, exclusivement, dans l'ordre de parcours de debut vers fin.
+
+    Args:
+        debut (int): L'index de départ.
+        fin (int): L'index d'arrivée.
+
+    Returns:
+        range: Les index entre debut et fin.
+
+    """
+    if debut < fin:
+        return range(debut + 1, fin)
+
+    return range(debut - 1, fin, -1)
+
+
+# Rangées et colonnes situées entre deux rangées ou deux colonnes, indexées par la paire de caractères.
+RANGEES_ENTRE = {(debut, fin): tuple(CHIFFRES_RANGEES[i] for i in _entre(CHIFFRES_RANGEES.index(debut),
+                                                                          CHIFFRES_RANGEES.index(fin)))
+                 for debut in CHIFFRES_RANGEES for fin in CHIFFRES_RANGEES}
+COLONNES_ENTRE = {(debut, fin): tuple(LETTRES_COLONNES[i] for i in _entre(LETTRES_COLONNES.index(debut),
+                                                                           LETTRES_COLONNES.index(fin)))
+                  for debut in LETTRES_COLONNES for fin in LETTRES_COLONNES}
+
+
+def _cases_alignees(source, cible):
+    """Vérifie si deux cases distinctes sont sur une même rangée, une même colonne ou une même diagonale.
+
+    Args:
+        source (int): L'index de la première case.
+        cible (int): L'index de la seconde case.
+
+    Returns:
+        bool: True si les cases sont alignées, et False autrement.
+
+    """
+    delta_colonne = DELTAS_COLONNES[source][cible]
+    delta_rangee = DELTAS_RANGEES[source][cible]
+
+    if source == cible:
+        return False
+
+    return delta_rangee == 0 or delta_colonne == 0 or abs(delta_rangee) == abs(delta_colonne)
+
+
+def _cases_entre(source, cible):
+    """Retourne les cases situées entre deux cases alignées, exclusivement, dans l'ordre de parcours.
+
+    Args:
+        source (int): L'index de la case de départ.
+        cible (int): L'index de la case d'arrivée.
+
+    Returns:
+        list: Les index des cases entre les deux cases.
+
+    """
+    delta_colonne = DELTAS_COLONNES[source][cible]
+    delta_rangee = DELTAS_RANGEES[source][cible]
+    pas = 8 * ((delta_rangee > 0) - (delta_rangee < 0)) + (delta_colonne > 0) - (delta_colonne < 0)
+
+    return list(range(source + pas, cible, pas))
+
+
+def _masque(cases):
+    """Construit le bitboard dont les bits des cases reçues sont à 1.
+
+    Args:
+        cases (iterable): Les index des cases.
+
+    Returns:
+        int: Le bitboard.
+
+    """
+    masque = 0
+    for case in cases:
+        masque |= 1 << case
+
+    return masque
+
+
+# POSITIONS_ENTRE[source][cible] contient les positions à traverser pour aller de source à cible, ou None si les
+# deux cases ne sont pas alignées. ENTRE[source][cible] contient le bitboard de ces mêmes cases, ou -1 (toutes les
+# cases) si elles ne sont pas alignées, ce qui rend le chemin toujours bloqué pour une pièce qui ne peut pas sauter.
+POSITIONS_ENTRE = tuple(tuple(tuple(CASES[case] for case in _cases_entre(source, cible))
+                              if _cases_alignees(source, cible) else None for cible in range(64))
+                        for source in range(64))
+ENTRE = tuple(tuple(_masque(_cases_entre(source, cible)) if _cases_alignees(source, cible) else -1
+                    for cible in range(64)) for source in range(64))
+
+
+def _attaques(source, deltas):
+    """Construit le bitboard des cases atteintes depuis une case par une liste de sauts, sans sortir de l'échiquier.
+
+    Args:
+        source (int): L'index de la case de départ.
+        deltas (iterable): Les sauts possibles, sous forme de paires (delta colonne, delta rangée).
+
+    Returns:
+        int: Le bitboard des cases atteintes.
+
+    """
+    colonne, rangee = COLONNES[source], RANGEES[source]
+
+    return _masque(8 * (rangee + delta_rangee) + colonne + delta_colonne for delta_colonne, delta_rangee in deltas
+                   if 0 <= colonne + delta_colonne < 8 and 0 <= rangee + delta_rangee < 8)
+
+
+# Bitboards des cases attaquées par un cavalier, par un roi et par un pion de chaque couleur, pour chaque case.
+ATTAQUES_CAVALIER = tuple(_attaques(case, ((1, 2), (2, 1), (2, -1), (1, -2), (-1, -2), (-2, -1), (-2, 1), (-1, 2)))
+                          for case in range(64))
+ATTAQUES_ROI = tuple(_attaques(case, ((0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1)))
+                     for case in range(64))
+ATTAQUES_PION = {
+    'blanc': tuple(_attaques(case, ((-1, 1), (1, 1))) for case in range(64)),
+    'noir': tuple(_attaques(case, ((-1, -1), (1, -1))) for case in range(64)),
+}
+
+
+def _cases_du_masque(masque):
+    """Retourne les index des cases dont le bit est à 1 dans un bitboard, en ordre croissant.
+
+    Args:
+        masque (int): Le bitboard.
+
+    Returns:
+        tuple: Les index des cases.
+
+    """
+    return tuple(case for case in range(64) if masque >> case & 1)
+
+
+# Mêmes tables que ci-haut, mais sous forme de tuples d'index de cases, pour les parcourir sans manipuler de bits.
+CIBLES_CAVALIER = tuple(_cases_du_masque(masque) for masque in ATTAQUES_CAVALIER)
+CIBLES_ROI = tuple(_cases_du_masque(masque) for masque in ATTAQUES_ROI)
+CIBLES_PION = {couleur: tuple(_cases_du_masque(masque) for masque in masques)
+               for couleur, masques in ATTAQUES_PION.items()}
+
+# Les huit directions, sous forme de paires (delta colonne, delta rangée). Les quatre premières sont celles de la
+# tour, les quatre dernières celles du fou. DIRECTIONS_CROISSANTES indique si l'index des cases augmente en suivant
+# chaque direction.
+DIRECTIONS = ((0, 1), (1, 0), (0, -1), (-1, 0), (1, 1), (1, -1), (-1, -1), (-1, 1))
+DIRECTIONS_CROISSANTES = tuple(8 * delta_rangee + delta_colonne > 0 for delta_colonne, delta_rangee in DIRECTIONS)
+
+
+def _rayon(source, direction):
+    """Retourne les cases parcourues depuis une case dans une direction, jusqu'au bord de l'échiquier.
+
+    Args:
+        source (int): L'index de la case de départ, qui n'est pas incluse dans le rayon.
+        direction (tuple): La direction, sous forme de paire (delta colonne, delta rangée).
+
+    Returns:
+        tuple: Les index des cases, de la plus proche à la plus éloignée.
+
+    """
+    colonne, rangee = COLONNES[source] + direction[0], RANGEES[source] + direction[1]
+    cases = []
+
+    while 0 <= colonne < 8 and 0 <= rangee < 8:
+        cases.append(8 * rangee + colonne)
+        colonne, rangee = colonne + direction[0], rangee + direction[1]
+
+    return tuple(cases)
+
+
+# RAYONS[case][direction] contient les cases parcourues depuis la case dans chacune des huit directions, et
+# MASQUES_RAYONS[case][direction] le bitboard de ces mêmes cases.
+RAYONS = tuple(tuple(_rayon(case, direction) for direction in DIRECTIONS) for case in range(64))
+MASQUES_RAYONS = tuple(tuple(_masque(rayon) for rayon in rayons) for rayons in RAYONS)
+RAYONS_TOUR = tuple(rayons[:4] for rayons in RAYONS)
+RAYONS_FOU = tuple(rayons[4:] for rayons in RAYONS)
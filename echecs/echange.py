@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Module contenant l'évaluation statique des échanges (SEE: static exchange evaluation). Elle estime le gain d'une
+prise en supposant que les deux joueurs reprennent ensuite à tour de rôle sur la même case, toujours avec leur pièce
+la moins précieuse, et que chacun peut arrêter l'échange lorsqu'il n'y gagne plus.
+
+Les attaquants de la case sont trouvés avec les tables précalculées du module cases (rayons, sauts du cavalier, prises
+du pion), sans effectuer ni défaire de déplacements. Une pièce qui glisse derrière un attaquant de la même direction
+(par exemple une tour derrière une dame) attaque la case dès que celui-ci l'a quittée: elle est donc retenue dès le
+départ, derrière lui.
+
+"""
+from echecs.piece import Pion, Tour, Cavalier, Fou, Dame, Roi
+from echecs.cases import INDEX_CASES, RAYONS, CIBLES_CAVALIER, ATTAQUES_PION
+from echecs.evaluation import VALEURS_PIECES
+
+# La valeur du roi dans un échange: plus que toutes les autres pièces réunies, puisque le manger termine la partie.
+VALEUR_ROI = 20000
+
+VALEURS_ECHANGE = {**VALEURS_PIECES, Roi: VALEUR_ROI}
+
+# Les pièces qui glissent dans chacune des huit directions de RAYONS: les quatre premières sont celles de la tour, les
+# quatre dernières celles du fou.
+GLISSANTES_PAR_DIRECTION = tuple((Tour, Dame) if direction < 4 else (Fou, Dame) for direction in range(8))
+
+
+def _attaquants_du_rayon(echiquier, rayon, glissantes, cible, source):
+    """Retourne les pièces qui attaquent une case depuis un de ses rayons, directement ou derrière un autre attaquant
+    de la même direction.
+
+    Args:
+        echiquier (Echiquier): L'échiquier.
+        rayon (tuple): Les cases du rayon, en partant de la case attaquée.
+        glissantes (tuple): Les types de pièces qui glissent dans la direction du rayon.
+        cible (int): L'index de la case attaquée.
+        source (int): L'index de la case du premier attaquant, déjà retiré de l'échange.
+
+    Returns:
+        list: Les attaquants, du plus éloigné au plus proche de la case.
+
+    """
+    attaquants = []
+
+    for distance, case in enumerate(rayon):
+        piece = echiquier.piece_a_case(case) if case != source else None
+        if piece is None:
+            continue
+
+        type_piece = type(piece)
+        if type_piece in glissantes or (distance == 0 and (
+                type_piece is Roi or (type_piece is Pion and ATTAQUES_PION[piece.couleur][case] >> cible & 1))):
+            attaquants.append(piece)
+        else:
+            # Cette pièce n'attaque pas la case et ne la quittera pas: elle cache la suite du rayon.
+            break
+
+    attaquants.reverse()
+    return attaquants
+
+
+def echange_statique(echiquier, position_source, position_cible):
+    """Évalue une prise par l'échange qu'elle provoque sur la case cible.
+
+    Args:
+        echiquier (Echiquier): L'échiquier, qui n'est pas modifié.
+        position_source (str): La position de la pièce qui mange.
+        position_cible (str): La position de la pièce mangée.
+
+    Returns:
+        int: Le gain de la prise pour le joueur qui la fait, en centièmes de pion, une fois l'échange résolu. Un gain
+            négatif indique une prise perdante.
+
+    """
+    source, cible = INDEX_CASES[position_source], INDEX_CASES[position_cible]
+    piece_sur_case = echiquier.piece_a_case(source)
+    victime = echiquier.piece_a_case(cible)
+
+    rayons = [_attaquants_du_rayon(echiquier, rayon, GLISSANTES_PAR_DIRECTION[direction], cible, source)
+              for direction, rayon in enumerate(RAYONS[cible])]
+    # Les cavaliers ne se cachent pas les uns les autres: ils sont seulement regroupés par couleur.
+    cavaliers = {'blanc': [], 'noir': []}
+    for case in CIBLES_CAVALIER[cible]:
+        piece = echiquier.piece_a_case(case)
+        if type(piece) is Cavalier and case != source:
+            cavaliers[piece.couleur].append(piece)
+
+    # gains[i] est le gain, pour le joueur qui fait la i-ème prise, si l'échange s'arrête après celle-ci.
+    gains = [VALEURS_ECHANGE[type(victime)] if victime is not None else 0]
+    couleur = 'noir' if piece_sur_case.couleur == 'blanc' else 'blanc'
+
+    while True:
+        # L'attaquant le moins précieux du joueur: un cavalier, ou la pièce la plus proche d'un des rayons.
+        meilleur, valeur_meilleur = None, VALEUR_ROI + 1
+        for attaquants in [cavaliers[couleur]] + rayons:
+            if attaquants and attaquants[-1].couleur == couleur:
+                valeur = VALEURS_ECHANGE[type(attaquants[-1])]
+                if valeur < valeur_meilleur:
+                    meilleur, valeur_meilleur = attaquants, valeur
+        if meilleur is None:
+            break
+
+        # L'échange est joué jusqu'au bout: c'est la remontée qui décide où chaque joueur s'arrête.
+        gains.append(VALEURS_ECHANGE[type(piece_sur_case)] - gains[-1])
+        piece_sur_case = meilleur.pop()
+        couleur = 'noir' if couleur == 'blanc' else 'blanc'
+
+    # Chaque joueur, en remontant l'échange, choisit entre prendre et s'arrêter.
+    for i in range(len(gains) - 1, 0, -1):
+        gains[i - 1] = -max(-gains[i - 1], gains[i])
+
+    return gains[0]
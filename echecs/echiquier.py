@@ -1,6 +1,16 @@
 # -*- coding: utf-8 -*-
-from echecs.piece import Pion, Tour, Fou, Cavalier, Dame, Roi, position_split, UTILISER_UNICODE
+from echecs.piece import Pion, Tour, Fou, Cavalier, Dame, Roi, UTILISER_UNICODE
+from echecs.cases import (CASES, INDEX_CASES, RANGEES, POSITIONS_ENTRE, RANGEES_ENTRE, COLONNES_ENTRE,
+                          CIBLES_CAVALIER, CIBLES_ROI, CIBLES_PION, RAYONS, RAYONS_TOUR, RAYONS_FOU)
+from echecs.zobrist import CLES_PIECES, CLE_TRAIT
+from echecs import evaluation
+from echecs.evaluation import SCORES_PIECES
 from echecs.exceptions import ExceptionDeplacer
+from echecs.fen import lire_fen, ecrire_fen, lire_lignes_fen
+from types import MappingProxyType
+
+# Rayons parcourus par chacune des pièces qui glissent.
+RAYONS_PAR_TYPE = {Tour: RAYONS_TOUR, Fou: RAYONS_FOU, Dame: RAYONS}
 
 
 class Echiquier:
@@ -12,19 +22,206 @@ class Echiquier:
             Une position est une chaîne de deux caractères.
             Le premier caractère est une lettre entre a et h, représentant la colonne de l'échiquier.
             Le second caractère est un chiffre entre 1 et 8, représentant la rangée de l'échiquier.
+            Le dictionnaire est en lecture seule: on le remplace au complet par affectation, ou on le modifie avec les
+            méthodes placer_piece et retirer_piece, afin de garder à jour les index ci-dessous.
+        pieces_par_couleur (dict): Pour chaque couleur, le dictionnaire des pièces de cette couleur, par position.
+        positions_rois (dict): Pour chaque couleur, la position du roi de cette couleur, ou None s'il a été mangé.
+        trait (str): La couleur du joueur qui doit jouer, tenue à jour par la partie (voir Partie.joueur_actif).
+        cle_hash (int): La clé de Zobrist de la position (voir le module zobrist), mise à jour à chaque modification
+            de l'échiquier ou du trait.
+        score (int): Le score de la position du point de vue du joueur blanc (voir le module evaluation), mis à jour
+            à chaque pièce placée ou retirée.
         chiffres_rangees (list): Une liste contenant, dans l'ordre, les chiffres représentant les rangées.
         lettres_colonnes (list): Une liste contenant, dans l'ordre, les lettres représentant les colonnes.
 
+    Args:
+        pieces (dict): Les pièces à placer, par position, ou None pour commencer à la position de départ.
+
     """
-    def __init__(self):
-        # Le dictionnaire de pièces, vide au départ, mais ensuite rempli par la méthode initialiser_echiquier_depart().
-        self.dictionnaire_pieces = {}
+    def __init__(self, pieces=None):
+        # Le joueur blanc joue en premier. Le trait doit être connu avant de placer les pièces, puisqu'il fait partie
+        # de la clé de hachage.
+        self.trait = 'blanc'
+
+        # Le dictionnaire de pièces, vide au départ, mais ensuite rempli par la méthode initialiser_echiquier_depart(),
+        # à moins que les pièces ne soient fournies.
+        self.dictionnaire_pieces = pieces if pieces is not None else {}
 
         # Ces listes pourront être utilisées dans les autres méthodes, par exemple pour valider une position.
         self.chiffres_rangees = ['1', '2', '3', '4', '5', '6', '7', '8']
         self.lettres_colonnes = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
 
-        self.initialiser_echiquier_depart()
+        if pieces is None:
+            self.initialiser_echiquier_depart()
+
+    @classmethod
+    def depuis_fen(cls, fen):
+        """Crée un échiquier à partir d'une position en notation FEN (voir le module fen).
+
+        Args:
+            fen (str): La position.
+
+        Returns:
+            Echiquier: L'échiquier, dont le trait est le joueur qui doit jouer selon la position.
+
+        Raises:
+            FenInvalide: Si la chaîne n'est pas une position FEN valide.
+
+        """
+        pieces, trait = lire_fen(fen)
+        echiquier = cls(pieces)
+        echiquier.definir_trait(trait)
+
+        return echiquier
+
+    @classmethod
+    def depuis_fichier_fen(cls, chemin):
+        """Crée les échiquiers d'un fichier contenant une position FEN par ligne, au fur et à mesure de la lecture.
+
+        Args:
+            chemin (str): Le chemin du fichier.
+
+        Yields:
+            Echiquier: L'échiquier de chaque position.
+
+        """
+        with open(chemin, 'r') as fichier:
+            for pieces, trait in lire_lignes_fen(fichier):
+                echiquier = cls(pieces)
+                echiquier.definir_trait(trait)
+                yield echiquier
+
+    def vers_fen(self, numero_deplacement=1):
+        """Retourne la position en notation FEN, avec le trait de l'échiquier comme joueur qui doit jouer.
+
+        Args:
+            numero_deplacement (int): Le numéro du déplacement complet (dernier champ de la notation).
+
+        Returns:
+            str: La position.
+
+        """
+        return ecrire_fen(self.dictionnaire_pieces, self.trait, numero_deplacement)
+
+    @property
+    def dictionnaire_pieces(self):
+        return MappingProxyType(self._dictionnaire_pieces)
+
+    @dictionnaire_pieces.setter
+    def dictionnaire_pieces(self, pieces):
+        # Remplace tout le contenu de l'échiquier par celui du dictionnaire reçu, en reconstruisant les index.
+        self._dictionnaire_pieces = {}
+        self.pieces_par_couleur = {'blanc': {}, 'noir': {}}
+        self.positions_rois = {'blanc': None, 'noir': None}
+        self.cle_hash = CLE_TRAIT if self.trait == 'noir' else 0
+        self.score = 0
+
+        for position, piece in pieces.items():
+            self.placer_piece(position, piece)
+
+    def placer_piece(self, position, piece):
+        """Place une pièce à une position, en retirant d'abord la pièce qui s'y trouvait.
+
+        Args:
+            position (str): La position où placer la pièce.
+            piece (Piece): La pièce à placer.
+
+        """
+        if position in self._dictionnaire_pieces:
+            self.retirer_piece(position)
+
+        self._dictionnaire_pieces[position] = piece
+        self.pieces_par_couleur[piece.couleur][position] = piece
+        case = INDEX_CASES[position]
+        self.cle_hash ^= CLES_PIECES[piece.index][case]
+        self.score += SCORES_PIECES[piece.index][case]
+
+        if isinstance(piece, Roi):
+            self.positions_rois[piece.couleur] = position
+
+    def retirer_piece(self, position):
+        """Retire la pièce située à une position, s'il y en a une.
+
+        Args:
+            position (str): La position où retirer la pièce.
+
+        Returns:
+            Piece or None: La pièce retirée, ou None si aucune pièce n'était à cette position.
+
+        """
+        piece = self._dictionnaire_pieces.pop(position, None)
+
+        if piece is not None:
+            pieces_couleur = self.pieces_par_couleur[piece.couleur]
+            del pieces_couleur[position]
+            case = INDEX_CASES[position]
+            self.cle_hash ^= CLES_PIECES[piece.index][case]
+            self.score -= SCORES_PIECES[piece.index][case]
+
+            # Si un autre roi de la même couleur a été placé sur l'échiquier, c'est lui qui est maintenant suivi.
+            if isinstance(piece, Roi) and self.positions_rois[piece.couleur] == position:
+                self.positions_rois[piece.couleur] = next(
+                    (autre_position for autre_position, autre_piece in pieces_couleur.items()
+                     if isinstance(autre_piece, Roi)), None)
+
+        return piece
+
+    def definir_trait(self, couleur):
+        """Indique quel joueur doit jouer, en mettant à jour la clé de hachage au besoin.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+
+        """
+        if couleur != self.trait:
+            self.trait = couleur
+            self.cle_hash ^= CLE_TRAIT
+
+    def calculer_cle_hash(self):
+        """Calcule la clé de hachage de la position au complet, sans utiliser la clé tenue à jour. Cette méthode sert
+        surtout à vérifier la clé tenue à jour par les déplacements.
+
+        Returns:
+            int: La clé de Zobrist de la position.
+
+        """
+        cle = CLE_TRAIT if self.trait == 'noir' else 0
+
+        for position, piece in self.dictionnaire_pieces.items():
+            cle ^= CLES_PIECES[piece.index][INDEX_CASES[position]]
+
+        return cle
+
+    def evaluation(self, couleur):
+        """Retourne le score de la position (matériel et tables de positions) du point de vue d'un joueur. Le score
+        est tenu à jour par les déplacements: cette méthode ne fait que le lire.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) du joueur.
+
+        Returns:
+            int: Le score, en centièmes de pion.
+
+        """
+        if evaluation.VERIFIER_EVALUATION:
+            assert self.score == self.calculer_evaluation(), "Le score tenu à jour ne correspond pas à la position"
+
+        return self.score if couleur == 'blanc' else -self.score
+
+    def calculer_evaluation(self):
+        """Calcule le score de la position au complet, du point de vue du joueur blanc, sans utiliser le score tenu à
+        jour. Cette méthode sert surtout à vérifier le score tenu à jour par les déplacements.
+
+        Returns:
+            int: Le score, en centièmes de pion.
+
+        """
+        score = 0
+
+        for position, piece in self.dictionnaire_pieces.items():
+            score += SCORES_PIECES[piece.index][INDEX_CASES[position]]
+
+        return score
 
 
     def position_est_valide(self, position):
@@ -39,12 +236,7 @@ class Echiquier:
 
         """
 
-        if len(position) == 2:
-            position = position[0].split() + position[1].split()
-            if position[0] in self.lettres_colonnes and position[1] in self.chiffres_rangees:
-                return True
-
-        return False
+        return position in INDEX_CASES
 
 
     def recuperer_piece_a_position(self, position):
@@ -59,14 +251,26 @@ class Echiquier:
 
         """
 
-        if position in self.dictionnaire_pieces.keys():
-            Piece = self.dictionnaire_pieces[position]
+        if position in self._dictionnaire_pieces.keys():
+            Piece = self._dictionnaire_pieces[position]
             return Piece
 
         else:
             return None
 
 
+    def piece_a_case(self, case):
+        """Retourne la pièce située sur une case, à partir de l'index de la case plutôt que de sa position.
+
+        Args:
+            case (int): L'index de la case, entre 0 (a1) et 63 (h8).
+
+        Returns:
+            Piece or None: La pièce, ou None si la case est vide.
+
+        """
+        return self._dictionnaire_pieces.get(CASES[case])
+
     def couleur_piece_a_position(self, position):
         """Retourne la couleur de la pièce située à la position reçue en argument, et une chaîne vide si aucune
         pièce n'est à cet endroit.
@@ -79,8 +283,8 @@ class Echiquier:
 
         """
 
-        if position in self.dictionnaire_pieces.keys():
-            couleur = self.dictionnaire_pieces[position].couleur
+        if position in self._dictionnaire_pieces.keys():
+            couleur = self._dictionnaire_pieces[position].couleur
             return couleur
 
         else:
@@ -96,26 +300,11 @@ class Echiquier:
             rangee_fin (str): Le caractère représentant la rangée de fin, par exemple '4'.
 
         Returns:
-            list: Une liste des rangées (en str) entre le début et la fin, dans le bon ordre.
+            tuple: Les rangées (en str) entre le début et la fin, dans le bon ordre.
 
         """
 
-        list_rangee = []
-        debut = int(rangee_debut)
-        fin = int(rangee_fin)
-
-        if rangee_debut in self.chiffres_rangees and rangee_fin in self.chiffres_rangees:
-            if debut < fin:
-                while debut + 1 < fin:
-                    debut += 1
-                    list_rangee.append(str(debut))
-
-            if debut > fin:
-                while debut -1 > fin:
-                    debut -= 1
-                    list_rangee.append(str(debut))
-
-        return list_rangee
+        return RANGEES_ENTRE.get((rangee_debut, rangee_fin), ())
 
 
     def colonnes_entre(self, colonne_debut, colonne_fin):
@@ -127,26 +316,11 @@ class Echiquier:
             colonne_fin (str): Le caractère représentant la colonne de fin, par exemple 'h'.
 
         Returns:
-            list: Une liste des colonnes (en str) entre le début et la fin, dans le bon ordre.
+            tuple: Les colonnes (en str) entre le début et la fin, dans le bon ordre.
 
         """
 
-        list_colonne = []
-        debut = self.lettres_colonnes.index(colonne_debut)
-        fin = self.lettres_colonnes.index(colonne_fin)
-
-        if colonne_debut in self.lettres_colonnes and colonne_fin in self.lettres_colonnes:
-            if debut < fin:
-                while debut + 1 < fin:
-                    debut += 1
-                    list_colonne.append(self.lettres_colonnes[debut])
-
-            if debut > fin:
-                while debut -1 > fin:
-                    debut -= 1
-                    list_colonne.append(self.lettres_colonnes[debut])
-
-        return list_colonne
+        return COLONNES_ENTRE.get((colonne_debut, colonne_fin), ())
 
 
     def chemin_libre_entre_positions(self, position_source, position_cible):
@@ -170,60 +344,14 @@ class Echiquier:
 
         """
 
-        pos = position_split(position_source, position_cible)
-
-        # Deplacement valide sur une meme colonne
-        if pos[2] == pos[3] and pos[0] != pos[1]:
-            cd = self.rangees_entre(position_source[1], position_cible[1])
-            if len(cd) == 0:
-                return True
-
-            else:
-                liste_disponible = [(position_source[0] + cd) for cd in cd]
-
-                for element in liste_disponible:
-                    if element in self.dictionnaire_pieces.keys():
-                        return False
-                    else:
-                        return True
-
-        # Deplacement valide sur une meme rangee
-        if pos[0] == pos[1] and pos[2] != pos[3]:
-            cd = self.colonnes_entre(position_source[0], position_cible[0])
-            if len(cd) == 0:
-                return True
-
-            else:
-                liste_disponible = [(cd + position_source[1]) for cd in cd]
+        # Les positions entre la source et la cible sont précalculées, il ne reste qu'à vérifier qu'aucune d'entre
+        # elles n'est dans le dictionnaire de pièces.
+        positions_entre = POSITIONS_ENTRE[INDEX_CASES[position_source]][INDEX_CASES[position_cible]]
 
-                for element in liste_disponible:
-                    if element in self.dictionnaire_pieces.keys():
-                        return False
-                    else:
-                        return True
-
-        # Deplacement valide sur une diagonale
-        if (pos[0] + 1 <= pos[1] and pos[2] + 1 <= pos[3] or pos[0] - 1 >= pos[1] and pos[2] - 1 >= pos[3]
-                or pos[0] + 1 <= pos[1] and pos[2] - 1 >= pos[3] or pos[0] -1 >= pos[1] and pos[2] + 1 <= pos[3]):
-            cdr = self.rangees_entre(position_source[1], position_cible[1])
-            cdc = self.colonnes_entre(position_source[0], position_cible[0])
-            i = 0
-            liste_disponible = []
-
-            if len(cdr) == 0 or len(cdc) == 0:
-                return True
-
-            while i < len(cdc):
-                liste_disponible.append(cdc[i] + cdr[i])
-                i += 1
-
-            for element in liste_disponible:
-                if element in self.dictionnaire_pieces.keys():
-                    return False
-                else:
-                    return True
+        if positions_entre is None:
+            return False
 
-        return False
+        return self._dictionnaire_pieces.keys().isdisjoint(positions_entre)
 
 
     def deplacement_est_valide(self, position_source, position_cible):
@@ -245,31 +373,139 @@ class Echiquier:
 
         """
 
-        if position_source in self.dictionnaire_pieces.keys():
+        if position_source in self._dictionnaire_pieces.keys():
             if self.position_est_valide(position_cible):
+                piece = self._dictionnaire_pieces[position_source]
+                source = INDEX_CASES[position_source]
+                cible = INDEX_CASES[position_cible]
+
                 # Dans le cas ou la piece ne peut pas sauter
-                if self.dictionnaire_pieces[position_source].peut_sauter is False:
+                if piece.peut_sauter is False:
                     if self.chemin_libre_entre_positions(position_source, position_cible):
                         if self.couleur_piece_a_position(position_source) != self.couleur_piece_a_position(position_cible):
+                            # Dans le cas ou le deplacement n'est pas le meme pour une prise ou un mouvement normal (pion):
+                            # le pion avance seulement vers une case vide, et prend seulement en diagonale
+                            if isinstance(piece, Pion):
+                                if position_cible in self._dictionnaire_pieces.keys():
+                                    if piece.peut_faire_une_prise_vers_case(source, cible) is True:
+                                        return True
+
+                                elif piece.peut_se_deplacer_vers_case(source, cible):
+                                    return True
+
                             # Dans le cas ou le deplacement est le meme pour une prise que pour un mouvement normal
-                            if self.recuperer_piece_a_position(position_source).peut_se_deplacer_vers(position_source, position_cible):
+                            elif piece.peut_se_deplacer_vers_case(source, cible):
                                 return True
 
-                            # Dans le cas ou le deplacement n'est pas le meme pour une prise ou un mouvement normal (pion)
-                            if isinstance(self.dictionnaire_pieces[position_source], Pion):
-                                if position_cible in self.dictionnaire_pieces.keys():
-                                    if Pion.peut_faire_une_prise_vers(self.dictionnaire_pieces[position_source], position_source, position_cible) is True:
-                                        return True
-
                 # Dans le cas ou la piece peut sauter (cavalier)
                 else:
                     if self.couleur_piece_a_position(position_source) != self.couleur_piece_a_position(position_cible):
-                        if self.recuperer_piece_a_position(position_source).peut_se_deplacer_vers(position_source, position_cible):
+                        if piece.peut_se_deplacer_vers_case(source, cible):
                             return True
 
         return False
 
 
+    def generer_deplacements(self, couleur):
+        """Génère les déplacements valides des pièces d'une couleur, c'est-à-dire les paires de positions pour
+        lesquelles deplacement_est_valide retourne True. Comme un roi peut être laissé en prise (la partie se termine
+        lorsqu'il est mangé), ces déplacements sont aussi les seuls coups légaux de la position.
+
+        Les prises sont générées en premier. Les déplacements vers des cases vides ne sont cherchés que si
+        l'appelant continue d'itérer après la dernière prise.
+
+        L'échiquier peut être modifié entre deux itérations, pourvu qu'il soit remis dans son état initial avant de
+        demander le déplacement suivant.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) des pièces à déplacer.
+
+        Yields:
+            tuple: La position source et la position cible de chaque déplacement.
+
+        """
+        yield from self.generer_prises(couleur)
+        yield from self.generer_deplacements_tranquilles(couleur)
+
+    def generer_prises(self, couleur):
+        """Génère les déplacements valides des pièces d'une couleur qui mangent une pièce adverse.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) des pièces à déplacer.
+
+        Yields:
+            tuple: La position source et la position cible de chaque prise.
+
+        """
+        pieces = self._dictionnaire_pieces
+
+        for position, piece in list(self.pieces_par_couleur[couleur].items()):
+            case = INDEX_CASES[position]
+            type_piece = type(piece)
+
+            if type_piece in RAYONS_PAR_TYPE:
+                # Seule la première pièce rencontrée dans chaque direction peut être mangée
+                for rayon in RAYONS_PAR_TYPE[type_piece][case]:
+                    for cible in rayon:
+                        piece_cible = pieces.get(CASES[cible])
+                        if piece_cible is not None:
+                            if piece_cible.couleur != couleur:
+                                yield position, CASES[cible]
+                            break
+                continue
+
+            if type_piece is Pion:
+                cibles = CIBLES_PION[couleur][case]
+            elif type_piece is Cavalier:
+                cibles = CIBLES_CAVALIER[case]
+            else:
+                cibles = CIBLES_ROI[case]
+
+            for cible in cibles:
+                piece_cible = pieces.get(CASES[cible])
+                if piece_cible is not None and piece_cible.couleur != couleur:
+                    yield position, CASES[cible]
+
+    def generer_deplacements_tranquilles(self, couleur):
+        """Génère les déplacements valides des pièces d'une couleur vers des cases vides.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) des pièces à déplacer.
+
+        Yields:
+            tuple: La position source et la position cible de chaque déplacement.
+
+        """
+        pieces = self._dictionnaire_pieces
+
+        for position, piece in list(self.pieces_par_couleur[couleur].items()):
+            case = INDEX_CASES[position]
+            type_piece = type(piece)
+
+            if type_piece in RAYONS_PAR_TYPE:
+                # Les cases vides de chaque direction, jusqu'à la première pièce rencontrée
+                for rayon in RAYONS_PAR_TYPE[type_piece][case]:
+                    for cible in rayon:
+                        if CASES[cible] in pieces:
+                            break
+                        yield position, CASES[cible]
+                continue
+
+            if type_piece is Pion:
+                # Le pion avance d'une case, ou de deux à partir de sa case départ, si le chemin est libre
+                pas, rangee_depart = (8, 1) if couleur == 'blanc' else (-8, 6)
+                cible = case + pas
+                if 0 <= cible < 64 and CASES[cible] not in pieces:
+                    yield position, CASES[cible]
+                    if RANGEES[case] == rangee_depart and CASES[cible + pas] not in pieces:
+                        yield position, CASES[cible + pas]
+                continue
+
+            cibles = CIBLES_CAVALIER[case] if type_piece is Cavalier else CIBLES_ROI[case]
+            for cible in cibles:
+                if CASES[cible] not in pieces:
+                    yield position, CASES[cible]
+
     def deplacer(self, position_source, position_cible):
         """Effectue le déplacement d'une pièce en position source, vers la case en position cible. Vérifie d'abord
         si le déplacement est valide, et ne fait rien (puis retourne False) dans ce cas. Si le déplacement est valide,
@@ -286,8 +522,39 @@ class Echiquier:
         if not self.deplacement_est_valide(position_source, position_cible):
             raise ExceptionDeplacer("Ce déplacement n'est pas valide")
 
-        self.dictionnaire_pieces[position_cible] = self.dictionnaire_pieces[position_source]
-        del self.dictionnaire_pieces[position_source]
+        self.effectuer_deplacement(position_source, position_cible)
+
+    def effectuer_deplacement(self, position_source, position_cible):
+        """Effectue un déplacement sans vérifier s'il est valide, par exemple parce qu'il provient de
+        generer_deplacements. Le déplacement peut être défait avec la méthode annuler_deplacement.
+
+        Args:
+            position_source (str): La position source.
+            position_cible (str): La position cible.
+
+        Returns:
+            Piece or None: La pièce mangée par le déplacement, ou None si la position cible était vide.
+
+        """
+        piece_prise = self.retirer_piece(position_cible)
+        self.placer_piece(position_cible, self.retirer_piece(position_source))
+
+        return piece_prise
+
+    def annuler_deplacement(self, position_source, position_cible, piece_prise):
+        """Défait un déplacement effectué par effectuer_deplacement (ou deplacer): la pièce retourne à sa position
+        source et la pièce mangée, s'il y en a une, est replacée à la position cible.
+
+        Args:
+            position_source (str): La position source du déplacement à défaire.
+            position_cible (str): La position cible du déplacement à défaire.
+            piece_prise (Piece or None): La pièce mangée par le déplacement, ou None.
+
+        """
+        self.placer_piece(position_source, self.retirer_piece(position_cible))
+
+        if piece_prise is not None:
+            self.placer_piece(position_cible, piece_prise)
 
     def roi_de_couleur_est_dans_echiquier(self, couleur):
         """Vérifie si un roi de la couleur reçue en argument est présent dans l'échiquier.
@@ -300,19 +567,20 @@ class Echiquier:
 
         """
 
-        if couleur == 'blanc':
-            for i in self.dictionnaire_pieces:
-                if isinstance(self.dictionnaire_pieces[i], Roi) is True:
-                    if self.dictionnaire_pieces[i].est_blanc():
-                        return True
+        return self.positions_rois[couleur] is not None
 
-        if couleur == 'noir':
-            for i in self.dictionnaire_pieces:
-                if isinstance(self.dictionnaire_pieces[i], Roi) is True:
-                    if self.dictionnaire_pieces[i].est_noir():
-                        return True
+    def position_roi(self, couleur):
+        """Retourne la position du roi de la couleur reçue en argument.
 
-        return False
+        Args:
+            couleur (str): La couleur (blanc ou noir) du roi à rechercher.
+
+        Returns:
+            str or None: La position du roi, ou None s'il n'est pas dans l'échiquier.
+
+        """
+
+        return self.positions_rois[couleur]
 
 
     def initialiser_echiquier_depart(self):
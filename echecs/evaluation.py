@@ -0,0 +1,183 @@
+# -*- coding: utf-8 -*-
+"""Module contenant les tables de l'évaluation des positions: la valeur de chaque pièce (le matériel) et un bonus
+selon la case qu'elle occupe (les tables de positions).
+
+Le score d'une pièce sur une case est la somme de sa valeur et du bonus de sa case. Il est compté positivement pour
+une pièce blanche et négativement pour une pièce noire: le score d'une position, du point de vue du joueur blanc,
+est donc la somme des scores de ses pièces. L'échiquier tient ce score à jour à chaque pièce placée ou retirée (voir
+Echiquier.evaluation), plutôt que de le recalculer à chaque position évaluée.
+
+Deux termes supplémentaires, qui ne font pas partie du score tenu à jour, servent à l'analyse de positions (voir le
+module evaluation_lots): une approximation de la mobilité et la structure des pions.
+
+"""
+from echecs.piece import PIECES, Pion, Tour, Cavalier, Fou, Dame, Roi
+from echecs.cases import INDEX_CASES, COLONNES, ATTAQUES_CAVALIER, ATTAQUES_ROI, ATTAQUES_PION, MASQUES_RAYONS
+
+# Mettre cette constante à True pour que chaque appel à Echiquier.evaluation vérifie le score tenu à jour par
+# l'échiquier en le recalculant au complet. Beaucoup plus lent: à n'utiliser que pendant le développement.
+VERIFIER_EVALUATION = False
+
+# La valeur de chaque type de pièce, en centièmes de pion. Le roi n'a pas de valeur: la partie se termine lorsqu'il
+# est mangé.
+VALEURS_PIECES = {Pion: 100, Cavalier: 320, Fou: 330, Tour: 500, Dame: 900, Roi: 0}
+
+# Le bonus de chaque type de pièce blanche selon sa case, en centièmes de pion. Les tables se lisent comme l'échiquier
+# vu par le joueur blanc: la première ligne est la rangée 8, la dernière la rangée 1.
+TABLES_POSITIONS = {
+    Pion: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0,
+    ),
+    Cavalier: (
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50,
+    ),
+    Fou: (
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20,
+    ),
+    Tour: (
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0,
+    ),
+    Dame: (
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20,
+    ),
+    Roi: (
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20,
+    ),
+}
+
+
+def _score_piece_a_case(piece, case):
+    """Calcule le score d'une pièce sur une case, du point de vue du joueur blanc.
+
+    Args:
+        piece (Piece): La pièce.
+        case (int): L'index de la case (voir le module cases).
+
+    Returns:
+        int: Le score, positif pour une pièce blanche et négatif pour une pièce noire.
+
+    """
+    type_piece = type(piece)
+
+    # Les tables commencent par la rangée 8. Pour une pièce noire, la table est lue à l'envers (rangée 1 en premier),
+    # ce qui revient à retourner l'échiquier.
+    if piece.est_blanc():
+        return VALEURS_PIECES[type_piece] + TABLES_POSITIONS[type_piece][case ^ 56]
+
+    return -VALEURS_PIECES[type_piece] - TABLES_POSITIONS[type_piece][case]
+
+
+# SCORES_PIECES[index_piece][case] contient le score de la pièce PIECES[index_piece] sur la case, du point de vue du
+# joueur blanc.
+SCORES_PIECES = tuple(tuple(_score_piece_a_case(piece, case) for case in range(64)) for piece in PIECES)
+
+
+def _attaques_sur_echiquier_vide(piece, case):
+    # Les cases attaquées par une pièce lorsqu'aucune autre pièce ne bloque ses déplacements.
+    type_piece = type(piece)
+    if type_piece is Pion:
+        return ATTAQUES_PION[piece.couleur][case]
+    if type_piece is Cavalier:
+        return ATTAQUES_CAVALIER[case]
+    if type_piece is Roi:
+        return ATTAQUES_ROI[case]
+
+    directions = {Tour: range(4), Fou: range(4, 8), Dame: range(8)}[type_piece]
+    attaques = 0
+    for direction in directions:
+        attaques |= MASQUES_RAYONS[case][direction]
+    return attaques
+
+
+# ATTAQUES_VIDES[index_piece][case] contient le bitboard des cases attaquées par la pièce PIECES[index_piece] sur
+# l'échiquier vide. La mobilité est approximée à partir de ces cases plutôt que des déplacements réels.
+ATTAQUES_VIDES = tuple(tuple(_attaques_sur_echiquier_vide(piece, case) for case in range(64)) for piece in PIECES)
+
+
+def termes_evaluation(echiquier):
+    """Calcule chacun des termes de l'évaluation d'une position, du point de vue du joueur blanc. C'est la version de
+    référence, une position à la fois, des calculs du module evaluation_lots.
+
+    Les termes sont:
+        - le matériel: la somme des valeurs des pièces;
+        - les positions: la somme des bonus des tables de positions. Avec le matériel, c'est le score tenu à jour par
+          l'échiquier (voir Echiquier.evaluation);
+        - la mobilité: le nombre de cases attaquées par chaque pièce sur l'échiquier vide, sauf celles occupées par
+          une pièce de sa couleur (une case attaquée par deux pièces est comptée deux fois);
+        - la structure des pions: le nombre de pions doublés (chaque pion en plus du premier sur une colonne) et de
+          pions isolés (sans pion de la même couleur sur les colonnes voisines), comptés contre leur joueur.
+
+    Args:
+        echiquier (Echiquier): L'échiquier.
+
+    Returns:
+        tuple: Le matériel, les positions, la mobilité et la structure des pions, chacun positif s'il avantage le
+            joueur blanc.
+
+    """
+    materiel = positions = mobilite = structure_pions = 0
+    occupations = {'blanc': 0, 'noir': 0}
+    pions_par_colonne = {'blanc': [0] * 8, 'noir': [0] * 8}
+
+    pieces = [(INDEX_CASES[position], piece) for position, piece in echiquier.dictionnaire_pieces.items()]
+    for case, piece in pieces:
+        occupations[piece.couleur] |= 1 << case
+        if type(piece) is Pion:
+            pions_par_colonne[piece.couleur][COLONNES[case]] += 1
+
+    for case, piece in pieces:
+        signe = 1 if piece.est_blanc() else -1
+        valeur = VALEURS_PIECES[type(piece)]
+        materiel += signe * valeur
+        positions += SCORES_PIECES[piece.index][case] - signe * valeur
+        mobilite += signe * bin(ATTAQUES_VIDES[piece.index][case] & ~occupations[piece.couleur]).count('1')
+
+    for couleur, signe in (('blanc', -1), ('noir', 1)):
+        colonnes = pions_par_colonne[couleur]
+        for colonne, nombre in enumerate(colonnes):
+            voisins = (colonnes[colonne - 1] if colonne > 0 else 0) + (colonnes[colonne + 1] if colonne < 7 else 0)
+            structure_pions += signe * (max(nombre - 1, 0) + (nombre if voisins == 0 else 0))
+
+    return materiel, positions, mobilite, structure_pions
@@ -0,0 +1,180 @@
+# -*- coding: utf-8 -*-
+"""Module contenant l'évaluation de lots de positions avec NumPy, pour analyser un grand nombre de positions à la fois
+(par exemple toutes celles d'une base de parties) plutôt qu'un échiquier à la fois.
+
+Les positions sont d'abord converties en un tableau de plans de forme (N, 12, 64) et de type uint8: plans[n, i, case]
+vaut 1 si la pièce PIECES[i] occupe la case dans la n-ième position. Les termes de l'évaluation sont ensuite calculés
+pour toutes les positions par des opérations sur ces tableaux, sans boucle Python par position. Ils sont identiques à
+ceux de evaluation.termes_evaluation, et le score (matériel et positions) est celui de Echiquier.evaluation.
+
+Ce module demande NumPy, qui n'est pas nécessaire au reste du jeu: il n'est importé que s'il est installé, et les
+fonctions du module lèvent une ImportError autrement.
+
+"""
+from echecs.piece import PIECES
+from echecs.cases import INDEX_CASES
+from echecs.evaluation import VALEURS_PIECES, SCORES_PIECES, ATTAQUES_VIDES
+from functools import lru_cache
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Le nombre de positions évaluées à la fois, pour limiter la mémoire des tableaux intermédiaires.
+TAILLE_LOT = 16384
+
+
+def _verifier_numpy():
+    if numpy is None:
+        raise ImportError("NumPy est nécessaire pour évaluer des lots de positions (pip install numpy)")
+
+
+@lru_cache(maxsize=None)
+def _tables():
+    """Construit les tables de l'évaluation sous forme de tableaux NumPy, une seule fois.
+
+    Returns:
+        tuple: La valeur signée de chaque pièce (12), le bonus signé de chaque pièce sur chaque case (12, 64), et les
+            cases attaquées sur l'échiquier vide par chaque pièce depuis chaque case (12, 64, 64).
+
+    """
+    valeurs = numpy.array([VALEURS_PIECES[type(piece)] * (1 if piece.est_blanc() else -1) for piece in PIECES],
+                          dtype=numpy.int64)
+    bonus = numpy.array(SCORES_PIECES, dtype=numpy.int64) - valeurs[:, None]
+    attaques = numpy.array([[[attaques >> cible & 1 for cible in range(64)] for attaques in attaques_piece]
+                            for attaques_piece in ATTAQUES_VIDES], dtype=numpy.int32)
+
+    return valeurs, bonus, attaques
+
+
+def vers_plans(echiquiers):
+    """Convertit des échiquiers en plans.
+
+    Args:
+        echiquiers (list): Les échiquiers (Echiquier ou EchiquierBitboard).
+
+    Returns:
+        numpy.ndarray: Les plans, de forme (N, 12, 64) et de type uint8.
+
+    """
+    _verifier_numpy()
+    plans = numpy.zeros((len(echiquiers), 12, 64), dtype=numpy.uint8)
+    lignes, index_pieces, cases = [], [], []
+
+    for ligne, echiquier in enumerate(echiquiers):
+        bitboards = getattr(echiquier, 'bitboards', None)
+        if bitboards is not None:
+            # Les bitboards sont déjà des plans: il suffit d'en extraire les bits, du plus faible (a1) au plus fort.
+            octets = numpy.array(bitboards, dtype='<u8').view(numpy.uint8)
+            plans[ligne] = numpy.unpackbits(octets, bitorder='little').reshape(12, 64)
+            continue
+
+        for position, piece in echiquier.dictionnaire_pieces.items():
+            lignes.append(ligne)
+            index_pieces.append(piece.index)
+            cases.append(INDEX_CASES[position])
+
+    if lignes:
+        plans[lignes, index_pieces, cases] = 1
+    return plans
+
+
+class EvaluationsLot:
+    """Les termes de l'évaluation d'un lot de positions, du point de vue du joueur blanc (voir
+    evaluation.termes_evaluation). Chaque attribut est un tableau de forme (N,).
+
+    Attributes:
+        materiel (numpy.ndarray): La somme des valeurs des pièces.
+        positions (numpy.ndarray): La somme des bonus des tables de positions.
+        mobilite (numpy.ndarray): L'approximation de la mobilité.
+        structure_pions (numpy.ndarray): La pénalité des pions doublés et isolés.
+
+    """
+    __slots__ = ('materiel', 'positions', 'mobilite', 'structure_pions')
+
+    def __init__(self, materiel, positions, mobilite, structure_pions):
+        self.materiel = materiel
+        self.positions = positions
+        self.mobilite = mobilite
+        self.structure_pions = structure_pions
+
+    @property
+    def score(self):
+        # Le score tenu à jour par l'échiquier (voir Echiquier.evaluation).
+        return self.materiel + self.positions
+
+
+def _evaluer_plans(plans):
+    valeurs, bonus, attaques = _tables()
+    pieces = plans.astype(numpy.int32)
+    nombre = len(pieces)
+    # Chaque position devient une ligne de 768 colonnes (12 pièces sur 64 cases): les sommes pondérées sur les
+    # pièces et les cases deviennent des produits matriciels.
+    lignes = pieces.reshape(nombre, 12 * 64)
+
+    materiel = pieces.sum(axis=2) @ valeurs
+    positions = lignes @ bonus.reshape(12 * 64)
+
+    # attaquees[n, cible]: le nombre de pièces d'une couleur qui attaquent la case cible. Seules les cases libres ou
+    # occupées par l'adversaire comptent dans la mobilité de chaque couleur.
+    mobilite = numpy.zeros(nombre, dtype=numpy.int64)
+    for couleurs, signe in ((slice(0, 6), 1), (slice(6, 12), -1)):
+        attaquees = pieces[:, couleurs].reshape(nombre, 6 * 64) @ attaques[couleurs].reshape(6 * 64, 64)
+        libres = 1 - pieces[:, couleurs].sum(axis=1)
+        mobilite += signe * (attaquees * libres).sum(axis=1)
+
+    # Les pions de chaque couleur par colonne: la case d'index 8 * rangée + colonne devient [rangée, colonne].
+    structure_pions = numpy.zeros(nombre, dtype=numpy.int64)
+    for index_pion, signe in ((0, -1), (6, 1)):
+        colonnes = pieces[:, index_pion].reshape(nombre, 8, 8).sum(axis=1)
+        bordees = numpy.pad(colonnes, ((0, 0), (1, 1)))
+        voisins = bordees[:, :-2] + bordees[:, 2:]
+        doubles = numpy.maximum(colonnes - 1, 0).sum(axis=1)
+        isoles = (colonnes * (voisins == 0)).sum(axis=1)
+        structure_pions += signe * (doubles + isoles)
+
+    return materiel, positions, mobilite, structure_pions
+
+
+def evaluer_plans(plans, taille_lot=TAILLE_LOT):
+    """Évalue des positions déjà converties en plans (voir vers_plans).
+
+    Args:
+        plans (numpy.ndarray): Les plans, de forme (N, 12, 64).
+        taille_lot (int): Le nombre de positions évaluées à la fois.
+
+    Returns:
+        EvaluationsLot: Les termes de l'évaluation de chaque position.
+
+    """
+    _verifier_numpy()
+    termes = [numpy.zeros(len(plans), dtype=numpy.int64) for _ in range(4)]
+
+    for debut in range(0, len(plans), taille_lot):
+        for terme, valeurs in zip(termes, _evaluer_plans(plans[debut:debut + taille_lot])):
+            terme[debut:debut + taille_lot] = valeurs
+
+    return EvaluationsLot(*termes)
+
+
+def evaluer_lot(echiquiers, taille_lot=TAILLE_LOT):
+    """Évalue un lot d'échiquiers.
+
+    Args:
+        echiquiers (list): Les échiquiers (Echiquier ou EchiquierBitboard).
+        taille_lot (int): Le nombre de positions converties et évaluées à la fois.
+
+    Returns:
+        EvaluationsLot: Les termes de l'évaluation de chaque position.
+
+    """
+    _verifier_numpy()
+    resultats = [evaluer_plans(vers_plans(echiquiers[debut:debut + taille_lot]), taille_lot)
+                 for debut in range(0, len(echiquiers), taille_lot)]
+
+    if not resultats:
+        return EvaluationsLot(*(numpy.zeros(0, dtype=numpy.int64) for _ in range(4)))
+
+    return EvaluationsLot(*(numpy.concatenate([getattr(resultat, attribut) for resultat in resultats])
+                            for attribut in EvaluationsLot.__slots__))
@@ -18,3 +18,24 @@ class MauvaiseCouleur(Exception):
     Cette exception est levées lorsque la couleur de la pièce n'est pas celle du joueur actif.
     """
     pass
+
+
+class RechercheEnCours(Exception):
+    """
+    Cette exception est levées lorsqu'une recherche du moteur est démarrée alors qu'une autre est encore en cours.
+    """
+    pass
+
+
+class FichierInvalide(Exception):
+    """
+    Cette exception est levées lorsqu'un fichier (livre d'ouvertures, table de finales, etc.) n'a pas le format attendu.
+    """
+    pass
+
+
+class FenInvalide(Exception):
+    """
+    Cette exception est levées lorsqu'une chaîne FEN ne décrit pas une position valide.
+    """
+    pass
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Module contenant la lecture et l'écriture des positions en notation FEN (Forsyth-Edwards Notation), par exemple:
+    rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b - - 0 1
+
+Les deux premiers champs décrivent la position: le placement des pièces, de la rangée 8 à la rangée 1, et le joueur
+qui doit jouer. Le numéro du déplacement complet (dernier champ) peut être lu avec lire_numero_deplacement. Les autres
+champs (roque, prise en passant, compteur des cinquante coups) n'ont pas d'équivalent dans les règles du jeu: ils sont
+ignorés à la lecture, et écrits avec leur valeur par défaut.
+
+"""
+from echecs.piece import PIECES, Pion, Tour, Cavalier, Fou, Dame, Roi
+from echecs.cases import CASES
+from echecs.exceptions import FenInvalide
+
+LETTRES_TYPES = {Pion: 'p', Tour: 'r', Cavalier: 'n', Fou: 'b', Dame: 'q', Roi: 'k'}
+
+# La lettre de chaque pièce, majuscule pour les pièces blanches, dans l'ordre de PIECES.
+LETTRES_PIECES = tuple(LETTRES_TYPES[type(piece)].upper() if piece.est_blanc() else LETTRES_TYPES[type(piece)]
+                       for piece in PIECES)
+
+# Ce que représente chaque caractère du placement: une pièce, ou un nombre de cases vides.
+CARACTERES_PLACEMENT = dict(zip(LETTRES_PIECES, PIECES))
+CARACTERES_PLACEMENT.update({str(nombre): nombre for nombre in range(1, 9)})
+
+TRAITS = {'w': 'blanc', 'b': 'noir'}
+LETTRES_TRAITS = {couleur: lettre for lettre, couleur in TRAITS.items()}
+
+FEN_DEPART = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w - - 0 1'
+
+
+def lire_fen(fen):
+    """Lit une position en notation FEN, en un seul passage sur le placement des pièces.
+
+    Args:
+        fen (str): La position.
+
+    Returns:
+        tuple: Le dictionnaire des pièces, par position, et la couleur (blanc ou noir) du joueur qui doit jouer.
+
+    Raises:
+        FenInvalide: Si la chaîne n'est pas une position FEN valide.
+
+    """
+    champs = fen.split(None, 2)
+    if not champs:
+        raise FenInvalide("La position FEN est vide")
+
+    trait = TRAITS.get(champs[1]) if len(champs) > 1 else 'blanc'
+    if trait is None:
+        raise FenInvalide("Le joueur qui doit jouer doit être w ou b: {}".format(champs[1]))
+
+    pieces = {}
+    # La case a8, où commence le placement, et la colonne courante dans la rangée.
+    debut_rangee, colonne = 56, 0
+    caracteres = CARACTERES_PLACEMENT
+
+    for caractere in champs[0]:
+        valeur = caracteres.get(caractere)
+        if valeur is None:
+            if caractere != '/' or colonne != 8 or debut_rangee == 0:
+                raise FenInvalide("Le placement des pièces n'est pas valide: {}".format(champs[0]))
+            debut_rangee -= 8
+            colonne = 0
+        elif valeur.__class__ is int:
+            colonne += valeur
+            if colonne > 8:
+                raise FenInvalide("Le placement des pièces n'est pas valide: {}".format(champs[0]))
+        else:
+            if colonne == 8:
+                raise FenInvalide("Le placement des pièces n'est pas valide: {}".format(champs[0]))
+            pieces[CASES[debut_rangee + colonne]] = valeur
+            colonne += 1
+
+    if debut_rangee != 0 or colonne != 8:
+        raise FenInvalide("Le placement des pièces doit décrire huit rangées: {}".format(champs[0]))
+
+    return pieces, trait
+
+
+def lire_numero_deplacement(fen):
+    """Lit le numéro du déplacement complet d'une position en notation FEN (son sixième et dernier champ).
+
+    Args:
+        fen (str): La position.
+
+    Returns:
+        int: Le numéro du déplacement complet, ou 1 si la position ne le précise pas.
+
+    Raises:
+        FenInvalide: Si le numéro n'est pas un entier positif.
+
+    """
+    champs = fen.split()
+    if len(champs) < 6:
+        return 1
+
+    if not champs[5].isdigit() or int(champs[5]) < 1:
+        raise FenInvalide("Le numéro du déplacement doit être un entier positif: {}".format(champs[5]))
+
+    return int(champs[5])
+
+
+def ecrire_fen(pieces, trait, numero_deplacement=1):
+    """Écrit une position en notation FEN.
+
+    Args:
+        pieces (Mapping): Les pièces, par position.
+        trait (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+        numero_deplacement (int): Le numéro du déplacement complet (dernier champ de la notation).
+
+    Returns:
+        str: La position.
+
+    """
+    rangees = []
+
+    for debut_rangee in range(56, -1, -8):
+        rangee, vides = [], 0
+        for case in range(debut_rangee, debut_rangee + 8):
+            piece = pieces.get(CASES[case])
+            if piece is None:
+                vides += 1
+                continue
+            if vides:
+                rangee.append(str(vides))
+                vides = 0
+            rangee.append(LETTRES_PIECES[piece.index])
+        if vides:
+            rangee.append(str(vides))
+        rangees.append(''.join(rangee))
+
+    return '{} {} - - 0 {}'.format('/'.join(rangees), LETTRES_TRAITS[trait], numero_deplacement)
+
+
+def lire_lignes_fen(lignes):
+    """Lit une position FEN par ligne, au fur et à mesure, en ignorant les lignes vides et les commentaires (qui
+    commencent par #).
+
+    Args:
+        lignes (iterable): Les lignes, par exemple un fichier ouvert en lecture.
+
+    Yields:
+        tuple: Le dictionnaire des pièces et le joueur qui doit jouer de chaque position (voir lire_fen).
+
+    """
+    for ligne in lignes:
+        ligne = ligne.strip()
+        if ligne and not ligne.startswith('#'):
+            yield lire_fen(ligne)
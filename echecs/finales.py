@@ -0,0 +1,416 @@
+# -*- coding: utf-8 -*-
+"""Module contenant les tables de finales: le résultat exact de chaque position d'une finale à trois pièces (les deux
+rois et une pièce d'un des joueurs, par exemple roi et dame contre roi), calculé une fois pour toutes plutôt que
+cherché par le moteur.
+
+Les tables sont générées par analyse rétrograde. Les positions où le joueur qui doit jouer peut manger le roi adverse
+sont gagnées en un déplacement. On remonte ensuite les déplacements, une profondeur à la fois: une position dont un
+déplacement mène à une position perdue pour l'adversaire est gagnée, et une position dont tous les déplacements mènent
+à des positions gagnées pour l'adversaire est perdue. Les positions jamais atteintes ainsi sont nulles: aucun joueur
+ne peut forcer la prise du roi adverse. Les déplacements sont ceux permis par les règles des pièces (voir le module
+piece): sans promotion, un pion arrivé à la dernière rangée ne bouge plus.
+
+Chaque position est conservée dans un octet: le nombre de déplacements (des deux joueurs) avant la prise du roi, si
+les deux jouent au mieux. Ce nombre est impair si le joueur qui doit jouer gagne, pair s'il perd, et nul si la position
+est nulle. La valeur INVALIDE marque les positions impossibles (deux pièces sur une même case).
+
+Les tables sont calculées pour le joueur blanc avec la pièce supplémentaire (le joueur « fort »); une position où
+c'est le joueur noir est retournée verticalement. Seule une position de chaque classe de symétrie est conservée: le
+roi fort est ramené dans le triangle a1-d1-d4 par les huit symétries de l'échiquier, ou seulement sur les colonnes a à
+d par la symétrie gauche-droite lorsqu'il y a un pion. L'index d'une position dans la table est:
+    ((trait * nombre de cases du roi fort + case du roi fort) * 64 + case du roi faible) * 64 + case de la pièce
+où le trait est 0 si c'est au joueur fort de jouer, et 1 autrement.
+
+Utilisation:
+    python -m echecs.finales finales/ RDR RTR RPR
+
+"""
+from echecs.piece import PIECES, TYPES_PIECES, Pion, Tour, Cavalier, Fou, Dame, Roi
+from echecs.cases import INDEX_CASES, ENTRE, COLONNES, RANGEES, ATTAQUES_ROI
+from echecs.exceptions import FichierInvalide
+from argparse import ArgumentParser
+from array import array
+import mmap
+import os
+import struct
+
+# L'en-tête d'un fichier de table: la signature, la version du format, l'index (dans TYPES_PIECES) du type de la
+# pièce supplémentaire, et le nombre d'octets de la table.
+ENTETE = struct.Struct('<4sHHI')
+SIGNATURE = b'FINA'
+VERSION = 1
+
+EXTENSION = '.fin'
+INVALIDE = 0xFF
+
+# La lettre de chaque type de pièce dans le nom des finales: RDR est roi et dame contre roi.
+LETTRES_FINALES = {Dame: 'D', Tour: 'T', Fou: 'F', Cavalier: 'C', Pion: 'P'}
+TYPES_FINALES = {'R' + lettre + 'R': type_piece for type_piece, lettre in LETTRES_FINALES.items()}
+
+INDEX_ROI_FORT = PIECES.index(Roi('blanc'))
+INDEX_ROI_FAIBLE = PIECES.index(Roi('noir'))
+
+
+def _transformer(case, symetrie):
+    # Une symétrie est une combinaison de trois opérations: retourner les colonnes, les rangées, puis les transposer.
+    colonne, rangee = COLONNES[case], RANGEES[case]
+    if symetrie & 1:
+        colonne = 7 - colonne
+    if symetrie & 2:
+        rangee = 7 - rangee
+    if symetrie & 4:
+        colonne, rangee = rangee, colonne
+    return 8 * rangee + colonne
+
+
+# SYMETRIES[i][case] est l'image de la case par la i-ème symétrie de l'échiquier. Les deux premières (l'identité et
+# la symétrie gauche-droite) sont les seules qui conservent la direction des pions.
+SYMETRIES = tuple(tuple(_transformer(case, symetrie) for case in range(64)) for symetrie in range(8))
+
+# Les cases où le roi fort est ramené, avec et sans pion, et l'index de chacune dans la table.
+CASES_ROI_SANS_PION = tuple(case for case in range(64) if COLONNES[case] <= 3 and RANGEES[case] <= COLONNES[case])
+CASES_ROI_AVEC_PION = tuple(case for case in range(64) if COLONNES[case] <= 3)
+
+
+def _deplacements(index_piece, prise):
+    # Les cases atteintes par la pièce depuis chaque case, selon ses règles, sans considérer les autres pièces.
+    piece = PIECES[index_piece]
+    regle = piece.peut_faire_une_prise_vers_case if prise else piece.peut_se_deplacer_vers_case
+    return tuple(tuple(cible for cible in range(64) if cible != source and regle(source, cible))
+                 for source in range(64))
+
+
+class GenerateurFinale:
+    """Génère la table d'une finale par analyse rétrograde, sur toutes les positions (sans réduction par symétrie),
+    puis ne conserve que les positions canoniques.
+
+    Attributes:
+        type_piece (type): Le type de la pièce supplémentaire du joueur fort.
+        valeurs (bytearray): La valeur de chaque position, selon l'index complet (voir index_complet).
+
+    Args:
+        type_piece (type): Le type de la pièce supplémentaire du joueur fort.
+
+    """
+
+    def __init__(self, type_piece):
+        self.type_piece = type_piece
+        self.index_piece = PIECES.index(type_piece('blanc'))
+        self.valeurs = bytearray(2 * 64 * 64 * 64)
+
+        self._deplacements = {index: _deplacements(index, False)
+                              for index in (INDEX_ROI_FORT, INDEX_ROI_FAIBLE, self.index_piece)}
+        self._prises = _deplacements(self.index_piece, True)
+        self._origines = {index: tuple(tuple(source for source in range(64) if cible in deplacements[source])
+                                       for cible in range(64))
+                          for index, deplacements in self._deplacements.items()}
+        self._saute = PIECES[self.index_piece].peut_sauter
+
+    @staticmethod
+    def index_complet(trait, roi_fort, roi_faible, piece):
+        return ((trait * 64 + roi_fort) * 64 + roi_faible) * 64 + piece
+
+    def _chemin_libre(self, source, cible, occupation):
+        return self._saute or not ENTRE[source][cible] & occupation
+
+    def _initialiser(self):
+        # Retourne le nombre de déplacements de chaque position qui ne sont pas encore connus pour être perdants, et
+        # les positions gagnées en un déplacement.
+        valeurs = self.valeurs
+        restants = array('B', bytes(len(valeurs)))
+        gagnees = []
+        deplacements_roi_fort = self._deplacements[INDEX_ROI_FORT]
+        deplacements_roi_faible = self._deplacements[INDEX_ROI_FAIBLE]
+        deplacements_piece = self._deplacements[self.index_piece]
+
+        for roi_fort in range(64):
+            for roi_faible in range(64):
+                for piece in range(64):
+                    if roi_fort == roi_faible or piece == roi_fort or piece == roi_faible:
+                        valeurs[self.index_complet(0, roi_fort, roi_faible, piece)] = INVALIDE
+                        valeurs[self.index_complet(1, roi_fort, roi_faible, piece)] = INVALIDE
+                        continue
+                    occupation = 1 << roi_fort | 1 << roi_faible | 1 << piece
+
+                    # Le joueur fort doit jouer
+                    index = self.index_complet(0, roi_fort, roi_faible, piece)
+                    if roi_faible in deplacements_roi_fort[roi_fort] or (
+                            roi_faible in self._prises[piece]
+                            and self._chemin_libre(piece, roi_faible, occupation)):
+                        valeurs[index] = 1
+                        gagnees.append(index)
+                    else:
+                        restants[index] = (
+                            sum(1 for cible in deplacements_roi_fort[roi_fort] if cible != piece)
+                            + sum(1 for cible in deplacements_piece[piece]
+                                  if not occupation >> cible & 1 and self._chemin_libre(piece, cible, occupation)))
+
+                    # Le joueur faible doit jouer. Manger la pièce mène à une position roi contre roi, perdue si le
+                    # roi fort peut alors manger le roi faible, et nulle autrement: ce déplacement n'est compté que
+                    # s'il mène à une nulle, et ne sera donc jamais retiré du compte.
+                    index = self.index_complet(1, roi_fort, roi_faible, piece)
+                    if roi_fort in deplacements_roi_faible[roi_faible]:
+                        valeurs[index] = 1
+                        gagnees.append(index)
+                    else:
+                        restants[index] = sum(1 for cible in deplacements_roi_faible[roi_faible]
+                                              if cible != piece or not ATTAQUES_ROI[roi_fort] >> piece & 1)
+
+        return restants, gagnees
+
+    def _predecesseurs(self, index):
+        # Les positions d'où un déplacement (sans prise) du joueur qui vient de jouer mène à celle reçue.
+        piece = index & 63
+        roi_faible = index >> 6 & 63
+        roi_fort = index >> 12 & 63
+        trait = index >> 18
+        occupation = 1 << roi_fort | 1 << roi_faible | 1 << piece
+
+        if trait == 1:
+            for source in self._origines[INDEX_ROI_FORT][roi_fort]:
+                if not occupation >> source & 1:
+                    yield self.index_complet(0, source, roi_faible, piece)
+            for source in self._origines[self.index_piece][piece]:
+                if not occupation >> source & 1 and self._chemin_libre(source, piece, occupation):
+                    yield self.index_complet(0, roi_fort, roi_faible, source)
+        else:
+            for source in self._origines[INDEX_ROI_FAIBLE][roi_faible]:
+                if not occupation >> source & 1:
+                    yield self.index_complet(1, roi_fort, source, piece)
+
+    def generer(self):
+        """Calcule la valeur de toutes les positions de la finale.
+
+        """
+        valeurs = self.valeurs
+        restants, niveau = self._initialiser()
+        distance = 1
+
+        while niveau:
+            suivant = []
+            for index in niveau:
+                for predecesseur in self._predecesseurs(index):
+                    if valeurs[predecesseur]:
+                        continue
+                    if distance & 1:
+                        # La position est gagnée pour le joueur qui doit y jouer: ce déplacement est perdant.
+                        restants[predecesseur] -= 1
+                        if restants[predecesseur]:
+                            continue
+                    valeurs[predecesseur] = distance + 1
+                    suivant.append(predecesseur)
+
+            niveau = suivant
+            distance += 1
+
+    def table(self):
+        """Extrait la table conservée dans le fichier: les positions canoniques seulement, dans l'ordre de leur index
+        (voir la documentation du module).
+
+        Returns:
+            bytearray: La table.
+
+        """
+        cases_roi = CASES_ROI_AVEC_PION if self.type_piece is Pion else CASES_ROI_SANS_PION
+        table = bytearray()
+        for trait in range(2):
+            for roi_fort in cases_roi:
+                debut = self.index_complet(trait, roi_fort, 0, 0)
+                table += self.valeurs[debut:debut + 64 * 64]
+
+        return table
+
+
+def generer_finale(nom, dossier):
+    """Génère la table d'une finale et l'écrit dans un dossier.
+
+    Args:
+        nom (str): Le nom de la finale, par exemple RDR (voir TYPES_FINALES).
+        dossier (str): Le dossier où écrire la table.
+
+    Returns:
+        str: Le chemin du fichier écrit.
+
+    """
+    type_piece = TYPES_FINALES[nom]
+    generateur = GenerateurFinale(type_piece)
+    generateur.generer()
+    table = generateur.table()
+
+    chemin = os.path.join(dossier, nom + EXTENSION)
+    with open(chemin, 'wb') as fichier:
+        fichier.write(ENTETE.pack(SIGNATURE, VERSION, TYPES_PIECES.index(type_piece), len(table)))
+        fichier.write(table)
+
+    return chemin
+
+
+class TableFinale:
+    """La table d'une finale, ouverte en lecture avec mmap.
+
+    Attributes:
+        type_piece (type): Le type de la pièce supplémentaire du joueur fort.
+
+    Args:
+        chemin (str): Le chemin du fichier de la table.
+
+    Raises:
+        FichierInvalide: Si le fichier n'est pas une table de finale.
+
+    """
+
+    def __init__(self, chemin):
+        with open(chemin, 'rb') as fichier:
+            taille = fichier.seek(0, 2)
+            if taille < ENTETE.size:
+                raise FichierInvalide("Ce fichier n'est pas une table de finale")
+            self._memoire = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+
+        signature, version, index_type, taille_table = ENTETE.unpack_from(self._memoire)
+        if signature != SIGNATURE or version != VERSION or index_type >= len(TYPES_PIECES):
+            self._memoire.close()
+            raise FichierInvalide("Ce fichier n'est pas une table de finale, ou sa version n'est pas supportée")
+
+        self.type_piece = TYPES_PIECES[index_type]
+        if self.type_piece is Pion:
+            self._cases_roi, self._symetries = CASES_ROI_AVEC_PION, SYMETRIES[:2]
+        else:
+            self._cases_roi, self._symetries = CASES_ROI_SANS_PION, SYMETRIES
+        self._index_cases_roi = {case: index for index, case in enumerate(self._cases_roi)}
+
+        if taille_table != 2 * len(self._cases_roi) * 64 * 64 or taille != ENTETE.size + taille_table:
+            self._memoire.close()
+            raise FichierInvalide("La taille de cette table de finale ne correspond pas à son contenu")
+
+    def sonder(self, roi_fort, roi_faible, piece, trait_fort):
+        """Retourne la valeur d'une position, où le joueur fort est le joueur blanc.
+
+        Args:
+            roi_fort (int): La case du roi du joueur fort.
+            roi_faible (int): La case du roi du joueur faible.
+            piece (int): La case de la pièce du joueur fort.
+            trait_fort (bool): True si c'est au joueur fort de jouer.
+
+        Returns:
+            int: Le nombre de déplacements avant la prise d'un roi (impair si le joueur qui doit jouer gagne, pair s'il
+                perd), ou 0 si la position est nulle.
+
+        """
+        for symetrie in self._symetries:
+            if symetrie[roi_fort] in self._index_cases_roi:
+                break
+
+        index = (((0 if trait_fort else 1) * len(self._cases_roi) + self._index_cases_roi[symetrie[roi_fort]]) * 64
+                 + symetrie[roi_faible]) * 64 + symetrie[piece]
+        return self._memoire[ENTETE.size + index]
+
+    def fermer(self):
+        """Ferme le fichier de la table.
+
+        """
+        self._memoire.close()
+
+
+class SondeFinales:
+    """Les tables de finales disponibles dans un dossier, qui répondent pour toute position de l'une de ces finales.
+    Elle doit être fermée avec la méthode fermer, ou utilisée dans un bloc with.
+
+    Args:
+        dossier (str): Le dossier contenant les tables.
+
+    """
+
+    def __init__(self, dossier):
+        self.tables = {}
+        for nom_fichier in sorted(os.listdir(dossier)):
+            if nom_fichier.endswith(EXTENSION):
+                table = TableFinale(os.path.join(dossier, nom_fichier))
+                self.tables[table.type_piece] = table
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_exception, exception, trace):
+        self.fermer()
+
+    def sonder(self, echiquier, couleur):
+        """Retourne le résultat exact d'une position, si elle fait partie d'une finale disponible.
+
+        Args:
+            echiquier (Echiquier): L'échiquier.
+            couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+
+        Returns:
+            int or None: Le nombre de déplacements avant la prise d'un roi, positif si le joueur qui doit jouer gagne
+                et négatif s'il perd, ou 0 si la position est nulle. None si la position ne fait partie d'aucune
+                finale disponible.
+
+        """
+        pieces = echiquier.dictionnaire_pieces
+        if len(pieces) != 3:
+            return None
+
+        roi_fort = roi_faible = piece = table = None
+        for position, piece_a_position in pieces.items():
+            if type(piece_a_position) is not Roi:
+                piece, couleur_forte = position, piece_a_position.couleur
+                table = self.tables.get(type(piece_a_position))
+        if table is None:
+            return None
+
+        for position, piece_a_position in pieces.items():
+            if type(piece_a_position) is Roi:
+                if piece_a_position.couleur == couleur_forte:
+                    roi_fort = position
+                else:
+                    roi_faible = position
+        if roi_fort is None or roi_faible is None:
+            return None
+
+        # Les tables sont calculées pour un joueur fort blanc: l'échiquier est retourné verticalement au besoin.
+        retourner = 56 if couleur_forte == 'noir' else 0
+        distance = table.sonder(INDEX_CASES[roi_fort] ^ retourner, INDEX_CASES[roi_faible] ^ retourner,
+                                INDEX_CASES[piece] ^ retourner, couleur == couleur_forte)
+
+        return distance if distance & 1 else -distance
+
+    def sonder_partie(self, partie):
+        """Retourne le résultat exact de la position d'une partie, pour le joueur actif (voir sonder).
+
+        Args:
+            partie (Partie): La partie en cours.
+
+        Returns:
+            int or None: Le résultat, ou None si la position ne fait partie d'aucune finale disponible.
+
+        """
+        return self.sonder(partie.echiquier, partie.joueur_actif)
+
+    def fermer(self):
+        """Ferme les fichiers des tables.
+
+        """
+        for table in self.tables.values():
+            table.fermer()
+
+
+def principal(arguments=None):
+    """Point d'entrée de la ligne de commande: génère les tables de finales demandées.
+
+    Args:
+        arguments (list): Les arguments de la ligne de commande, ou None pour utiliser ceux de sys.argv.
+
+    """
+    analyseur = ArgumentParser(prog='python -m echecs.finales',
+                               description='Génère des tables de finales par analyse rétrograde.')
+    analyseur.add_argument('dossier', help='le dossier où écrire les tables')
+    analyseur.add_argument('finales', nargs='+', choices=sorted(TYPES_FINALES), help='les finales à générer')
+    options = analyseur.parse_args(arguments)
+
+    os.makedirs(options.dossier, exist_ok=True)
+    for nom in options.finales:
+        print(generer_finale(nom, options.dossier))
+
+
+if __name__ == '__main__':
+    principal()
@@ -0,0 +1,278 @@
+# -*- coding: utf-8 -*-
+"""Module contenant le journal des déplacements d'une partie: un fichier texte auquel les déplacements sont seulement
+ajoutés, une ligne par déplacement, par exemple:
+    Pion Blanc de e2 vers e4
+    Cavalier Noir MANGE Pion Blanc de f6 vers e4
+    DÉPLACEMENT ANNULÉ
+
+Le journal conserve ses entrées en mémoire: les afficher ou lire la dernière ne relit pas le fichier. Les lignes sont
+écrites par lots de TAILLE_LOT entrées, dans un fichier qui reste ouvert, et l'écriture sur le disque (fsync) suit une
+des politiques suivantes:
+    FSYNC_JAMAIS: le système écrit le fichier sur le disque quand il le décide.
+    FSYNC_LOT: après chaque lot écrit.
+    FSYNC_FERMETURE: à la fermeture du journal (à la fin du programme au plus tard).
+
+Chaque lot est écrit en une seule fois, et chaque ligne se termine par un saut de ligne: après un arrêt brutal, seule la
+dernière ligne peut être incomplète. À la reprise d'un journal existant, elle est retirée du fichier (voir
+Journal.reprendre). La dernière entrée peut aussi être lue sans relire tout le fichier (voir lire_derniere_entree).
+
+"""
+from echecs.piece import PIECES
+import atexit
+import os
+import re
+
+FSYNC_JAMAIS = 'jamais'
+FSYNC_LOT = 'lot'
+FSYNC_FERMETURE = 'fermeture'
+POLITIQUES_FSYNC = (FSYNC_JAMAIS, FSYNC_LOT, FSYNC_FERMETURE)
+
+# Le nombre d'entrées conservées en mémoire avant d'être écrites dans le fichier.
+TAILLE_LOT = 16
+
+# La taille maximale d'une ligne du journal, en octets: la dernière entrée se trouve dans les derniers octets du
+# fichier.
+TAILLE_LIGNE_MAXIMALE = 256
+
+ANNULATION = 'DÉPLACEMENT ANNULÉ'
+
+PIECES_PAR_NOM = {str(piece): piece for piece in PIECES}
+EXPRESSION_LIGNE = re.compile(r'^(.+?) (?:MANGE (.+?) )?de ([a-h][1-8]) vers ([a-h][1-8])$')
+
+
+class EntreeJournal:
+    """Une entrée du journal: un déplacement, ou l'annulation du dernier déplacement.
+
+    Attributes:
+        piece (Piece or None): La pièce déplacée, ou None pour une annulation.
+        piece_prise (Piece or None): La pièce mangée par le déplacement, ou None.
+        position_source (str or None): La position source du déplacement.
+        position_cible (str or None): La position cible du déplacement.
+
+    """
+    __slots__ = ('piece', 'piece_prise', 'position_source', 'position_cible')
+
+    def __init__(self, piece=None, piece_prise=None, position_source=None, position_cible=None):
+        self.piece = piece
+        self.piece_prise = piece_prise
+        self.position_source = position_source
+        self.position_cible = position_cible
+
+    @property
+    def est_annulation(self):
+        return self.piece is None
+
+    def __str__(self):
+        if self.piece is None:
+            return ANNULATION
+        if self.piece_prise is not None:
+            return f'{self.piece} MANGE {self.piece_prise} de {self.position_source} vers {self.position_cible}'
+        return f'{self.piece} de {self.position_source} vers {self.position_cible}'
+
+    @classmethod
+    def depuis_ligne(cls, ligne):
+        """Crée une entrée à partir d'une ligne du journal.
+
+        Args:
+            ligne (str): La ligne, sans son saut de ligne.
+
+        Returns:
+            EntreeJournal or None: L'entrée, ou None si la ligne n'est pas une entrée valide.
+
+        """
+        if ligne == ANNULATION:
+            return cls()
+
+        correspondance = EXPRESSION_LIGNE.match(ligne)
+        if correspondance is None:
+            return None
+        nom_piece, nom_piece_prise, position_source, position_cible = correspondance.groups()
+        piece = PIECES_PAR_NOM.get(nom_piece)
+        piece_prise = PIECES_PAR_NOM.get(nom_piece_prise) if nom_piece_prise is not None else None
+        if piece is None or (nom_piece_prise is not None and piece_prise is None):
+            return None
+
+        return cls(piece, piece_prise, position_source, position_cible)
+
+
+class Journal:
+    """Le journal des déplacements d'une partie. Il doit être fermé avec la méthode fermer, ou utilisé dans un bloc
+    with; autrement, il est fermé à la fin du programme.
+
+    Attributes:
+        chemin (str): Le chemin du fichier du journal.
+        entrees (list): Les entrées du journal, de la première à la dernière.
+        politique_fsync (str): La politique d'écriture sur le disque, parmi POLITIQUES_FSYNC.
+        taille_lot (int): Le nombre d'entrées conservées en mémoire avant d'être écrites.
+
+    Args:
+        chemin (str): Le chemin du fichier du journal.
+        politique_fsync (str): La politique d'écriture sur le disque.
+        taille_lot (int): Le nombre d'entrées conservées en mémoire avant d'être écrites.
+        reprendre (bool): True pour reprendre les entrées d'un journal existant (voir reprendre), False pour vider le
+            fichier.
+
+    Raises:
+        ValueError: Si la politique d'écriture sur le disque n'existe pas.
+
+    """
+
+    def __init__(self, chemin='historique.txt', politique_fsync=FSYNC_FERMETURE, taille_lot=TAILLE_LOT,
+                 reprendre=False):
+        if politique_fsync not in POLITIQUES_FSYNC:
+            raise ValueError("Cette politique d'écriture sur le disque n'existe pas: {}".format(politique_fsync))
+
+        self.chemin = chemin
+        self.politique_fsync = politique_fsync
+        self.taille_lot = taille_lot
+        self.entrees = []
+        self._en_attente = []
+
+        if reprendre:
+            self.entrees = self.reprendre(chemin)
+        self._fichier = open(chemin, 'ab' if reprendre else 'wb')
+        atexit.register(self.fermer)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_exception, exception, trace):
+        self.fermer()
+
+    def __len__(self):
+        return len(self.entrees)
+
+    def __iter__(self):
+        return iter(self.entrees)
+
+    def __str__(self):
+        return '\n'.join(str(entree) for entree in self.entrees)
+
+    @property
+    def derniere_entree(self):
+        return self.entrees[-1] if self.entrees else None
+
+    def ajouter(self, entree):
+        """Ajoute une entrée au journal. Elle est écrite dans le fichier avec le lot dont elle fait partie.
+
+        Args:
+            entree (EntreeJournal): L'entrée.
+
+        """
+        self.entrees.append(entree)
+        self._en_attente.append(str(entree))
+        if len(self._en_attente) >= self.taille_lot:
+            self.vider_tampon()
+
+    def ajouter_deplacement(self, piece, piece_prise, position_source, position_cible):
+        """Ajoute un déplacement au journal.
+
+        Args:
+            piece (Piece): La pièce déplacée.
+            piece_prise (Piece): La pièce mangée par le déplacement, ou None.
+            position_source (str): La position source.
+            position_cible (str): La position cible.
+
+        """
+        self.ajouter(EntreeJournal(piece, piece_prise, position_source, position_cible))
+
+    def ajouter_annulation(self):
+        """Ajoute au journal l'annulation du dernier déplacement.
+
+        """
+        self.ajouter(EntreeJournal())
+
+    def vider_tampon(self, fsync=None):
+        """Écrit dans le fichier les entrées qui sont encore en mémoire, en une seule écriture.
+
+        Args:
+            fsync (bool): True pour forcer l'écriture sur le disque. Par défaut, selon la politique du journal.
+
+        """
+        if self._en_attente:
+            self._fichier.write(''.join(ligne + '\n' for ligne in self._en_attente).encode('utf-8'))
+            self._fichier.flush()
+            self._en_attente = []
+            if fsync is None:
+                fsync = self.politique_fsync == FSYNC_LOT
+
+        if fsync:
+            os.fsync(self._fichier.fileno())
+
+    def effacer(self):
+        """Retire toutes les entrées du journal, et vide le fichier.
+
+        """
+        self.entrees = []
+        self._en_attente = []
+        # En mode 'wb', l'écriture suivante se ferait à la position courante: le fichier serait complété d'octets nuls.
+        self._fichier.seek(0)
+        self._fichier.truncate()
+
+    def fermer(self):
+        """Écrit les entrées encore en mémoire et ferme le fichier. Le journal ne peut plus être modifié ensuite.
+
+        """
+        if self._fichier.closed:
+            return
+
+        self.vider_tampon(fsync=self.politique_fsync != FSYNC_JAMAIS)
+        self._fichier.close()
+        atexit.unregister(self.fermer)
+
+    @staticmethod
+    def reprendre(chemin):
+        """Lit les entrées d'un journal existant, après un arrêt brutal par exemple. Le fichier est tronqué à la
+        première ligne incomplète (sans saut de ligne) ou qui n'est pas une entrée valide.
+
+        Args:
+            chemin (str): Le chemin du fichier du journal.
+
+        Returns:
+            list: Les entrées du journal, de la première à la dernière. La liste est vide si le fichier n'existe pas.
+
+        """
+        if not os.path.exists(chemin):
+            return []
+
+        with open(chemin, 'rb') as fichier:
+            contenu = fichier.read()
+
+        entrees = []
+        taille_valide = 0
+        for ligne in contenu.split(b'\n')[:-1]:
+            entree = EntreeJournal.depuis_ligne(ligne.decode('utf-8', errors='replace').rstrip('\r'))
+            if entree is None:
+                break
+            entrees.append(entree)
+            taille_valide += len(ligne) + 1
+
+        if taille_valide < len(contenu):
+            with open(chemin, 'r+b') as fichier:
+                fichier.truncate(taille_valide)
+
+        return entrees
+
+
+def lire_derniere_entree(chemin):
+    """Lit la dernière entrée complète d'un journal, en ne lisant que la fin du fichier.
+
+    Args:
+        chemin (str): Le chemin du fichier du journal.
+
+    Returns:
+        EntreeJournal or None: La dernière entrée, ou None si le journal est vide.
+
+    """
+    with open(chemin, 'rb') as fichier:
+        taille = fichier.seek(0, 2)
+        fichier.seek(max(0, taille - TAILLE_LIGNE_MAXIMALE))
+        fin = fichier.read()
+
+    # Une dernière ligne incomplète est ignorée: la dernière entrée est la ligne qui précède le dernier saut de ligne.
+    fin_derniere_ligne = fin.rfind(b'\n')
+    if fin_derniere_ligne < 0:
+        return None
+    lignes = fin[:fin_derniere_ligne].split(b'\n')
+
+    return EntreeJournal.depuis_ligne(lignes[-1].decode('utf-8', errors='replace').rstrip('\r'))
@@ -0,0 +1,251 @@
+# -*- coding: utf-8 -*-
+"""Module contenant le livre d'ouvertures: les déplacements joués dans un ensemble de parties au cours de leurs
+premiers déplacements, pour que le moteur joue l'ouverture sans chercher.
+
+Le livre est un fichier binaire composé d'un en-tête (voir ENTETE), suivi d'enregistrements de taille fixe (voir
+ENREGISTREMENT): la clé de Zobrist de la position (voir le module zobrist), le déplacement joué (l'index de la case
+source multiplié par 64, plus celui de la case cible) et son poids, soit le nombre de fois où il a été joué. Les
+enregistrements sont triés par clé, puis par déplacement.
+
+Le fichier est ouvert avec mmap plutôt que d'être lu: les déplacements d'une position sont trouvés par une recherche
+binaire, qui ne lit que quelques pages du fichier. Un livre de plusieurs millions d'enregistrements s'ouvre donc
+instantanément et n'occupe presque pas de mémoire.
+
+Utilisation:
+    python -m echecs.livre parties.txt livre.bin --profondeur 10
+
+Le fichier de parties contient une partie par ligne, sous forme de déplacements séparés par des espaces (par exemple
+e2e4 e7e5 g1f3), ou est une archive PGN (extension .pgn, voir le module pgn).
+
+"""
+from echecs.echiquier import Echiquier
+from echecs.ordonnancement import Ordonnanceur
+from echecs.cases import CASES, INDEX_CASES
+from echecs.piece import Roi
+from echecs.exceptions import FichierInvalide
+from echecs.pgn import lire_fichier_pgn
+from argparse import ArgumentParser
+from collections import Counter
+import mmap
+import random
+import struct
+
+# L'en-tête du fichier: la signature, la version du format, la taille d'un enregistrement et leur nombre.
+ENTETE = struct.Struct('<4sHHI')
+SIGNATURE = b'LIVR'
+VERSION = 1
+
+# Un enregistrement: la clé de la position, le déplacement et son poids.
+ENREGISTREMENT = struct.Struct('<QHH')
+POIDS_MAXIMUM = 0xFFFF
+
+# Le nombre de déplacements (des deux joueurs) retenus au début de chaque partie.
+PROFONDEUR_LIVRE = 10
+
+COULEUR_ADVERSE = {'blanc': 'noir', 'noir': 'blanc'}
+
+
+class LivreOuvertures:
+    """Un livre d'ouvertures ouvert en lecture. Il doit être fermé avec la méthode fermer, ou utilisé dans un bloc
+    with.
+
+    Attributes:
+        nombre (int): Le nombre d'enregistrements du livre.
+
+    Args:
+        chemin (str): Le chemin du fichier du livre.
+
+    Raises:
+        FichierInvalide: Si le fichier n'est pas un livre d'ouvertures.
+
+    """
+
+    def __init__(self, chemin):
+        with open(chemin, 'rb') as fichier:
+            taille = fichier.seek(0, 2)
+            if taille < ENTETE.size:
+                raise FichierInvalide("Ce fichier n'est pas un livre d'ouvertures")
+            self._memoire = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+
+        signature, version, taille_enregistrement, self.nombre = ENTETE.unpack_from(self._memoire)
+        if (signature != SIGNATURE or version != VERSION or taille_enregistrement != ENREGISTREMENT.size
+                or taille != ENTETE.size + self.nombre * ENREGISTREMENT.size):
+            self._memoire.close()
+            raise FichierInvalide("Ce fichier n'est pas un livre d'ouvertures, ou sa version n'est pas supportée")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_exception, exception, trace):
+        self.fermer()
+
+    def __len__(self):
+        return self.nombre
+
+    def _cle_a(self, index):
+        return ENREGISTREMENT.unpack_from(self._memoire, ENTETE.size + index * ENREGISTREMENT.size)[0]
+
+    def deplacements(self, cle):
+        """Retourne les déplacements conservés pour une position.
+
+        Args:
+            cle (int): La clé de Zobrist de la position.
+
+        Returns:
+            list: Les paires (déplacement, poids), où le déplacement est une paire (position source, position cible).
+                La liste est vide si la position n'est pas dans le livre.
+
+        """
+        # Recherche binaire du premier enregistrement dont la clé n'est pas inférieure à celle cherchée
+        debut, fin = 0, self.nombre
+        while debut < fin:
+            milieu = (debut + fin) // 2
+            if self._cle_a(milieu) < cle:
+                debut = milieu + 1
+            else:
+                fin = milieu
+
+        resultat = []
+        for index in range(debut, self.nombre):
+            cle_enregistrement, deplacement, poids = ENREGISTREMENT.unpack_from(
+                self._memoire, ENTETE.size + index * ENREGISTREMENT.size)
+            if cle_enregistrement != cle:
+                break
+            resultat.append(((CASES[deplacement >> 6], CASES[deplacement & 0x3F]), poids))
+
+        return resultat
+
+    def choisir(self, partie, generateur=random):
+        """Choisit un déplacement du livre pour le joueur actif d'une partie, au hasard selon le poids de chaque
+        déplacement.
+
+        Args:
+            partie (Partie): La partie en cours.
+            generateur (Random): Le générateur de nombres aléatoires. Par défaut, celui du module random.
+
+        Returns:
+            tuple or None: La position source et la position cible du déplacement choisi, ou None si la position n'est
+                pas dans le livre.
+
+        """
+        echiquier = partie.echiquier
+        # Une autre position peut avoir la même clé: les déplacements sont validés.
+        candidats = [(deplacement, poids) for deplacement, poids in self.deplacements(echiquier.cle_hash)
+                     if Ordonnanceur.est_valide(echiquier, partie.joueur_actif, deplacement)]
+        if not candidats:
+            return None
+
+        deplacements, poids = zip(*candidats)
+        return generateur.choices(deplacements, weights=poids)[0]
+
+    def fermer(self):
+        """Ferme le fichier du livre.
+
+        """
+        self._memoire.close()
+
+
+def compter_deplacements(parties, profondeur=PROFONDEUR_LIVRE):
+    """Rejoue le début de chaque partie et compte les déplacements joués dans chaque position. Une partie est
+    abandonnée à son premier déplacement invalide.
+
+    Args:
+        parties (iterable): Les parties, chacune sous forme d'une suite de paires (position source, position cible),
+            à partir de la position de départ.
+        profondeur (int): Le nombre de déplacements retenus au début de chaque partie.
+
+    Returns:
+        Counter: Le nombre de fois où chaque paire (clé de la position, déplacement) a été jouée, où le déplacement
+            est encodé comme dans le fichier.
+
+    """
+    compteur = Counter()
+    echiquier = Echiquier()
+
+    for deplacements in parties:
+        echiquier.initialiser_echiquier_depart()
+        echiquier.definir_trait('blanc')
+
+        for ply, (position_source, position_cible) in enumerate(deplacements):
+            if ply >= profondeur or not Ordonnanceur.est_valide(echiquier, echiquier.trait,
+                                                                 (position_source, position_cible)):
+                break
+
+            compteur[echiquier.cle_hash, 64 * INDEX_CASES[position_source] + INDEX_CASES[position_cible]] += 1
+            if isinstance(echiquier.effectuer_deplacement(position_source, position_cible), Roi):
+                break
+            echiquier.definir_trait(COULEUR_ADVERSE[echiquier.trait])
+
+    return compteur
+
+
+def construire_livre(parties, chemin, profondeur=PROFONDEUR_LIVRE, poids_minimum=1):
+    """Construit un livre d'ouvertures à partir d'un ensemble de parties.
+
+    Args:
+        parties (iterable): Les parties (voir compter_deplacements).
+        chemin (str): Le chemin du fichier à écrire.
+        profondeur (int): Le nombre de déplacements retenus au début de chaque partie.
+        poids_minimum (int): Le nombre de fois qu'un déplacement doit avoir été joué pour être retenu.
+
+    Returns:
+        int: Le nombre d'enregistrements écrits.
+
+    """
+    enregistrements = sorted((cle, deplacement, min(poids, POIDS_MAXIMUM))
+                             for (cle, deplacement), poids in compter_deplacements(parties, profondeur).items()
+                             if poids >= poids_minimum)
+
+    with open(chemin, 'wb') as fichier:
+        fichier.write(ENTETE.pack(SIGNATURE, VERSION, ENREGISTREMENT.size, len(enregistrements)))
+        for enregistrement in enregistrements:
+            fichier.write(ENREGISTREMENT.pack(*enregistrement))
+
+    return len(enregistrements)
+
+
+def lire_parties(chemin):
+    """Lit un fichier de parties, à raison d'une partie par ligne, ou une archive PGN (voir la documentation du
+    module).
+
+    Args:
+        chemin (str): Le chemin du fichier.
+
+    Yields:
+        list: Les déplacements de chaque partie, sous forme de paires (position source, position cible).
+
+    """
+    if chemin.endswith('.pgn'):
+        for partie in lire_fichier_pgn(chemin):
+            yield partie.deplacements
+        return
+
+    with open(chemin, 'r') as fichier:
+        for ligne in fichier:
+            yield [(deplacement[:2], deplacement[2:4]) for deplacement in ligne.split()]
+
+
+def principal(arguments=None):
+    """Point d'entrée de la ligne de commande: construit un livre d'ouvertures à partir d'un fichier de parties.
+
+    Args:
+        arguments (list): Les arguments de la ligne de commande, ou None pour utiliser ceux de sys.argv.
+
+    """
+    analyseur = ArgumentParser(prog='python -m echecs.livre',
+                               description="Construit un livre d'ouvertures à partir d'un fichier de parties.")
+    analyseur.add_argument('parties', help='le fichier de parties, une partie par ligne, ou une archive PGN')
+    analyseur.add_argument('livre', help='le fichier du livre à écrire')
+    analyseur.add_argument('--profondeur', type=int, default=PROFONDEUR_LIVRE,
+                           help='le nombre de déplacements retenus au début de chaque partie')
+    analyseur.add_argument('--poids-minimum', type=int, default=1,
+                           help="le nombre de fois qu'un déplacement doit avoir été joué pour être retenu")
+    options = analyseur.parse_args(arguments)
+
+    nombre = construire_livre(lire_parties(options.parties), options.livre, options.profondeur,
+                              options.poids_minimum)
+    print('Enregistrements: {}'.format(nombre))
+
+
+if __name__ == '__main__':
+    principal()
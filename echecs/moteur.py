@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+"""Module contenant le moteur de jeu, c'est-à-dire l'adversaire contrôlé par l'ordinateur.
+
+Le moteur cherche le meilleur déplacement avec l'algorithme negamax et l'élagage alpha-bêta, en approfondissant la
+recherche une profondeur à la fois (approfondissement itératif) jusqu'à ce que son budget de temps soit écoulé. Le
+résultat de la dernière profondeur complétée est alors retourné.
+
+Les positions sont évaluées par le score que l'échiquier tient à jour (voir le module evaluation). Une position
+n'est toutefois pas évaluée au milieu d'une suite de prises: à la profondeur 0, la recherche de quiétude poursuit les
+prises jusqu'à atteindre une position calme. Le joueur qui doit jouer peut toujours refuser de prendre (stand-pat):
+l'évaluation de la position sert alors de borne inférieure. Les prises qui ne peuvent pas remonter le score jusqu'à
+alpha (élagage delta) et celles qui perdent du matériel selon l'évaluation statique des échanges (voir le module
+echange) ne sont pas cherchées.
+
+Les positions des finales dont la table est disponible (voir le module finales) ne sont pas cherchées: leur résultat
+exact est lu dans la table.
+
+La partie se termine lorsqu'un roi est mangé: une position où le joueur qui doit jouer peut manger le roi adverse est
+donc gagnée, et un roi laissé en prise est perdu au déplacement suivant.
+
+"""
+from echecs.piece import Roi
+from echecs.ordonnancement import Ordonnanceur
+from echecs.echange import echange_statique, VALEURS_ECHANGE
+from echecs.transposition import TableTransposition, EXACTE, INFERIEURE, SUPERIEURE
+from echecs.zobrist import CLE_TRAIT
+from time import perf_counter
+
+COULEUR_ADVERSE = {'blanc': 'noir', 'noir': 'blanc'}
+
+# Le score d'une partie gagnée. Il est réduit du nombre de déplacements nécessaires pour gagner, afin que le moteur
+# préfère la victoire la plus rapide.
+SCORE_VICTOIRE = 100000
+
+# Les scores au-delà de cette valeur (en valeur absolue) annoncent une victoire. Ils sont conservés dans la table de
+# transposition relativement à la position, plutôt qu'à la racine, puisqu'une position peut être atteinte à
+# différentes distances de la racine.
+SCORE_VICTOIRE_MINIMUM = SCORE_VICTOIRE - 1000
+
+# La taille de la table de transposition utilisée lorsqu'aucune n'est fournie, en mégaoctets.
+TAILLE_TABLE_MO = 16
+
+# Le temps de jeu prévu pour chaque joueur, en secondes, et le nombre de déplacements qu'il reste présumément à jouer.
+# Les chronomètres de la partie comptent le temps utilisé: le budget d'un déplacement est une fraction du temps restant.
+TEMPS_PARTIE = 600
+DEPLACEMENTS_RESTANTS = 30
+BUDGET_MINIMUM = 0.05
+
+# La marge ajoutée à la valeur d'une pièce mangée pour l'élagage delta, en centièmes de pion: elle couvre le bonus de
+# position que la prise peut aussi rapporter.
+MARGE_DELTA = 200
+
+# Le nombre de positions visitées entre deux vérifications du temps écoulé.
+NOEUDS_ENTRE_VERIFICATIONS = 1024
+
+
+class ResultatRecherche:
+    """Le résultat d'une recherche du moteur.
+
+    Attributes:
+        deplacement (tuple or None): La position source et la position cible du meilleur déplacement trouvé, ou None
+            si le joueur n'a aucun déplacement.
+        score (int): Le score de la position, du point de vue du joueur qui doit jouer, en centièmes de pion.
+        profondeur (int): La dernière profondeur complétée.
+        noeuds (int): Le nombre de positions visitées.
+        duree (float): La durée de la recherche, en secondes.
+        taux_coupure_premier_deplacement (float): Parmi les positions où une coupure a eu lieu, la proportion où elle
+            a été provoquée par le premier déplacement cherché (voir le module ordonnancement).
+        reponse_prevue (tuple or None): La réponse de l'adversaire que la recherche prévoit au meilleur déplacement,
+            ou None si elle n'est pas connue.
+
+    """
+    __slots__ = ('deplacement', 'score', 'profondeur', 'noeuds', 'duree', 'taux_coupure_premier_deplacement',
+                 'reponse_prevue')
+
+    def __init__(self, deplacement, score, profondeur, noeuds, duree, taux_coupure_premier_deplacement=0,
+                 reponse_prevue=None):
+        self.deplacement = deplacement
+        self.score = score
+        self.profondeur = profondeur
+        self.noeuds = noeuds
+        self.duree = duree
+        self.taux_coupure_premier_deplacement = taux_coupure_premier_deplacement
+        self.reponse_prevue = reponse_prevue
+
+    @property
+    def noeuds_par_seconde(self):
+        return self.noeuds / self.duree if self.duree > 0 else 0
+
+    def __repr__(self):
+        return 'ResultatRecherche(deplacement={}, score={}, profondeur={}, noeuds={}, duree={:.3f})'.format(
+            self.deplacement, self.score, self.profondeur, self.noeuds, self.duree)
+
+
+_table_par_defaut = None
+
+
+def table_par_defaut():
+    """Retourne la table de transposition utilisée lorsqu'aucune n'est fournie à chercher. Elle est créée au premier
+    appel, puis conservée d'une recherche à l'autre; elle peut être vidée entre deux parties avec sa méthode vider.
+
+    Returns:
+        TableTransposition: La table de transposition.
+
+    """
+    global _table_par_defaut
+
+    if _table_par_defaut is None:
+        _table_par_defaut = TableTransposition(TAILLE_TABLE_MO)
+
+    return _table_par_defaut
+
+
+def score_vers_table(score, ply):
+    # Un score de victoire est conservé comme le nombre de déplacements restants à partir de la position.
+    if score >= SCORE_VICTOIRE_MINIMUM:
+        return score + ply
+    if score <= -SCORE_VICTOIRE_MINIMUM:
+        return score - ply
+    return score
+
+
+def score_depuis_table(score, ply):
+    if score >= SCORE_VICTOIRE_MINIMUM:
+        return score - ply
+    if score <= -SCORE_VICTOIRE_MINIMUM:
+        return score + ply
+    return score
+
+
+def score_selon_distance(distance, ply):
+    """Convertit le résultat d'une table de finales en score de la recherche.
+
+    Args:
+        distance (int): Le nombre de déplacements avant la prise d'un roi, positif si le joueur qui doit jouer gagne
+            et négatif s'il perd, ou 0 pour une nulle (voir SondeFinales.sonder).
+        ply (int): Le nombre de déplacements joués depuis la racine.
+
+    Returns:
+        int: Le score, comme s'il avait été trouvé par la recherche.
+
+    """
+    if distance > 0:
+        return SCORE_VICTOIRE - ply - distance
+    if distance < 0:
+        return -SCORE_VICTOIRE + ply - distance
+    return 0
+
+
+class TempsEcoule(Exception):
+    """Exception interne lancée lorsque le budget de temps est écoulé au milieu d'une recherche. Elle remonte la pile
+    d'appels, chaque niveau défaisant son déplacement au passage.
+
+    """
+    pass
+
+
+def budget_selon_chronometres(partie):
+    """Calcule le temps à accorder au prochain déplacement du joueur actif, à partir du temps qu'il a déjà utilisé.
+
+    Args:
+        partie (Partie): La partie en cours.
+
+    Returns:
+        float: Le budget de temps, en secondes.
+
+    """
+    temps_utilise = partie.temps_total_blanc if partie.joueur_actif == 'blanc' else partie.temps_total_noir
+
+    return max(BUDGET_MINIMUM, (TEMPS_PARTIE - temps_utilise) / DEPLACEMENTS_RESTANTS)
+
+
+class Recherche:
+    """Une recherche du meilleur déplacement sur un échiquier. L'échiquier est modifié pendant la recherche, puis remis
+    dans son état initial, même lorsque la recherche est interrompue.
+
+    Attributes:
+        echiquier (Echiquier): L'échiquier sur lequel chercher.
+        echeance (float): Le moment (selon perf_counter) où la recherche doit s'arrêter.
+        table (TableTransposition): La table de transposition consultée et remplie par la recherche.
+        arret (Event): Un événement qui arrête la recherche lorsqu'il est déclenché, ou None.
+        ordonnanceur (Ordonnanceur): L'ordre dans lequel chercher les déplacements (voir le module ordonnancement).
+        finales (SondeFinales): Les tables de finales à consulter, ou None.
+        noeuds (int): Le nombre de positions visitées jusqu'ici.
+        noeuds_quiescence (int): Parmi ces positions, le nombre visitées par la recherche de quiétude.
+
+    Args:
+        echiquier (Echiquier): L'échiquier sur lequel chercher.
+        budget (float): Le temps accordé à la recherche, en secondes.
+        table (TableTransposition): La table de transposition.
+        arret (Event): Un événement qui arrête la recherche lorsqu'il est déclenché, ou None.
+        finales (SondeFinales): Les tables de finales à consulter, ou None.
+
+    """
+
+    def __init__(self, echiquier, budget, table, arret=None, finales=None):
+        self.echiquier = echiquier
+        self.echeance = perf_counter() + budget
+        self.table = table
+        self.arret = arret
+        self.ordonnanceur = Ordonnanceur()
+        self.finales = finales
+        self.noeuds = 0
+        self.noeuds_quiescence = 0
+
+    def cle(self, couleur):
+        # Le trait de l'échiquier n'est pas modifié pendant la recherche: la clé est corrigée lorsque c'est à l'autre
+        # joueur de jouer.
+        echiquier = self.echiquier
+        return echiquier.cle_hash if couleur == echiquier.trait else echiquier.cle_hash ^ CLE_TRAIT
+
+    def verifier_temps(self):
+        if perf_counter() >= self.echeance or (self.arret is not None and self.arret.is_set()):
+            raise TempsEcoule()
+
+    def negamax(self, couleur, profondeur, alpha, beta, ply):
+        """Cherche le score d'une position du point de vue du joueur qui doit jouer.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+            profondeur (int): Le nombre de déplacements qu'il reste à chercher.
+            alpha (int): Le score que le joueur est déjà assuré d'obtenir.
+            beta (int): Le score au-delà duquel l'adversaire évitera cette position.
+            ply (int): Le nombre de déplacements joués depuis la racine.
+
+        Returns:
+            int: Le score de la position.
+
+        """
+        if self.finales is not None:
+            distance = self.finales.sonder(self.echiquier, couleur)
+            if distance is not None:
+                return score_selon_distance(distance, ply)
+
+        if profondeur == 0:
+            return self.quiescence(couleur, alpha, beta, ply)
+
+        self.noeuds += 1
+        if self.noeuds % NOEUDS_ENTRE_VERIFICATIONS == 0:
+            self.verifier_temps()
+
+        echiquier = self.echiquier
+
+        cle = self.cle(couleur)
+        entree = self.table.sonder(cle)
+        deplacement_table = None
+
+        if entree is not None:
+            profondeur_table, score, borne, deplacement_table = entree
+            if profondeur_table >= profondeur:
+                score = score_depuis_table(score, ply)
+                if (borne == EXACTE or (borne == INFERIEURE and score >= beta)
+                        or (borne == SUPERIEURE and score <= alpha)):
+                    return score
+
+        alpha_initial = alpha
+        adversaire = COULEUR_ADVERSE[couleur]
+        meilleur_score = -SCORE_VICTOIRE
+        meilleur_deplacement = None
+
+        for rang, (position_source, position_cible) in enumerate(
+                self.ordonnanceur.ordonner(echiquier, couleur, ply, deplacement_table)):
+            piece_prise = echiquier.effectuer_deplacement(position_source, position_cible)
+            try:
+                if isinstance(piece_prise, Roi):
+                    score = SCORE_VICTOIRE - ply - 1
+                else:
+                    score = -self.negamax(adversaire, profondeur - 1, -beta, -alpha, ply + 1)
+            finally:
+                echiquier.annuler_deplacement(position_source, position_cible, piece_prise)
+
+            if score > meilleur_score:
+                meilleur_score = score
+                meilleur_deplacement = position_source, position_cible
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        self.ordonnanceur.enregistrer_coupure(meilleur_deplacement, piece_prise, ply, profondeur,
+                                                              rang)
+                        break
+
+        if meilleur_score <= alpha_initial:
+            borne = SUPERIEURE
+        elif meilleur_score >= beta:
+            borne = INFERIEURE
+        else:
+            borne = EXACTE
+        self.table.enregistrer(cle, profondeur, score_vers_table(meilleur_score, ply), borne, meilleur_deplacement)
+
+        return meilleur_score
+
+    def quiescence(self, couleur, alpha, beta, ply):
+        """Cherche le score d'une position en ne considérant que les prises, jusqu'à atteindre une position calme.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+            alpha (int): Le score que le joueur est déjà assuré d'obtenir.
+            beta (int): Le score au-delà duquel l'adversaire évitera cette position.
+            ply (int): Le nombre de déplacements joués depuis la racine.
+
+        Returns:
+            int: Le score de la position.
+
+        """
+        self.noeuds += 1
+        self.noeuds_quiescence += 1
+        if self.noeuds % NOEUDS_ENTRE_VERIFICATIONS == 0:
+            self.verifier_temps()
+
+        echiquier = self.echiquier
+        evaluation = echiquier.evaluation(couleur)
+        if evaluation >= beta:
+            return evaluation
+        if evaluation > alpha:
+            alpha = evaluation
+
+        adversaire = COULEUR_ADVERSE[couleur]
+        meilleur_score = evaluation
+        prises = [(Ordonnanceur.valeur_prise(echiquier, deplacement), deplacement)
+                  for deplacement in echiquier.generer_prises(couleur)]
+        prises.sort(reverse=True)
+
+        for _, (position_source, position_cible) in prises:
+            victime = echiquier.recuperer_piece_a_position(position_cible)
+            if isinstance(victime, Roi):
+                return SCORE_VICTOIRE - ply - 1
+
+            # Élagage delta: même en gagnant la pièce sans la perdre, le score resterait sous alpha.
+            if evaluation + VALEURS_ECHANGE[type(victime)] + MARGE_DELTA <= alpha:
+                continue
+            if echange_statique(echiquier, position_source, position_cible) < 0:
+                continue
+
+            piece_prise = echiquier.effectuer_deplacement(position_source, position_cible)
+            try:
+                score = -self.quiescence(adversaire, -beta, -alpha, ply + 1)
+            finally:
+                echiquier.annuler_deplacement(position_source, position_cible, piece_prise)
+
+            if score > meilleur_score:
+                meilleur_score = score
+                if score > alpha:
+                    alpha = score
+                    if alpha >= beta:
+                        break
+
+        return meilleur_score
+
+    def chercher_racine(self, couleur, profondeur, deplacements):
+        """Cherche le meilleur des déplacements de la racine à une profondeur donnée.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+            profondeur (int): La profondeur de la recherche, au moins 1.
+            deplacements (list): Les déplacements de la racine, dans l'ordre où les chercher.
+
+        Returns:
+            tuple: Le meilleur déplacement et son score.
+
+        """
+        echiquier = self.echiquier
+        adversaire = COULEUR_ADVERSE[couleur]
+        alpha = -SCORE_VICTOIRE - 1
+        meilleur_deplacement = None
+
+        for position_source, position_cible in deplacements:
+            piece_prise = echiquier.effectuer_deplacement(position_source, position_cible)
+            try:
+                if isinstance(piece_prise, Roi):
+                    score = SCORE_VICTOIRE - 1
+                else:
+                    score = -self.negamax(adversaire, profondeur - 1, -SCORE_VICTOIRE - 1, -alpha, 1)
+            finally:
+                echiquier.annuler_deplacement(position_source, position_cible, piece_prise)
+
+            if score > alpha:
+                alpha = score
+                meilleur_deplacement = position_source, position_cible
+
+        return meilleur_deplacement, alpha
+
+    def reponse_prevue(self, couleur, deplacement):
+        """Retrouve dans la table de transposition la meilleure réponse de l'adversaire à un déplacement.
+
+        Args:
+            couleur (str): La couleur (blanc ou noir) du joueur qui joue le déplacement.
+            deplacement (tuple): La position source et la position cible du déplacement.
+
+        Returns:
+            tuple or None: La réponse prévue, ou None si elle n'est pas dans la table ou n'est pas valide.
+
+        """
+        echiquier = self.echiquier
+        adversaire = COULEUR_ADVERSE[couleur]
+        piece_prise = echiquier.effectuer_deplacement(*deplacement)
+
+        try:
+            entree = self.table.sonder(self.cle(adversaire))
+            if entree is None or entree[3] is None or isinstance(piece_prise, Roi):
+                return None
+            if not Ordonnanceur.est_valide(echiquier, adversaire, entree[3]):
+                return None
+            return entree[3]
+        finally:
+            echiquier.annuler_deplacement(deplacement[0], deplacement[1], piece_prise)
+
+
+def chercher(partie, budget=None, profondeur_maximale=64, table=None, profondeur_initiale=1, arret=None,
+             finales=None):
+    """Cherche le meilleur déplacement du joueur actif d'une partie, par approfondissement itératif. La recherche
+    s'arrête lorsque le budget de temps est écoulé, lorsque la profondeur maximale est atteinte, ou lorsqu'une victoire
+    est trouvée. La partie est laissée dans son état initial.
+
+    Args:
+        partie (Partie): La partie en cours.
+        budget (float): Le temps accordé à la recherche, en secondes. Par défaut, il est calculé à partir des
+            chronomètres de la partie (voir budget_selon_chronometres).
+        profondeur_maximale (int): La profondeur au-delà de laquelle la recherche n'est pas poursuivie.
+        table (TableTransposition): La table de transposition à utiliser. Par défaut, la table partagée par les
+            recherches est utilisée (voir table_par_defaut).
+        profondeur_initiale (int): La première profondeur cherchée.
+        arret (Event): Un événement (de threading ou de multiprocessing) qui interrompt la recherche lorsqu'il est
+            déclenché, comme si le budget était écoulé.
+        finales (SondeFinales): Les tables de finales à consulter pendant la recherche, ou None.
+
+    Returns:
+        ResultatRecherche: Le meilleur déplacement trouvé et les statistiques de la recherche.
+
+    """
+    if budget is None:
+        budget = budget_selon_chronometres(partie)
+    if table is None:
+        table = table_par_defaut()
+    table.nouvelle_recherche()
+
+    debut = perf_counter()
+    couleur = partie.joueur_actif
+    recherche = Recherche(partie.echiquier, budget, table, arret, finales)
+    deplacements = list(partie.echiquier.generer_deplacements(couleur))
+    resultat = ResultatRecherche(deplacements[0] if deplacements else None, 0, 0, 0, 0)
+
+    if deplacements:
+        for profondeur in range(profondeur_initiale, profondeur_maximale + 1):
+            try:
+                deplacement, score = recherche.chercher_racine(couleur, profondeur, deplacements)
+            except TempsEcoule:
+                break
+
+            resultat.deplacement, resultat.score, resultat.profondeur = deplacement, score, profondeur
+
+            # Le meilleur déplacement est cherché en premier à la profondeur suivante.
+            deplacements.remove(deplacement)
+            deplacements.insert(0, deplacement)
+
+            if abs(score) >= SCORE_VICTOIRE - profondeur:
+                break
+            try:
+                recherche.verifier_temps()
+            except TempsEcoule:
+                break
+
+    if resultat.deplacement is not None:
+        resultat.reponse_prevue = recherche.reponse_prevue(couleur, resultat.deplacement)
+    resultat.noeuds = recherche.noeuds
+    resultat.taux_coupure_premier_deplacement = recherche.ordonnanceur.taux_coupure_premier_deplacement
+    resultat.duree = perf_counter() - debut
+
+    return resultat
+
+
+def jouer(partie, budget=None, table=None, livre=None, finales=None):
+    """Cherche puis joue le meilleur déplacement du joueur actif d'une partie. Si la position est dans le livre
+    d'ouvertures, un déplacement du livre est joué sans chercher.
+
+    Args:
+        partie (Partie): La partie en cours.
+        budget (float): Le temps accordé à la recherche, en secondes (voir chercher).
+        table (TableTransposition): La table de transposition à utiliser (voir chercher).
+        livre (LivreOuvertures): Le livre d'ouvertures à consulter, ou None.
+        finales (SondeFinales): Les tables de finales à consulter pendant la recherche, ou None.
+
+    Returns:
+        ResultatRecherche: Le résultat de la recherche, dont le déplacement a été joué s'il y en a un. Pour un
+            déplacement du livre, la profondeur et le nombre de positions visitées sont nuls.
+
+    """
+    deplacement = livre.choisir(partie) if livre is not None else None
+    if deplacement is not None:
+        resultat = ResultatRecherche(deplacement, 0, 0, 0, 0)
+    else:
+        resultat = chercher(partie, budget, table=table, finales=finales)
+
+    if resultat.deplacement is not None:
+        partie.deplacer_piece(*resultat.deplacement)
+
+    return resultat
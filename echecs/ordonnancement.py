@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Module contenant l'ordonnancement des déplacements pour le moteur. L'élagage alpha-bêta coupe d'autant plus de
+branches que les meilleurs déplacements sont cherchés en premier. Les déplacements d'une position sont donc proposés
+dans cet ordre:
+    1. le meilleur déplacement conservé dans la table de transposition;
+    2. les prises, de la plus grosse victime à la plus grosse (MVV-LVA: most valuable victim, least valuable attacker)
+       et, à victime égale, par l'attaquant le moins précieux;
+    3. les déplacements « tueurs »: les deux derniers déplacements tranquilles qui ont provoqué une coupure à la même
+       distance de la racine;
+    4. les autres déplacements tranquilles, selon l'historique des coupures qu'ils ont provoquées (de la case source
+       vers la case cible), peu importe la position.
+
+L'ordonnancement est paresseux: les déplacements tranquilles ne sont générés que si aucune prise n'a provoqué de
+coupure, et ils ne sont triés qu'au fur et à mesure qu'ils sont demandés.
+
+"""
+from echecs.piece import Pion, Tour, Cavalier, Fou, Dame, Roi
+from echecs.cases import INDEX_CASES
+from heapq import heapify, heappop
+
+# La valeur de chaque type de pièce pour ordonner les prises. Manger le roi termine la partie: c'est toujours la
+# meilleure prise.
+VALEURS_PRISES = {Pion: 1, Cavalier: 3, Fou: 3, Tour: 5, Dame: 9, Roi: 100}
+
+# Le nombre de déplacements tueurs conservés pour chaque distance de la racine.
+NOMBRE_TUEURS = 2
+
+
+class Ordonnanceur:
+    """Les informations accumulées pendant une recherche pour ordonner les déplacements, et les statistiques sur la
+    qualité de l'ordonnancement.
+
+    Attributes:
+        tueurs (list): Pour chaque distance de la racine, les derniers déplacements tranquilles ayant provoqué une
+            coupure, du plus récent au plus ancien.
+        historique (list): Pour chaque paire de cases (64 * source + cible), la somme des bonus des coupures
+            provoquées par un déplacement tranquille entre ces cases.
+        coupures (int): Le nombre de positions où une coupure a eu lieu.
+        coupures_premier_deplacement (int): Parmi ces positions, le nombre où la coupure a été provoquée par le premier
+            déplacement cherché.
+
+    """
+
+    def __init__(self):
+        self.tueurs = []
+        self.historique = [0] * 4096
+        self.coupures = 0
+        self.coupures_premier_deplacement = 0
+
+    @property
+    def taux_coupure_premier_deplacement(self):
+        return self.coupures_premier_deplacement / self.coupures if self.coupures else 0
+
+    def tueurs_a_distance(self, ply):
+        while len(self.tueurs) <= ply:
+            self.tueurs.append([])
+
+        return self.tueurs[ply]
+
+    def ordonner(self, echiquier, couleur, ply, deplacement_table=None):
+        """Génère les déplacements d'une position dans l'ordre décrit dans la documentation du module. L'échiquier
+        doit être remis dans son état initial avant de demander le déplacement suivant.
+
+        Args:
+            echiquier (Echiquier): L'échiquier.
+            couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+            ply (int): Le nombre de déplacements joués depuis la racine.
+            deplacement_table (tuple): Le meilleur déplacement conservé dans la table de transposition, ou None.
+
+        Yields:
+            tuple: La position source et la position cible de chaque déplacement.
+
+        """
+        deja_proposes = set()
+
+        # La table de transposition peut contenir une autre position de même clé: le déplacement est validé.
+        if deplacement_table is not None and self.est_valide(echiquier, couleur, deplacement_table):
+            deja_proposes.add(deplacement_table)
+            yield deplacement_table
+
+        prises = [(self.valeur_prise(echiquier, deplacement), deplacement)
+                  for deplacement in echiquier.generer_prises(couleur) if deplacement not in deja_proposes]
+        prises.sort(reverse=True)
+        for _, deplacement in prises:
+            yield deplacement
+
+        for deplacement in list(self.tueurs_a_distance(ply)):
+            if deplacement not in deja_proposes and self.est_valide(echiquier, couleur, deplacement) \
+                    and echiquier.recuperer_piece_a_position(deplacement[1]) is None:
+                deja_proposes.add(deplacement)
+                yield deplacement
+
+        # Le tas est trié au fur et à mesure: une coupure évite de trier les déplacements restants.
+        historique = self.historique
+        tranquilles = [(-historique[64 * INDEX_CASES[position_source] + INDEX_CASES[position_cible]],
+                        position_source, position_cible)
+                       for position_source, position_cible in echiquier.generer_deplacements_tranquilles(couleur)
+                       if (position_source, position_cible) not in deja_proposes]
+        heapify(tranquilles)
+        while tranquilles:
+            _, position_source, position_cible = heappop(tranquilles)
+            yield position_source, position_cible
+
+    @staticmethod
+    def est_valide(echiquier, couleur, deplacement):
+        position_source, position_cible = deplacement
+        return (echiquier.couleur_piece_a_position(position_source) == couleur
+                and echiquier.deplacement_est_valide(position_source, position_cible))
+
+    @staticmethod
+    def valeur_prise(echiquier, deplacement):
+        victime = echiquier.recuperer_piece_a_position(deplacement[1])
+        attaquant = echiquier.recuperer_piece_a_position(deplacement[0])
+        return 16 * VALEURS_PRISES[type(victime)] - VALEURS_PRISES[type(attaquant)]
+
+    def enregistrer_coupure(self, deplacement, piece_prise, ply, profondeur, rang):
+        """Met à jour les tueurs, l'historique et les statistiques après une coupure.
+
+        Args:
+            deplacement (tuple): La position source et la position cible du déplacement qui a provoqué la coupure.
+            piece_prise (Piece or None): La pièce mangée par ce déplacement, ou None.
+            ply (int): Le nombre de déplacements joués depuis la racine.
+            profondeur (int): La profondeur qu'il restait à chercher.
+            rang (int): Le rang du déplacement parmi ceux cherchés dans la position (0 pour le premier).
+
+        """
+        self.coupures += 1
+        if rang == 0:
+            self.coupures_premier_deplacement += 1
+
+        # Les prises sont déjà bien ordonnées: seuls les déplacements tranquilles sont retenus.
+        if piece_prise is not None:
+            return
+
+        tueurs = self.tueurs_a_distance(ply)
+        if deplacement not in tueurs:
+            tueurs.insert(0, deplacement)
+            del tueurs[NOMBRE_TUEURS:]
+
+        position_source, position_cible = deplacement
+        self.historique[64 * INDEX_CASES[position_source] + INDEX_CASES[position_cible]] += profondeur * profondeur
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""Module contenant la recherche parallèle du moteur (Lazy SMP). Un seul processus Python n'utilise qu'un cœur: la
+recherche est donc lancée dans plusieurs processus, sur la même position, qui partagent une même table de
+transposition placée en mémoire partagée. Chaque processus profite des positions déjà cherchées par les autres.
+
+Pour que les processus ne cherchent pas tous exactement les mêmes positions, ils ne commencent pas l'approfondissement
+itératif à la même profondeur: le processus i commence à la profondeur 1 + i % DECALAGES_PROFONDEUR. Le résultat
+retenu est celui de la recherche la plus profonde qui a été complétée.
+
+Les écritures dans la table partagée ne sont pas verrouillées: une entrée écrite en même temps par deux processus est
+détectée et ignorée à la lecture (voir le module transposition).
+
+"""
+from echecs.moteur import chercher, budget_selon_chronometres, ResultatRecherche
+from echecs.partie import Partie, REPRESENTATIONS
+from echecs.piece import PIECES
+from echecs.transposition import TableTransposition
+from echecs.exceptions import RechercheEnCours
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty
+from time import perf_counter
+import os
+
+# Le nombre de profondeurs initiales différentes entre lesquelles les processus sont répartis.
+DECALAGES_PROFONDEUR = 2
+
+# La taille de la table de transposition partagée, en mégaoctets.
+TAILLE_TABLE_PARTAGEE_MO = 64
+
+
+def _travailleur(nom_memoire, taille_mo, generation, representation, pieces, couleur, budget, profondeur_initiale,
+                 profondeur_maximale, arret, resultats, numero):
+    """Exécute une recherche dans un processus séparé et transmet son résultat. L'échiquier y est reconstruit à partir
+    de l'index de chaque pièce.
+
+    Args:
+        nom_memoire (str): Le nom de la mémoire partagée contenant la table de transposition.
+        taille_mo (float): La taille de la table de transposition, en mégaoctets.
+        generation (int): La génération de la table de transposition avant la recherche.
+        representation (str): La représentation de l'échiquier (voir REPRESENTATIONS).
+        pieces (tuple): Les paires (position, index de la pièce) de la position.
+        couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+        budget (float): Le temps accordé à la recherche, en secondes.
+        profondeur_initiale (int): La première profondeur cherchée.
+        profondeur_maximale (int): La profondeur au-delà de laquelle la recherche n'est pas poursuivie.
+        arret (Event): L'événement qui interrompt la recherche.
+        resultats (Queue): La file où transmettre le résultat.
+        numero (int): Le numéro du processus, transmis avec le résultat.
+
+    """
+    memoire = SharedMemory(nom_memoire)
+    table = TableTransposition(taille_mo, memoire.buf)
+    table.generation = generation
+
+    try:
+        partie = Partie(representation, pieces={position: PIECES[index] for position, index in pieces})
+        partie.joueur_actif = couleur
+
+        resultat = chercher(partie, budget, profondeur_maximale, table, profondeur_initiale, arret)
+        resultats.put((numero, resultat.deplacement, resultat.score, resultat.profondeur, resultat.noeuds,
+                       resultat.taux_coupure_premier_deplacement))
+    finally:
+        table.liberer()
+        memoire.close()
+
+
+class RechercheParallele:
+    """Une recherche parallèle, qui gère la table de transposition partagée et les processus de recherche. La table
+    est conservée d'une recherche à l'autre: il faut appeler la méthode fermer (ou utiliser l'instance dans un bloc
+    with) pour la libérer.
+
+    Attributes:
+        processus (int): Le nombre de processus de recherche.
+        taille_mo (float): La taille de la table de transposition partagée, en mégaoctets.
+        memoire (SharedMemory): La mémoire partagée contenant la table de transposition.
+        table (TableTransposition): La table de transposition, vue depuis le processus courant.
+
+    Args:
+        processus (int): Le nombre de processus de recherche. Par défaut, un par cœur.
+        taille_mo (float): La taille de la table de transposition partagée, en mégaoctets.
+
+    """
+
+    def __init__(self, processus=None, taille_mo=TAILLE_TABLE_PARTAGEE_MO):
+        self.processus = processus or os.cpu_count() or 1
+        self.taille_mo = taille_mo
+        self.memoire = SharedMemory(create=True, size=int(taille_mo * 1024 * 1024))
+        self.table = TableTransposition(taille_mo, self.memoire.buf)
+        self.table.vider()
+
+        self._contexte = get_context()
+        self._arret = self._contexte.Event()
+        self._resultats = self._contexte.Queue()
+        self._travailleurs = []
+        self._debut = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type_exception, exception, trace):
+        self.fermer()
+
+    def demarrer(self, partie, budget=None, profondeur_maximale=64):
+        """Démarre la recherche du meilleur déplacement du joueur actif d'une partie, sans attendre son résultat (voir
+        attendre). La partie n'est pas modifiée.
+
+        Args:
+            partie (Partie): La partie en cours.
+            budget (float): Le temps accordé à la recherche, en secondes. Par défaut, il est calculé à partir des
+                chronomètres de la partie.
+            profondeur_maximale (int): La profondeur au-delà de laquelle la recherche n'est pas poursuivie.
+
+        """
+        # Les résultats d'une recherche précédente doivent d'abord être reçus (voir attendre).
+        if self._travailleurs:
+            raise RechercheEnCours("Une recherche est déjà en cours")
+
+        if budget is None:
+            budget = budget_selon_chronometres(partie)
+
+        representation = next(nom for nom, classe in REPRESENTATIONS.items() if type(partie.echiquier) is classe)
+        pieces = tuple((position, piece.index) for position, piece in partie.echiquier.dictionnaire_pieces.items())
+
+        self._arret.clear()
+        self._debut = perf_counter()
+        self._travailleurs = [
+            self._contexte.Process(target=_travailleur, daemon=True,
+                                   args=(self.memoire.name, self.taille_mo, self.table.generation, representation,
+                                         pieces, partie.joueur_actif, budget, 1 + numero % DECALAGES_PROFONDEUR,
+                                         profondeur_maximale, self._arret, self._resultats, numero))
+            for numero in range(self.processus)
+        ]
+        for travailleur in self._travailleurs:
+            travailleur.start()
+
+        # Chaque processus passe à la génération suivante de la table en commençant sa recherche.
+        self.table.nouvelle_recherche()
+
+    def en_cours(self):
+        """Vérifie si des processus de la recherche sont encore en cours.
+
+        Returns:
+            bool: True si au moins un processus est en cours, et False autrement.
+
+        """
+        return any(travailleur.is_alive() for travailleur in self._travailleurs)
+
+    def annuler(self):
+        """Demande aux processus d'arrêter leur recherche. Chacun transmet tout de même le résultat de la dernière
+        profondeur qu'il a complétée.
+
+        """
+        self._arret.set()
+
+    def attendre(self):
+        """Attend la fin de tous les processus de la recherche, puis combine leurs résultats.
+
+        Returns:
+            ResultatRecherche: Le résultat de la recherche la plus profonde (à profondeur égale, celle du processus de
+                plus petit numéro), avec le total des positions visitées par tous les processus.
+
+        """
+        recus = []
+        while len(recus) < len(self._travailleurs):
+            try:
+                recus.append(self._resultats.get(timeout=0.1))
+            except Empty:
+                # Un processus terminé anormalement ne transmettra jamais de résultat.
+                if not self.en_cours() and self._resultats.empty():
+                    break
+
+        for travailleur in self._travailleurs:
+            travailleur.join()
+        self._travailleurs = []
+
+        duree = perf_counter() - self._debut
+        if not recus:
+            return ResultatRecherche(None, 0, 0, 0, duree)
+
+        numero, deplacement, score, profondeur, _, taux = max(recus, key=lambda recu: (recu[3], -recu[0]))
+        return ResultatRecherche(deplacement, score, profondeur, sum(recu[4] for recu in recus), duree, taux)
+
+    def chercher(self, partie, budget=None, profondeur_maximale=64):
+        """Démarre une recherche, puis attend son résultat (voir demarrer et attendre).
+
+        Returns:
+            ResultatRecherche: Le résultat de la recherche.
+
+        """
+        self.demarrer(partie, budget, profondeur_maximale)
+        return self.attendre()
+
+    def fermer(self):
+        """Arrête la recherche en cours, s'il y en a une, puis libère la table de transposition partagée.
+
+        """
+        if self._travailleurs:
+            self.annuler()
+            self.attendre()
+
+        self.table.liberer()
+        self.memoire.close()
+        self.memoire.unlink()
+
+
+def chercher_parallele(partie, budget=None, processus=None, profondeur_maximale=64):
+    """Cherche le meilleur déplacement du joueur actif d'une partie avec plusieurs processus, avec une table de
+    transposition partagée créée pour cette seule recherche.
+
+    Args:
+        partie (Partie): La partie en cours.
+        budget (float): Le temps accordé à la recherche, en secondes (voir moteur.chercher).
+        processus (int): Le nombre de processus de recherche. Par défaut, un par cœur.
+        profondeur_maximale (int): La profondeur au-delà de laquelle la recherche n'est pas poursuivie.
+
+    Returns:
+        ResultatRecherche: Le résultat de la recherche.
+
+    """
+    with RechercheParallele(processus) as recherche:
+        return recherche.chercher(partie, budget, profondeur_maximale)
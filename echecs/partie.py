@@ -4,9 +4,42 @@ dont un objet échiquier (une instance de la classe Echiquier).
 
 """
 from echecs.echiquier import Echiquier
-from echecs.exceptions import AucunePiece, MauvaiseCouleur
+from echecs.bitboard import EchiquierBitboard
+from echecs.exceptions import AucunePiece, MauvaiseCouleur, FichierInvalide
+from echecs.fen import lire_fen, lire_numero_deplacement
+from echecs import sauvegarde
 import time
 
+# Les attributs de la partie qui forment l'état des chronomètres, conservés avec chaque déplacement pour l'annuler.
+ATTRIBUTS_CHRONOMETRES = ('temps_total_blanc', 'temps_total_noir', 'chrono_blanc_debut', 'chrono_noir_debut',
+                          'chrono_blanc_fin', 'chrono_noir_fin', 'temps_str_blanc', 'temps_str_noir')
+
+# Les représentations d'échiquier disponibles, selon le nom reçu par le constructeur de Partie.
+REPRESENTATIONS = {'dictionnaire': Echiquier, 'bitboard': EchiquierBitboard}
+
+
+class EnregistrementDeplacement:
+    """Un déplacement effectué dans une partie, avec tout ce qu'il faut pour l'annuler.
+
+    Attributes:
+        position_source (str): La position source du déplacement.
+        position_cible (str): La position cible du déplacement.
+        piece (Piece): La pièce déplacée.
+        piece_prise (Piece or None): La pièce mangée par le déplacement, ou None.
+        chronometres (tuple): L'état des chronomètres avant le déplacement, dans l'ordre de ATTRIBUTS_CHRONOMETRES.
+        cle_hash (int): La clé de hachage de la position avant le déplacement.
+
+    """
+    __slots__ = ('position_source', 'position_cible', 'piece', 'piece_prise', 'chronometres', 'cle_hash')
+
+    def __init__(self, position_source, position_cible, piece, piece_prise, chronometres, cle_hash):
+        self.position_source = position_source
+        self.position_cible = position_cible
+        self.piece = piece
+        self.piece_prise = piece_prise
+        self.chronometres = chronometres
+        self.cle_hash = cle_hash
+
 
 class Partie:
     """La classe Partie contient les informations sur une partie d'échecs, c'est à dire un échiquier, puis
@@ -16,14 +49,24 @@ class Partie:
     La classe partie gère également les chronomètres des joueurs. Sachant que chaque joueur bénificie de son premier tour
     sans compteur de temps, les chronos de chaque joueurs commencent à leur deuxième tour.
 
+    Args:
+        representation (str): La représentation de l'échiquier à utiliser, soit 'dictionnaire' ou 'bitboard'.
+        journal (Journal): Le journal où inscrire les déplacements et leurs annulations, ou None.
+        pieces (dict): Les pièces de l'échiquier, par position. Par défaut, celles de la position de départ.
+
     """
 
-    def __init__(self):
+    def __init__(self, representation='dictionnaire', journal=None, pieces=None):
+        # Création d'une instance de la classe Echiquier, qui sera manipulée dans les méthodes de la classe.
+        self.echiquier = REPRESENTATIONS[representation](pieces)
+
         # Le joueur débutant une partie d'échecs est le joueur blanc.
         self.joueur_actif = 'blanc'
 
-        # Création d'une instance de la classe Echiquier, qui sera manipulée dans les méthodes de la classe.
-        self.echiquier = Echiquier()
+        # Le joueur actif et le numéro du déplacement complet au début de la partie, qui peut commencer à une autre
+        # position que celle de départ (voir depuis_fen).
+        self.trait_depart = 'blanc'
+        self.numero_depart = 1
 
         # Création des variables nécessaires pour la gestion du chronomètre
         self.temps_total_blanc = 0
@@ -38,6 +81,161 @@ class Partie:
         self.temps_str_blanc = '-'
         self.temps_str_noir = '-'
 
+        # Les déplacements effectués, du premier au dernier, qui peuvent être annulés un à un.
+        self.historique = []
+
+        # Le journal des déplacements (voir le module journal), s'il y en a un.
+        self.journal = journal
+
+    @classmethod
+    def depuis_fen(cls, fen, representation='dictionnaire', journal=None):
+        """Crée une partie à partir d'une position en notation FEN (voir le module fen). Le joueur actif est celui
+        qui doit jouer selon la position, et la numérotation des déplacements reprend à celle de la position.
+
+        Args:
+            fen (str): La position.
+            representation (str): La représentation de l'échiquier à utiliser, soit 'dictionnaire' ou 'bitboard'.
+            journal (Journal): Le journal où inscrire les déplacements et leurs annulations, ou None.
+
+        Returns:
+            Partie: La partie.
+
+        Raises:
+            FenInvalide: Si la chaîne n'est pas une position FEN valide.
+
+        """
+        pieces, trait = lire_fen(fen)
+        partie = cls(representation, journal, pieces)
+        partie.joueur_actif = partie.trait_depart = trait
+        partie.numero_depart = lire_numero_deplacement(fen)
+
+        return partie
+
+    def vers_fen(self):
+        """Retourne la position de la partie en notation FEN, avec le joueur actif comme joueur qui doit jouer.
+
+        Returns:
+            str: La position.
+
+        """
+        # Le numéro augmente après chaque déplacement du joueur noir: une partie qui commence au trait du noir compte
+        # un demi-déplacement de plus.
+        demi_deplacements = len(self.historique) + (self.trait_depart == 'noir')
+
+        return self.echiquier.vers_fen(self.numero_depart + demi_deplacements // 2)
+
+    def etat_sauvegarde(self):
+        """Retourne le contenu d'une sauvegarde de la partie (voir le module sauvegarde).
+
+        Returns:
+            EtatSauvegarde: L'échiquier, le joueur actif, les temps totaux et les déplacements de la partie.
+
+        """
+        return sauvegarde.EtatSauvegarde(dict(self.echiquier.dictionnaire_pieces), self.joueur_actif,
+                                         self.temps_total_blanc, self.temps_total_noir,
+                                         [(enregistrement.position_source, enregistrement.position_cible,
+                                           enregistrement.piece_prise) for enregistrement in self.historique])
+
+    def restaurer(self, etat):
+        """Remplace l'état de la partie par celui d'une sauvegarde. L'historique est reconstruit à partir des
+        déplacements de la sauvegarde, pour qu'ils puissent être annulés; les chronomètres gardent alors les temps
+        totaux de la sauvegarde. Le journal, s'il y en a un, est réécrit avec les déplacements de la sauvegarde.
+
+        Args:
+            etat (EtatSauvegarde): Le contenu de la sauvegarde.
+
+        Raises:
+            FichierInvalide: Si les déplacements de la sauvegarde ne mènent pas à son échiquier.
+
+        """
+        # Les déplacements sont défaits sur une copie de l'échiquier, du dernier au premier, pour retrouver la pièce
+        # déplacée et la clé de hachage de la position d'avant chacun d'eux.
+        copie = type(self.echiquier)(dict(etat.pieces))
+        deplacements = []
+        for position_source, position_cible, piece_prise in reversed(etat.deplacements):
+            piece = copie.recuperer_piece_a_position(position_cible)
+            if piece is None or copie.recuperer_piece_a_position(position_source) is not None:
+                raise FichierInvalide("Les déplacements de cette sauvegarde ne mènent pas à son échiquier")
+            copie.annuler_deplacement(position_source, position_cible, piece_prise)
+            copie.definir_trait(piece.couleur)
+            deplacements.append((position_source, position_cible, piece, piece_prise, copie.cle_hash))
+
+        self.echiquier.dictionnaire_pieces = etat.pieces
+        self.joueur_actif = etat.trait
+        # Une sauvegarde ne conserve pas le numéro du premier déplacement: la partie est numérotée à partir de 1.
+        self.trait_depart = deplacements[-1][2].couleur if deplacements else etat.trait
+        self.numero_depart = 1
+
+        self.temps_total_blanc = etat.temps_blanc
+        self.temps_total_noir = etat.temps_noir
+        self.chrono_blanc_debut = self.chrono_noir_debut = 0
+        self.chrono_blanc_fin = self.chrono_noir_fin = 0
+        self.temps_str_blanc = self.temps_total_a_string(etat.temps_blanc)
+        self.temps_str_noir = self.temps_total_a_string(etat.temps_noir)
+
+        chronometres = tuple(getattr(self, attribut) for attribut in ATTRIBUTS_CHRONOMETRES)
+        self.historique = [EnregistrementDeplacement(position_source, position_cible, piece, piece_prise,
+                                                     chronometres, cle_hash)
+                           for position_source, position_cible, piece, piece_prise, cle_hash
+                           in reversed(deplacements)]
+
+        # Le journal décrit la partie chargée, et non plus la précédente.
+        if self.journal is not None:
+            self.journal.effacer()
+            for enregistrement in self.historique:
+                self.journal.ajouter_deplacement(enregistrement.piece, enregistrement.piece_prise,
+                                                 enregistrement.position_source, enregistrement.position_cible)
+
+    def sauvegarder(self, chemin):
+        """Sauvegarde la partie dans un fichier, dans le format binaire du module sauvegarde.
+
+        Args:
+            chemin (str): Le chemin du fichier.
+
+        """
+        with open(chemin, 'wb') as fichier:
+            fichier.write(sauvegarde.ecrire(self.etat_sauvegarde()))
+
+    def charger(self, chemin):
+        """Charge une partie sauvegardée dans un fichier, dans le format binaire ou dans l'ancien format JSON.
+
+        Args:
+            chemin (str): Le chemin du fichier.
+
+        Raises:
+            FichierInvalide: Si le fichier n'est pas une sauvegarde de partie.
+
+        """
+        with open(chemin, 'rb') as fichier:
+            self.restaurer(sauvegarde.lire(fichier.read()))
+
+    def recommencer(self):
+        """Recommence la partie à la position de départ: l'échiquier, le joueur actif, l'historique, les chronomètres
+        et le journal (s'il y en a un) sont remis à zéro ensemble.
+
+        """
+        self.echiquier.initialiser_echiquier_depart()
+        self.joueur_actif = self.trait_depart = 'blanc'
+        self.numero_depart = 1
+        self.historique = []
+
+        self.temps_total_blanc = self.temps_total_noir = 0
+        self.chrono_blanc_debut = self.chrono_noir_debut = 0
+        self.chrono_blanc_fin = self.chrono_noir_fin = 0
+        self.temps_str_blanc = self.temps_str_noir = '-'
+
+        if self.journal is not None:
+            self.journal.effacer()
+
+    @property
+    def joueur_actif(self):
+        return self.echiquier.trait
+
+    @joueur_actif.setter
+    def joueur_actif(self, couleur):
+        # Le joueur actif est conservé par l'échiquier, puisqu'il fait partie de la clé de hachage de la position.
+        self.echiquier.definir_trait(couleur)
+
     def determiner_gagnant(self):
         """Détermine la couleur du joueur gagnant, s'il y en a un. Pour déterminer si un joueur est le gagnant,
         le roi de la couleur adverse doit être absente de l'échiquier.
@@ -83,10 +281,42 @@ class Partie:
         elif piece.couleur != self.joueur_actif:
             raise MauvaiseCouleur("Cette pièce ne vous appartient pas")
 
+        piece_prise = self.echiquier.recuperer_piece_a_position(position_cible)
+        chronometres = tuple(getattr(self, attribut) for attribut in ATTRIBUTS_CHRONOMETRES)
+        cle_hash = self.echiquier.cle_hash
+
         self.echiquier.deplacer(position_source, position_cible)
+        self.historique.append(EnregistrementDeplacement(position_source, position_cible, piece, piece_prise,
+                                                         chronometres, cle_hash))
+        if self.journal is not None:
+            self.journal.ajouter_deplacement(piece, piece_prise, position_source, position_cible)
 
         self.joueur_suivant()
 
+    def annuler(self):
+        """Annule le dernier déplacement de la partie: la pièce déplacée retourne à sa position source, la pièce mangée
+        est replacée, et le joueur actif et les chronomètres retrouvent leur état d'avant le déplacement. La méthode
+        peut être appelée de nouveau pour annuler les déplacements précédents.
+
+        Returns:
+            EnregistrementDeplacement or None: Le déplacement annulé, ou None si aucun déplacement n'a été effectué.
+
+        """
+        if not self.historique:
+            return None
+
+        enregistrement = self.historique.pop()
+        self.echiquier.annuler_deplacement(enregistrement.position_source, enregistrement.position_cible,
+                                           enregistrement.piece_prise)
+        self.joueur_actif = enregistrement.piece.couleur
+        if self.journal is not None:
+            self.journal.ajouter_annulation()
+
+        for attribut, valeur in zip(ATTRIBUTS_CHRONOMETRES, enregistrement.chronometres):
+            setattr(self, attribut, valeur)
+
+        return enregistrement
+
     def joueur_suivant(self):
         """Change le joueur actif: passe de blanc à noir, ou de noir à blanc, selon la couleur du joueur actif.
            Gère du même coup les chronomètres utilisés pour suivre les temps de jeu des joueurs.
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Module permettant de compter les positions atteignables à partir d'une position de départ (perft), afin de vérifier
+la génération des déplacements et d'en mesurer la vitesse.
+
+Une position dans laquelle un roi a été mangé termine la partie: aucun déplacement n'y est généré.
+
+Utilisation:
+    python -m echecs.perft 4
+    python -m echecs.perft 4 --divide --processus 4 --representation bitboard
+    python -m echecs.perft 3 --fen "4k3/8/8/8/8/8/4P3/4K3 w - - 0 1"
+
+"""
+from echecs.partie import REPRESENTATIONS
+from echecs.piece import Roi, PIECES
+from echecs.fen import FEN_DEPART
+from echecs.exceptions import FenInvalide
+from concurrent.futures import ProcessPoolExecutor
+from argparse import ArgumentParser
+from time import perf_counter
+
+COULEUR_ADVERSE = {'blanc': 'noir', 'noir': 'blanc'}
+
+
+def perft(echiquier, couleur, profondeur):
+    """Compte les positions atteintes après un nombre donné de déplacements, en jouant chaque déplacement généré puis
+    en le défaisant. L'échiquier est remis dans son état initial à la fin.
+
+    Args:
+        echiquier (Echiquier): L'échiquier à partir duquel compter.
+        couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+        profondeur (int): Le nombre de déplacements à jouer.
+
+    Returns:
+        int: Le nombre de positions (feuilles) atteintes.
+
+    """
+    if profondeur == 0:
+        return 1
+
+    deplacements = list(echiquier.generer_deplacements(couleur))
+    if profondeur == 1:
+        return len(deplacements)
+
+    adversaire = COULEUR_ADVERSE[couleur]
+    noeuds = 0
+    for position_source, position_cible in deplacements:
+        piece_prise = echiquier.effectuer_deplacement(position_source, position_cible)
+        if not isinstance(piece_prise, Roi):
+            noeuds += perft(echiquier, adversaire, profondeur - 1)
+        echiquier.annuler_deplacement(position_source, position_cible, piece_prise)
+
+    return noeuds
+
+
+def _perft_deplacement(representation, pieces, couleur, deplacement, profondeur):
+    """Compte les positions atteintes sous un déplacement de la racine. Cette fonction est exécutée dans un processus
+    séparé: l'échiquier y est reconstruit à partir de l'index de chaque pièce, ce qui est moins coûteux à transmettre
+    d'un processus à l'autre que l'échiquier lui-même.
+
+    Args:
+        representation (str): La représentation de l'échiquier (voir REPRESENTATIONS).
+        pieces (tuple): Les paires (position, index de la pièce) de la position racine.
+        couleur (str): La couleur (blanc ou noir) du joueur qui joue le déplacement.
+        deplacement (tuple): La position source et la position cible du déplacement.
+        profondeur (int): La profondeur totale, qui inclut le déplacement de la racine.
+
+    Returns:
+        int: Le nombre de positions atteintes sous ce déplacement.
+
+    """
+    echiquier = REPRESENTATIONS[representation]({position: PIECES[index] for position, index in pieces})
+
+    piece_prise = echiquier.effectuer_deplacement(*deplacement)
+    if isinstance(piece_prise, Roi):
+        return 1 if profondeur == 1 else 0
+
+    return perft(echiquier, COULEUR_ADVERSE[couleur], profondeur - 1)
+
+
+def diviser(echiquier, couleur, profondeur, processus=1, representation='dictionnaire'):
+    """Compte les positions atteintes sous chacun des déplacements de la racine (mode divide). Ce détail permet de
+    trouver le déplacement en cause lorsqu'un total diffère du total attendu.
+
+    Args:
+        echiquier (Echiquier): L'échiquier à partir duquel compter.
+        couleur (str): La couleur (blanc ou noir) du joueur qui doit jouer.
+        profondeur (int): Le nombre de déplacements à jouer, au moins 1.
+        processus (int): Le nombre de processus entre lesquels répartir les déplacements de la racine. Avec 1, tout
+            est compté dans le processus courant.
+        representation (str): La représentation utilisée pour reconstruire l'échiquier dans les autres processus.
+
+    Returns:
+        dict: Pour chaque déplacement de la racine (position source, position cible), le nombre de positions atteintes.
+
+    """
+    deplacements = list(echiquier.generer_deplacements(couleur))
+
+    if processus > 1:
+        pieces = tuple((position, piece.index) for position, piece in echiquier.dictionnaire_pieces.items())
+        with ProcessPoolExecutor(max_workers=processus) as executeur:
+            futurs = [executeur.submit(_perft_deplacement, representation, pieces, couleur, deplacement, profondeur)
+                      for deplacement in deplacements]
+            return {deplacement: futur.result() for deplacement, futur in zip(deplacements, futurs)}
+
+    resultats = {}
+    for position_source, position_cible in deplacements:
+        piece_prise = echiquier.effectuer_deplacement(position_source, position_cible)
+        if isinstance(piece_prise, Roi):
+            resultats[position_source, position_cible] = 1 if profondeur == 1 else 0
+        else:
+            resultats[position_source, position_cible] = perft(echiquier, COULEUR_ADVERSE[couleur], profondeur - 1)
+        echiquier.annuler_deplacement(position_source, position_cible, piece_prise)
+
+    return resultats
+
+
+def principal(arguments=None):
+    """Point d'entrée de la ligne de commande: compte les positions depuis la position de départ, ou depuis une
+    position en notation FEN, et affiche le total, le temps écoulé et le nombre de positions par seconde.
+
+    Args:
+        arguments (list): Les arguments de la ligne de commande, ou None pour utiliser ceux de sys.argv.
+
+    """
+    analyseur = ArgumentParser(prog='python -m echecs.perft',
+                               description='Compte les positions atteintes à une profondeur donnée.')
+    analyseur.add_argument('profondeur', type=int, help='le nombre de déplacements à jouer')
+    analyseur.add_argument('--divide', action='store_true', help='affiche le total sous chaque déplacement de la racine')
+    analyseur.add_argument('--processus', type=int, default=1,
+                           help='le nombre de processus entre lesquels répartir les déplacements de la racine')
+    analyseur.add_argument('--representation', choices=sorted(REPRESENTATIONS), default='dictionnaire',
+                           help="la représentation de l'échiquier")
+    analyseur.add_argument('--fen', default=FEN_DEPART, help='la position de départ, en notation FEN')
+    analyseur.add_argument('--couleur', choices=('blanc', 'noir'),
+                           help='le joueur qui doit jouer, par défaut celui de la position')
+    options = analyseur.parse_args(arguments)
+
+    if options.profondeur < 1:
+        analyseur.error('la profondeur doit être au moins 1')
+
+    try:
+        echiquier = REPRESENTATIONS[options.representation].depuis_fen(options.fen)
+    except FenInvalide as exception:
+        analyseur.error(str(exception))
+    couleur = options.couleur if options.couleur is not None else echiquier.trait
+
+    debut = perf_counter()
+    if options.divide or options.processus > 1:
+        resultats = diviser(echiquier, couleur, options.profondeur, options.processus, options.representation)
+        noeuds = sum(resultats.values())
+    else:
+        resultats = {}
+        noeuds = perft(echiquier, couleur, options.profondeur)
+    duree = perf_counter() - debut
+
+    if options.divide:
+        for (position_source, position_cible), noeuds_deplacement in sorted(resultats.items()):
+            print('{}{}: {}'.format(position_source, position_cible, noeuds_deplacement))
+        print()
+
+    print('Positions: {}'.format(noeuds))
+    print('Temps: {:.3f} s'.format(duree))
+    print('Positions par seconde: {:.0f}'.format(noeuds / duree if duree > 0 else 0))
+
+
+if __name__ == '__main__':
+    principal()
@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""Module contenant la lecture et l'écriture des parties en notation PGN (Portable Game Notation).
+
+La lecture se fait au fil du fichier: il est lu par tampons de taille fixe (TAILLE_TAMPON), et les parties sont
+produites une à la fois par un générateur. La mémoire utilisée ne dépend donc que de la taille d'une partie, et non de
+celle du fichier. Les déplacements, en notation algébrique abrégée (SAN: e4, Nf3, exd5, Rad1, etc.), sont résolus
+sur un échiquier au fur et à mesure: chaque partie est produite avec ses paires (position source, position cible).
+
+Les règles du jeu n'ont ni roque, ni prise en passant, ni promotion. Le rejeu d'une partie s'arrête donc au premier de
+ces déplacements (ou à un déplacement invalide): la partie est tout de même produite avec les déplacements précédents,
+et la raison de l'arrêt (voir PartiePGN.erreur).
+
+Utilisation, pour mesurer la vitesse de lecture d'une archive:
+    python -m echecs.pgn archive.pgn
+
+"""
+from echecs.echiquier import Echiquier
+from echecs.piece import PIECES, INDEX_PIECES, Pion, Tour, Cavalier, Fou, Dame, Roi
+from echecs.fen import lire_fen, FEN_DEPART
+from echecs.exceptions import ExceptionDeplacer, FenInvalide
+from argparse import ArgumentParser
+from time import perf_counter
+import re
+
+# La taille des tampons lus dans le fichier, en caractères.
+TAILLE_TAMPON = 1 << 16
+
+# La longueur maximale d'une ligne de déplacements écrite.
+LONGUEUR_LIGNE = 80
+
+LETTRES_SAN = {Roi: 'K', Dame: 'Q', Tour: 'R', Fou: 'B', Cavalier: 'N'}
+TYPES_SAN = {lettre: type_piece for type_piece, lettre in LETTRES_SAN.items()}
+
+RESULTATS = ('1-0', '0-1', '1/2-1/2', '*')
+RESULTATS_GAGNANTS = {'blanc': '1-0', 'noir': '0-1'}
+
+# Les en-têtes obligatoires, dans l'ordre où ils sont écrits, avec leur valeur lorsqu'elle est inconnue.
+ENTETES_OBLIGATOIRES = (('Event', '?'), ('Site', '?'), ('Date', '????.??.??'), ('Round', '?'), ('White', '?'),
+                        ('Black', '?'), ('Result', '*'))
+
+EXPRESSION_ENTETE = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+EXPRESSION_JETONS = re.compile(r'\{[^}]*\}|;[^\n]*|\(|\)|\$\d+|[^\s(){};]+')
+EXPRESSION_NUMERO = re.compile(r'^\d+\.+')
+EXPRESSION_SAN = re.compile(r'^([KQRBN])?([a-h])?([1-8])?(x)?([a-h][1-8])(=[QRBN])?[+#]?[!?]*$')
+
+COULEUR_ADVERSE = {'blanc': 'noir', 'noir': 'blanc'}
+
+
+class PartiePGN:
+    """Une partie lue dans un fichier PGN.
+
+    Attributes:
+        entetes (dict): Les en-têtes de la partie (Event, White, Result, etc.), dans l'ordre du fichier.
+        deplacements (list): Les déplacements rejoués, sous forme de paires (position source, position cible).
+        resultat (str): Le résultat inscrit à la fin des déplacements (1-0, 0-1, 1/2-1/2 ou *).
+        erreur (str or None): La raison pour laquelle le rejeu s'est arrêté avant la fin de la partie, ou None.
+
+    """
+    __slots__ = ('entetes', 'deplacements', 'resultat', 'erreur')
+
+    def __init__(self, entetes, deplacements, resultat='*', erreur=None):
+        self.entetes = entetes
+        self.deplacements = deplacements
+        self.resultat = resultat
+        self.erreur = erreur
+
+    def __repr__(self):
+        return 'PartiePGN({} - {}, {} déplacements, {})'.format(self.entetes.get('White', '?'),
+                                                                  self.entetes.get('Black', '?'),
+                                                                  len(self.deplacements), self.resultat)
+
+
+def _lignes(fichier, taille_tampon):
+    # Découpe le fichier en lignes, un tampon à la fois. La fin d'un tampon est conservée jusqu'au suivant.
+    reste = ''
+    while True:
+        tampon = fichier.read(taille_tampon)
+        if not tampon:
+            break
+        lignes = (reste + tampon).split('\n')
+        reste = lignes.pop()
+        yield from lignes
+
+    if reste:
+        yield reste
+
+
+def resoudre_san(echiquier, couleur, san):
+    """Trouve le déplacement décrit en notation algébrique abrégée.
+
+    Args:
+        echiquier (Echiquier): L'échiquier, avant le déplacement.
+        couleur (str): La couleur (blanc ou noir) du joueur qui joue le déplacement.
+        san (str): Le déplacement, par exemple e4, Nbd7 ou exd5.
+
+    Returns:
+        tuple: La position source et la position cible du déplacement.
+
+    Raises:
+        ExceptionDeplacer: Si le déplacement n'est pas valide, n'est pas permis par les règles du jeu (roque,
+            promotion), ou est ambigu.
+
+    """
+    correspondance = EXPRESSION_SAN.match(san)
+    if correspondance is None:
+        if san.replace('0', 'O').startswith('O-O'):
+            raise ExceptionDeplacer("Le roque n'existe pas dans ce jeu: {}".format(san))
+        raise ExceptionDeplacer("Ce déplacement n'est pas en notation algébrique: {}".format(san))
+
+    lettre, colonne, rangee, _, position_cible, promotion = correspondance.groups()
+    if promotion is not None:
+        raise ExceptionDeplacer("La promotion n'existe pas dans ce jeu: {}".format(san))
+
+    piece = PIECES[INDEX_PIECES[(TYPES_SAN[lettre] if lettre else Pion, couleur)]]
+    sources = [position for position, autre_piece in echiquier.dictionnaire_pieces.items()
+               if autre_piece is piece and (colonne is None or position[0] == colonne)
+               and (rangee is None or position[1] == rangee)
+               and echiquier.deplacement_est_valide(position, position_cible)]
+
+    if len(sources) != 1:
+        raise ExceptionDeplacer("Ce déplacement est {}: {}".format('ambigu' if sources else 'invalide', san))
+
+    return sources[0], position_cible
+
+
+def ecrire_san(echiquier, position_source, position_cible):
+    """Écrit un déplacement en notation algébrique abrégée, avec le moins de précisions possible sur la case source.
+
+    Args:
+        echiquier (Echiquier): L'échiquier, avant le déplacement.
+        position_source (str): La position source.
+        position_cible (str): La position cible.
+
+    Returns:
+        str: Le déplacement, par exemple e4, Nbd7 ou exd5.
+
+    """
+    piece = echiquier.recuperer_piece_a_position(position_source)
+    prise = 'x' if echiquier.recuperer_piece_a_position(position_cible) is not None else ''
+
+    if isinstance(piece, Pion):
+        return (position_source[0] + prise if prise else '') + position_cible
+
+    autres = [position for position, autre_piece in echiquier.dictionnaire_pieces.items()
+              if autre_piece is piece and position != position_source
+              and echiquier.deplacement_est_valide(position, position_cible)]
+    if not autres:
+        precision = ''
+    elif all(position[0] != position_source[0] for position in autres):
+        precision = position_source[0]
+    elif all(position[1] != position_source[1] for position in autres):
+        precision = position_source[1]
+    else:
+        precision = position_source
+
+    return LETTRES_SAN[type(piece)] + precision + prise + position_cible
+
+
+def _rejouer(echiquier, entetes, texte):
+    # Rejoue les déplacements d'une partie à partir de sa position de départ (celle de l'en-tête FEN, s'il y en a un).
+    try:
+        pieces, trait = lire_fen(entetes.get('FEN', FEN_DEPART))
+    except FenInvalide as exception:
+        return PartiePGN(entetes, [], entetes.get('Result', '*'), str(exception))
+    echiquier.dictionnaire_pieces = pieces
+    couleur = trait
+
+    deplacements = []
+    resultat = entetes.get('Result', '*')
+    erreur = None
+    profondeur_variante = 0
+
+    for jeton in EXPRESSION_JETONS.findall(texte):
+        premier = jeton[0]
+        if premier == '(':
+            profondeur_variante += 1
+            continue
+        if premier == ')':
+            profondeur_variante -= 1
+            continue
+        if profondeur_variante or premier in '{;$':
+            continue
+        if jeton in RESULTATS:
+            resultat = jeton
+            continue
+
+        jeton = EXPRESSION_NUMERO.sub('', jeton)
+        if not jeton or erreur is not None:
+            continue
+
+        try:
+            deplacement = resoudre_san(echiquier, couleur, jeton)
+        except ExceptionDeplacer as exception:
+            erreur = str(exception)
+            continue
+
+        echiquier.effectuer_deplacement(*deplacement)
+        deplacements.append(deplacement)
+        couleur = COULEUR_ADVERSE[couleur]
+
+    return PartiePGN(entetes, deplacements, resultat, erreur)
+
+
+def lire_pgn(fichier, taille_tampon=TAILLE_TAMPON):
+    """Lit les parties d'un fichier PGN, une à la fois.
+
+    Args:
+        fichier (file): Le fichier, ouvert en lecture en mode texte.
+        taille_tampon (int): Le nombre de caractères lus à la fois.
+
+    Yields:
+        PartiePGN: Chaque partie, avec ses déplacements rejoués.
+
+    """
+    echiquier = Echiquier({})
+    entetes = {}
+    texte = []
+
+    for ligne in _lignes(fichier, taille_tampon):
+        ligne = ligne.strip()
+        if not ligne or ligne[0] == '%':
+            continue
+
+        if ligne[0] == '[':
+            # Un en-tête qui suit des déplacements commence la partie suivante.
+            if texte:
+                yield _rejouer(echiquier, entetes, '\n'.join(texte))
+                entetes, texte = {}, []
+            correspondance = EXPRESSION_ENTETE.match(ligne)
+            if correspondance is not None:
+                entetes[correspondance.group(1)] = correspondance.group(2).replace('\\"', '"')
+            continue
+
+        texte.append(ligne)
+
+    if texte or entetes:
+        yield _rejouer(echiquier, entetes, '\n'.join(texte))
+
+
+def lire_fichier_pgn(chemin, taille_tampon=TAILLE_TAMPON):
+    """Lit les parties d'un fichier PGN à partir de son chemin (voir lire_pgn).
+
+    Args:
+        chemin (str): Le chemin du fichier.
+        taille_tampon (int): Le nombre de caractères lus à la fois.
+
+    Yields:
+        PartiePGN: Chaque partie, avec ses déplacements rejoués.
+
+    """
+    with open(chemin, 'r', encoding='utf-8', errors='replace') as fichier:
+        yield from lire_pgn(fichier, taille_tampon)
+
+
+def ecrire_pgn(partie, entetes=None):
+    """Écrit les déplacements d'une partie en notation PGN.
+
+    Args:
+        partie (Partie): La partie.
+        entetes (dict): Les en-têtes à écrire, en plus (ou à la place) des en-têtes obligatoires.
+
+    Returns:
+        str: La partie, terminée par une ligne vide.
+
+    """
+    # La position de départ est retrouvée en défaisant les déplacements de l'historique sur une copie de l'échiquier.
+    echiquier = Echiquier(dict(partie.echiquier.dictionnaire_pieces))
+    for enregistrement in reversed(partie.historique):
+        echiquier.annuler_deplacement(enregistrement.position_source, enregistrement.position_cible,
+                                      enregistrement.piece_prise)
+    couleur = partie.historique[0].piece.couleur if partie.historique else partie.joueur_actif
+    echiquier.definir_trait(couleur)
+
+    resultat = RESULTATS_GAGNANTS.get(partie.determiner_gagnant(), '*')
+    toutes_entetes = dict(ENTETES_OBLIGATOIRES)
+    toutes_entetes['Result'] = resultat
+    fen = echiquier.vers_fen()
+    if fen != FEN_DEPART:
+        toutes_entetes['SetUp'] = '1'
+        toutes_entetes['FEN'] = fen
+    toutes_entetes.update(entetes or {})
+
+    # Le numéro d'un déplacement compte les déplacements des deux joueurs: une partie commencée par les noirs est
+    # décalée d'un demi-déplacement.
+    decalage = 0 if couleur == 'blanc' else 1
+    jetons = []
+    for numero, enregistrement in enumerate(partie.historique, decalage):
+        if couleur == 'blanc':
+            jetons.append('{}.'.format(numero // 2 + 1))
+        elif numero == decalage:
+            jetons.append('1...')
+        jetons.append(ecrire_san(echiquier, enregistrement.position_source, enregistrement.position_cible))
+        echiquier.effectuer_deplacement(enregistrement.position_source, enregistrement.position_cible)
+        couleur = COULEUR_ADVERSE[couleur]
+    jetons.append(resultat)
+
+    lignes = ['[{} "{}"]'.format(nom, valeur.replace('"', '\\"')) for nom, valeur in toutes_entetes.items()]
+    lignes.append('')
+    ligne = ''
+    for jeton in jetons:
+        if ligne and len(ligne) + 1 + len(jeton) > LONGUEUR_LIGNE:
+            lignes.append(ligne)
+            ligne = jeton
+        else:
+            ligne = ligne + ' ' + jeton if ligne else jeton
+    lignes.append(ligne)
+
+    return '\n'.join(lignes) + '\n\n'
+
+
+def principal(arguments=None):
+    """Point d'entrée de la ligne de commande: lit toutes les parties d'un fichier PGN et affiche le nombre de
+    parties lues par seconde.
+
+    Args:
+        arguments (list): Les arguments de la ligne de commande, ou None pour utiliser ceux de sys.argv.
+
+    """
+    analyseur = ArgumentParser(prog='python -m echecs.pgn', description='Lit les parties d\'un fichier PGN.')
+    analyseur.add_argument('fichier', help='le fichier PGN')
+    analyseur.add_argument('--taille-tampon', type=int, default=TAILLE_TAMPON,
+                           help='le nombre de caractères lus à la fois')
+    options = analyseur.parse_args(arguments)
+
+    parties = deplacements = incompletes = 0
+    debut = perf_counter()
+    for partie in lire_fichier_pgn(options.fichier, options.taille_tampon):
+        parties += 1
+        deplacements += len(partie.deplacements)
+        incompletes += partie.erreur is not None
+    duree = perf_counter() - debut
+
+    print('Parties: {} (dont {} rejouées en partie seulement)'.format(parties, incompletes))
+    print('Déplacements: {}'.format(deplacements))
+    print('Temps: {:.3f} s'.format(duree))
+    print('Parties par seconde: {:.0f}'.format(parties / duree if duree > 0 else 0))
+
+
+if __name__ == '__main__':
+    principal()
@@ -2,17 +2,32 @@
 """Module contenant la classe de base Piece, ainsi qu'une classe fille pour chacun des types de pièces du jeu d'échecs.
 
 """
+from echecs.cases import (INDEX_CASES, COLONNES, RANGEES, DELTAS_COLONNES, DELTAS_RANGEES, ATTAQUES_CAVALIER,
+                          ATTAQUES_ROI, ATTAQUES_PION)
+
 # TODO: Si votre système n'affiche pas correctement les caractères unicodes du jeu d'échecs,
 # mettez cette constante (variable globale) à False. Un tutoriel est présent sur le site Web
 # du cours pour vous aider à faire fonctionner les caractères Unicoe sous Windows.
 UTILISER_UNICODE = False
 
+# Les couleurs des pièces. Les pièces conservent toujours ces instances de chaînes de caractères, ce qui permet de les
+# comparer par identité.
+BLANC = 'blanc'
+NOIR = 'noir'
+COULEURS = (BLANC, NOIR)
+
+# L'unique instance de chaque pièce, par type et par couleur (voir Piece.__new__).
+REGISTRE_PIECES = {}
+
 
 def position_split(position_source, position_cible):
     """Prend les arguments positions_sources et position_cible et sépare la lettre et le chiffre. Les chiffres sont
         transformé en entier dans l'objectif d'appliquer des opérations mathématiques. La lettre est transformé en
         index dans l'objectif d'apliquer des opérations mathématiques.
 
+        Les règles des pièces n'utilisent plus cette fonction: elles travaillent directement sur les index de cases
+        du module cases. Elle est conservée pour le code qui l'utilise encore.
+
     Args:
         position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
         position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
@@ -25,40 +40,71 @@ def position_split(position_source, position_cible):
         positon_source: Liste contenant deux chaînes de caractères.
         position_cible: Liste contenant deux chaînes de caractères.
     """
+    source = INDEX_CASES[position_source]
+    cible = INDEX_CASES[position_cible]
 
-    position_source = position_source[0].split() + position_source[1].split()
-    depart = int(position_source[1])
-    position_cible = position_cible[0].split() + position_cible[1].split()
-    arrive = int(position_cible[1])
+    return [RANGEES[source] + 1, RANGEES[cible] + 1, COLONNES[source], COLONNES[cible],
+            list(position_source), list(position_cible)]
 
-    list = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
-    index_depart = list.index(position_source[0])
-    index_arrive = list.index(position_cible[0])
 
-    return [depart, arrive, index_depart, index_arrive, position_source, position_cible]
 
 
 class Piece:
     """Une classe de base représentant une pièce du jeu d'échecs. C'est cette classe qui est héritée plus bas pour fournir
     une classe par type de pièce (Pion, Tour, etc.).
 
+    Les règles de déplacement sont programmées dans les méthodes peut_se_deplacer_vers_case et
+    peut_faire_une_prise_vers_case, qui reçoivent des index de cases (voir le module cases). Les méthodes
+    peut_se_deplacer_vers et peut_faire_une_prise_vers reçoivent des positions et ne font que les convertir en index.
+
+    Une pièce ne conserve aucune information sur sa position: il n'existe donc qu'une instance de chaque type de
+    pièce pour chaque couleur, partagée par tous les échiquiers. Pion('blanc') retourne toujours la même instance, qui
+    ne peut pas être modifiée, et une copie d'échiquier ne copie que des références vers ces instances.
+
     Attributes:
-        couleur (str): La couleur de la pièce, soit 'blanc' ou 'noir'.
+        couleur (str): La couleur de la pièce, soit BLANC ou NOIR.
+        index (int): L'index de la pièce dans PIECES, qui sert d'index aux bitboards et aux tables de hachage.
         peut_sauter (bool): Si oui ou non la pièce peut "sauter" par dessus d'autres pièces sur un échiquier.
 
     Args:
-        couleur (str): La couleur avec laquelle créer la pièce.
-        peut_sauter (bool): La valeur avec laquelle l'attribut peut_sauter doit être initialisé.
+        couleur (str): La couleur de la pièce.
 
     """
 
-    def __init__(self, couleur, peut_sauter):
-        # Validation si la couleur reçue est valide.
-        assert couleur in ('blanc', 'noir')
+    __slots__ = ('couleur', 'index')
+    peut_sauter = False
+
+    def __new__(cls, couleur):
+        # Une seule instance est créée par type de pièce et par couleur: les appels suivants la retournent.
+        piece = REGISTRE_PIECES.get((cls, couleur))
+
+        if piece is None:
+            # Validation si la couleur reçue est valide.
+            assert couleur in COULEURS
+
+            # Création des attributs avec les valeurs reçues, sans passer par __setattr__ qui les rend immuables.
+            piece = super().__new__(cls)
+            object.__setattr__(piece, 'couleur', COULEURS[COULEURS.index(couleur)])
+            object.__setattr__(piece, 'index', 6 * COULEURS.index(couleur) + TYPES_PIECES.index(cls))
+            REGISTRE_PIECES[(cls, couleur)] = piece
+
+        return piece
+
+    def __setattr__(self, nom, valeur):
+        raise AttributeError("Une pièce est partagée entre les échiquiers, elle ne peut pas être modifiée")
+
+    def __delattr__(self, nom):
+        raise AttributeError("Une pièce est partagée entre les échiquiers, elle ne peut pas être modifiée")
+
+    def __reduce__(self):
+        # Une pièce copiée ou désérialisée redevient l'instance partagée de son type et de sa couleur.
+        return type(self), (self.couleur,)
 
-        # Création des attributs avec les valeurs reçues.
-        self.couleur = couleur
-        self.peut_sauter = peut_sauter
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
     def est_blanc(self):
         """Retourne si oui ou non la pièce est blanche.
@@ -67,7 +113,7 @@ class Piece:
             bool: True si la pièce est blanche, et False autrement.
 
         """
-        return self.couleur == 'blanc'
+        return self.couleur == BLANC
 
     def est_noir(self):
         """Retourne si oui ou non la pièce est noire.
@@ -76,7 +122,7 @@ class Piece:
             bool: True si la pièce est noire, et False autrement.
 
         """
-        return self.couleur == 'noir'
+        return self.couleur == NOIR
 
     def peut_se_deplacer_vers(self, position_source, position_cible):
         """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une position à une autre.
@@ -94,94 +140,105 @@ class Piece:
 
         """
 
+        return self.peut_se_deplacer_vers_case(INDEX_CASES[position_source], INDEX_CASES[position_cible])
+
+    def peut_faire_une_prise_vers(self, position_source, position_cible):
+        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut "manger" (faire une prise) une pièce ennemie.
+
+        Args:
+            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
+            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+
+        Returns:
+            bool: True si la prise est valide en suivant les règles de la pièce, et False autrement.
+
+        """
+
+        return self.peut_faire_une_prise_vers_case(INDEX_CASES[position_source], INDEX_CASES[position_cible])
+
+    def peut_se_deplacer_vers_case(self, case_source, case_cible):
+        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une case à une autre.
+
+        Args:
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
+
+        Returns:
+            bool: True si le déplacement est valide en suivant les règles de la pièce, et False autrement.
+
+        """
+
         # On lance une exception (on y reviendra) indiquant que ce code n'a pas été implémenté. Ne touchez pas
         # à cette méthode : réimplémentez-la dans les classes filles!
         raise NotImplementedError
 
-    def peut_faire_une_prise_vers(self, position_source, position_cible):
+    def peut_faire_une_prise_vers_case(self, case_source, case_cible):
         """Vérifie si, selon les règles du jeu d'échecs, la pièce peut "manger" (faire une prise) une pièce ennemie.
-        Pour la plupart des pièces, la règle est la même, on appelle donc la méthode peut_se_deplacer_vers.
+        Pour la plupart des pièces, la règle est la même, on appelle donc la méthode peut_se_deplacer_vers_case.
 
         Si ce n'est pas le cas pour une certaine pièce, on peut simplement redéfinir cette méthode pour programmer
         la règle.
 
         Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
 
         Returns:
             bool: True si la prise est valide en suivant les règles de la pièce, et False autrement.
 
         """
 
-        return self.peut_se_deplacer_vers(position_source, position_cible)
+        return self.peut_se_deplacer_vers_case(case_source, case_cible)
 
 
 class Pion(Piece):
-    def __init__(self, couleur):
-        super().__init__(couleur, False)
-
-    def peut_se_deplacer_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une position à une autre.
+    __slots__ = ()
 
-        Une position est une chaîne de deux caractères.
-            Le premier caractère est une lettre entre a et h, représentant la colonne de l'échiquier.
-            Le second caractère est un chiffre entre 1 et 8, représentant la rangée de l'échiquier.
+    def peut_se_deplacer_vers_case(self, case_source, case_cible):
+        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une case à une autre.
 
         Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
 
         Returns:
             bool: True si le déplacement est valide en suivant les règles de la pièce, et False autrement.
 
         """
 
-        pos = position_split(position_source, position_cible)
+        if DELTAS_COLONNES[case_source][case_cible] != 0: # Le pion ne change pas de colonne
+            return False
 
-        if self.est_blanc() and pos[4][0] == pos[5][0] and pos[4][1] < pos[5][1]: # Si le pion avance, mais ne change pas de rangée
-            if pos[0] == 2 and pos[1] - pos[0] <= 2: # Si le pion est sur sa case départ, il avance de 1 ou 2
-                return True
+        avance = DELTAS_RANGEES[case_source][case_cible]
 
-            elif pos[0] != 2 and pos[1] - pos[0] == 1: # Si le pion n'est plus sur sa case départ, il avance de 1
-                return True
+        if self.est_blanc() and avance > 0:
+            if RANGEES[case_source] == 1: # Si le pion est sur sa case départ, il avance de 1 ou 2
+                return avance <= 2
 
-        elif self.est_noir() and pos[4][0] == pos[5][0] and pos[4][1] > pos[5][1]:
-            if pos[0] == 7 and pos[0] - pos[1] <= 2:
-                return True
+            return avance == 1 # Si le pion n'est plus sur sa case départ, il avance de 1
 
-            elif pos[0] != 7 and pos[0] - pos[1] == 1:
-                return True
+        elif self.est_noir() and avance < 0:
+            if RANGEES[case_source] == 6:
+                return avance >= -2
 
-        else:
-            return False
+            return avance == -1
 
-    def peut_faire_une_prise_vers(self, position_source, position_cible):
+        return False
+
+    def peut_faire_une_prise_vers_case(self, case_source, case_cible):
         """Vérifie si, selon les règles du jeu d'échecs, la pièce peut "manger" (faire une prise) une pièce ennemie.
 
         Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
 
         Returns:
             bool: True si la prise est valide en suivant les règles de la pièce, et False autrement.
 
         """
 
-        pos = position_split(position_source, position_cible) # Voir fonction position_split
-
-        if self.est_blanc() and pos[1] == pos[0]+1 and pos[3] == pos[2]+1: # Diagonale haut-droite
-            return True
-        elif self.est_blanc() and pos[1] == pos[0]+1 and pos[3] == pos[2]-1: # Diagonale haut-gauche
-            return True
-
-        elif self.est_noir() and pos[1] == pos[0]-1 and pos[3] == pos[2]+1: # Diagonale bas-droite
-            return True
-        elif self.est_noir() and pos[1] == pos[0]-1 and pos[3] == pos[2]-1: # Diagonale bas-gauche
-            return True
-
-        else:
-            return False
+        # Diagonale vers le haut pour un pion blanc, vers le bas pour un pion noir
+        return bool(ATTAQUES_PION[self.couleur][case_source] >> case_cible & 1)
 
     def __repr__(self):
         """Redéfinit comment on affiche un pion à l'écran. Nous utilisons la constante UTILISER_UNICODE
@@ -199,52 +256,25 @@ class Pion(Piece):
 
 
 class Tour(Piece):
-    def __init__(self, couleur):
-        super().__init__(couleur, False)
-
-    def peut_se_deplacer_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une position à une autre.
+    __slots__ = ()
 
-        Une position est une chaîne de deux caractères.
-            Le premier caractère est une lettre entre a et h, représentant la colonne de l'échiquier.
-            Le second caractère est un chiffre entre 1 et 8, représentant la rangée de l'échiquier.
+    def peut_se_deplacer_vers_case(self, case_source, case_cible):
+        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une case à une autre.
 
         Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
 
         Returns:
             bool: True si le déplacement est valide en suivant les règles de la pièce, et False autrement.
 
         """
 
-        pos = position_split(position_source, position_cible)
-
-        if position_source == position_cible: # Deplacement sur la meme case
-            return False
-
-        elif pos[0] == pos[1] and pos[2] != pos[3]: # Deplacement vertical
-            return True
-
-        elif pos[2] == pos[3] and pos[0] != pos[1]: # Deplacement horizontal
-            return True
-
-        else:
+        if case_source == case_cible: # Deplacement sur la meme case
             return False
 
-    def peut_faire_une_prise_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut "manger" (faire une prise) une pièce ennemie.
-
-        Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
-
-        Returns:
-            bool: True si la prise est valide en suivant les règles de la pièce, et False autrement.
-
-        """
-
-        return self.peut_se_deplacer_vers(position_source, position_cible)
+        # Deplacement vertical ou horizontal
+        return DELTAS_COLONNES[case_source][case_cible] == 0 or DELTAS_RANGEES[case_source][case_cible] == 0
 
     def __repr__(self):
         if self.est_blanc():
@@ -254,54 +284,23 @@ class Tour(Piece):
 
 
 class Cavalier(Piece):
-    def __init__(self, couleur):
-        super().__init__(couleur, True)
-
-    def peut_se_deplacer_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une position à une autre.
+    __slots__ = ()
+    peut_sauter = True
 
-        Une position est une chaîne de deux caractères.
-            Le premier caractère est une lettre entre a et h, représentant la colonne de l'échiquier.
-            Le second caractère est un chiffre entre 1 et 8, représentant la rangée de l'échiquier.
+    def peut_se_deplacer_vers_case(self, case_source, case_cible):
+        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une case à une autre.
 
         Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
 
         Returns:
             bool: True si le déplacement est valide en suivant les règles de la pièce, et False autrement.
 
         """
 
-        pos = position_split(position_source, position_cible)
-
-        if position_source == position_cible: # Deplacement sur la meme case
-            return False
-
-        # Deplacement en "L" vertical
-        elif (pos[1] == pos[0] + 2 and (pos[3] == pos[2] + 1 or pos[3] == pos[2] - 1)) or (pos[1] == pos[0] - 2 and (pos[3] == pos[2] + 1 or pos[3] == pos[2] - 1)):
-            return True
-
-        # Deplacement en "L" horizontal
-        elif (pos[1] == pos[0] + 1 and (pos[3] == pos[2] + 2 or pos[3] == pos[2] - 2)) or (pos[1] == pos[0] - 1 and (pos[3] == pos[2] + 2 or pos[3] == pos[2] - 2)):
-            return True
-
-        else:
-            return False
-
-    def peut_faire_une_prise_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut "manger" (faire une prise) une pièce ennemie.
-
-        Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
-
-        Returns:
-            bool: True si la prise est valide en suivant les règles de la pièce, et False autrement.
-
-        """
-
-        return self.peut_se_deplacer_vers(position_source, position_cible)
+        # Deplacement en "L" vertical ou horizontal
+        return bool(ATTAQUES_CAVALIER[case_source] >> case_cible & 1)
 
     def __repr__(self):
         if self.est_blanc():
@@ -311,52 +310,25 @@ class Cavalier(Piece):
 
 
 class Fou(Piece):
-    def __init__(self, couleur):
-        super().__init__(couleur, False)
-
-    def peut_se_deplacer_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une position à une autre.
+    __slots__ = ()
 
-        Une position est une chaîne de deux caractères.
-            Le premier caractère est une lettre entre a et h, représentant la colonne de l'échiquier.
-            Le second caractère est un chiffre entre 1 et 8, représentant la rangée de l'échiquier.
+    def peut_se_deplacer_vers_case(self, case_source, case_cible):
+        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une case à une autre.
 
         Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
 
         Returns:
             bool: True si le déplacement est valide en suivant les règles de la pièce, et False autrement.
 
         """
 
-        pos = position_split(position_source, position_cible)
-        dia = pos[1] - pos[0]
-
-        if position_source == position_cible: # Deplacement sur la même case
+        if case_source == case_cible: # Deplacement sur la même case
             return False
 
         # Deplacement diagonal
-        elif (pos[1] == pos[0] + dia and (pos[3] == pos[2] + dia or pos[3] == abs(pos[2] - dia))) or (
-                pos[1] == pos[0] + dia and (pos[3] == pos[2] + dia or pos[3] == abs(pos[2] - dia))):
-            return True
-
-        else:
-            return False
-
-    def peut_faire_une_prise_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut "manger" (faire une prise) une pièce ennemie.
-
-        Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
-
-        Returns:
-            bool: True si la prise est valide en suivant les règles de la pièce, et False autrement.
-
-        """
-
-        return self.peut_se_deplacer_vers(position_source, position_cible)
+        return abs(DELTAS_COLONNES[case_source][case_cible]) == abs(DELTAS_RANGEES[case_source][case_cible])
 
     def __repr__(self):
         if self.est_blanc():
@@ -366,60 +338,22 @@ class Fou(Piece):
 
 
 class Roi(Piece):
-    def __init__(self, couleur):
-        super().__init__(couleur, False)
-
-    def peut_se_deplacer_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une position à une autre.
+    __slots__ = ()
 
-        Une position est une chaîne de deux caractères.
-            Le premier caractère est une lettre entre a et h, représentant la colonne de l'échiquier.
-            Le second caractère est un chiffre entre 1 et 8, représentant la rangée de l'échiquier.
+    def peut_se_deplacer_vers_case(self, case_source, case_cible):
+        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une case à une autre.
 
         Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
 
         Returns:
             bool: True si le déplacement est valide en suivant les règles de la pièce, et False autrement.
 
         """
 
-        pos = position_split(position_source, position_cible)
-
-        if position_source[0] == position_cible[0] and position_source[1] != position_cible[1]: # Deplacement vertical
-            if pos[1] == pos[0] + 1 or pos[1] == pos[0] - 1:
-                return True
-
-        if position_source[0] != position_cible[0] and position_source[1] == position_cible[1]: # Deplacement horizontal
-            if pos[3] == pos[2] + 1 or pos[3] == pos[2] -1:
-                return True
-
-        if position_source[0] != position_cible[0] and position_source[1] != position_cible[1]: # Deplacement diagonal
-            if pos[1] == pos[0] + 1 and pos[3] == pos[2] + 1:
-                return True
-            if pos[1] == pos[0] + 1 and pos[3] == pos[2] - 1:
-                return True
-            if pos[1] == pos[0] - 1 and pos[3] == pos[2] + 1:
-                return True
-            if pos[1] == pos[0] - 1 and pos[3] == pos[2] - 1:
-                return True
-
-        return False
-
-    def peut_faire_une_prise_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut "manger" (faire une prise) une pièce ennemie.
-
-        Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
-
-        Returns:
-            bool: True si la prise est valide en suivant les règles de la pièce, et False autrement.
-
-        """
-
-        return self.peut_se_deplacer_vers(position_source, position_cible)
+        # Deplacement vertical, horizontal ou diagonal d'une seule case
+        return bool(ATTAQUES_ROI[case_source] >> case_cible & 1)
 
     def __repr__(self):
         if self.est_blanc():
@@ -429,60 +363,39 @@ class Roi(Piece):
 
 
 class Dame(Piece):
-    def __init__(self, couleur):
-        super().__init__(couleur, False)
-
-    def peut_se_deplacer_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une position à une autre.
+    __slots__ = ()
 
-        Une position est une chaîne de deux caractères.
-            Le premier caractère est une lettre entre a et h, représentant la colonne de l'échiquier.
-            Le second caractère est un chiffre entre 1 et 8, représentant la rangée de l'échiquier.
+    def peut_se_deplacer_vers_case(self, case_source, case_cible):
+        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut se déplacer d'une case à une autre.
 
         Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
+            case_source (int): L'index de la case source, entre 0 (a1) et 63 (h8).
+            case_cible (int): L'index de la case cible, entre 0 (a1) et 63 (h8).
 
         Returns:
             bool: True si le déplacement est valide en suivant les règles de la pièce, et False autrement.
 
         """
 
-        pos = position_split(position_source, position_cible)
-        dia = pos[1] - pos[0]
-
-        if position_source == position_cible: # Deplacement sur la meme case
-            return False
-
-        elif pos[0] == pos[1] and pos[2] != pos[3]: # Deplacement horizontal
-            return True
+        delta_colonne = DELTAS_COLONNES[case_source][case_cible]
+        delta_rangee = DELTAS_RANGEES[case_source][case_cible]
 
-        elif pos[2] == pos[3] and pos[0] != pos[1]: # Deplacement vertical
-            return True
-
-        elif (pos[1] == pos[0] + dia and (pos[3] == pos[2] + dia or pos[3] == abs(pos[2] - dia))) or (
-                pos[1] == pos[0] + dia and (pos[3] == pos[2] + dia or pos[3] == abs(pos[2] - dia))): # Deplacement diagonal
-            return True
-
-        else:
+        if case_source == case_cible: # Deplacement sur la meme case
             return False
 
-    def peut_faire_une_prise_vers(self, position_source, position_cible):
-        """Vérifie si, selon les règles du jeu d'échecs, la pièce peut "manger" (faire une prise) une pièce ennemie.
-
-        Args:
-            position_source (str): La position source, suivant le format ci-haut. Par exemple, 'a8', 'f3', etc.
-            position_cible (str): La position cible, suivant le format ci-haut. Par exemple, 'b6', 'h1', etc.
-
-        Returns:
-            bool: True si la prise est valide en suivant les règles de la pièce, et False autrement.
-
-        """
-
-        return self.peut_se_deplacer_vers(position_source, position_cible)
+        # Deplacement horizontal, vertical ou diagonal
+        return delta_colonne == 0 or delta_rangee == 0 or abs(delta_colonne) == abs(delta_rangee)
 
     def __repr__(self):
         if self.est_blanc():
             return 'Dame Blanc'
         else:
             return 'Dame Noir'
+
+
+TYPES_PIECES = (Pion, Tour, Cavalier, Fou, Dame, Roi)
+
+# L'instance de chaque pièce, dans l'ordre de leur attribut index: les six types de pièces blanches, puis les six
+# types de pièces noires.
+PIECES = tuple(type_piece(couleur) for couleur in COULEURS for type_piece in TYPES_PIECES)
+INDEX_PIECES = {(type(piece), piece.couleur): index for index, piece in enumerate(PIECES)}
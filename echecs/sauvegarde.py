@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""Module contenant le format binaire des sauvegardes de parties.
+
+Une sauvegarde est composée d'un en-tête (voir ENTETE: la signature, la version du format, le joueur actif, le temps
+total de chaque joueur et le nombre de déplacements), suivi de l'échiquier, puis des déplacements de la partie.
+L'échiquier occupe un octet par case, de a1 à h8: 0 pour une case vide, ou l'index de la pièce (voir piece.PIECES) plus
+un. Chaque déplacement occupe deux octets (voir encoder_deplacement), du premier au dernier. Une partie de 40
+déplacements occupe ainsi 172 octets.
+
+Les anciennes sauvegardes en JSON, où chaque pièce est une chaîne comme "Pion Blanc", peuvent toujours être lues: le
+format est reconnu à la signature.
+
+"""
+from echecs.cases import CASES, INDEX_CASES
+from echecs.piece import PIECES, COULEURS
+from echecs.exceptions import FichierInvalide
+import json
+import struct
+
+# L'en-tête: la signature, la version du format, le joueur actif (son index dans COULEURS), le temps total des joueurs
+# blanc et noir, en secondes, et le nombre de déplacements.
+ENTETE = struct.Struct('<4sHBxddI')
+SIGNATURE = b'SAUV'
+VERSION = 1
+
+TAILLE_ECHIQUIER = 64
+
+# Les pièces des anciennes sauvegardes JSON, par nom (par exemple "Pion Blanc").
+PIECES_JSON = {'{} {}'.format(type(piece).__name__, piece.couleur.capitalize()): piece for piece in PIECES}
+
+
+class EtatSauvegarde:
+    """Le contenu d'une sauvegarde.
+
+    Attributes:
+        pieces (dict): Les pièces de l'échiquier, par position.
+        trait (str): Le joueur actif (blanc ou noir).
+        temps_blanc (float): Le temps total du joueur blanc, en secondes.
+        temps_noir (float): Le temps total du joueur noir, en secondes.
+        deplacements (list): Les déplacements de la partie, du premier au dernier, sous forme de triplets (position
+            source, position cible, pièce prise ou None).
+
+    """
+    __slots__ = ('pieces', 'trait', 'temps_blanc', 'temps_noir', 'deplacements')
+
+    def __init__(self, pieces, trait, temps_blanc=0, temps_noir=0, deplacements=()):
+        self.pieces = pieces
+        self.trait = trait
+        self.temps_blanc = temps_blanc
+        self.temps_noir = temps_noir
+        self.deplacements = list(deplacements)
+
+
+def encoder_deplacement(position_source, position_cible, piece_prise=None):
+    """Encode un déplacement sur 16 bits: l'index de la case source (6 bits), celui de la case cible (6 bits), puis
+    l'index de la pièce prise plus un, ou 0 (4 bits).
+
+    Args:
+        position_source (str): La position source.
+        position_cible (str): La position cible.
+        piece_prise (Piece): La pièce mangée par le déplacement, ou None.
+
+    Returns:
+        int: Le déplacement encodé.
+
+    """
+    return (INDEX_CASES[position_source] << 10 | INDEX_CASES[position_cible] << 4
+            | (piece_prise.index + 1 if piece_prise is not None else 0))
+
+
+def decoder_deplacement(code):
+    """Décode un déplacement encodé par encoder_deplacement.
+
+    Args:
+        code (int): Le déplacement encodé.
+
+    Returns:
+        tuple: La position source, la position cible et la pièce prise (ou None).
+
+    Raises:
+        FichierInvalide: Si le code ne décrit pas un déplacement.
+
+    """
+    prise = code & 0xF
+    if prise > len(PIECES):
+        raise FichierInvalide("Ce déplacement encodé n'est pas valide: {}".format(code))
+
+    return CASES[code >> 10], CASES[code >> 4 & 0x3F], PIECES[prise - 1] if prise else None
+
+
+def ecrire(etat):
+    """Écrit une sauvegarde dans le format binaire.
+
+    Args:
+        etat (EtatSauvegarde): Le contenu de la sauvegarde.
+
+    Returns:
+        bytes: La sauvegarde.
+
+    """
+    echiquier = bytearray(TAILLE_ECHIQUIER)
+    for position, piece in etat.pieces.items():
+        echiquier[INDEX_CASES[position]] = piece.index + 1
+
+    nombre = len(etat.deplacements)
+    return b''.join((ENTETE.pack(SIGNATURE, VERSION, COULEURS.index(etat.trait), etat.temps_blanc, etat.temps_noir,
+                                 nombre),
+                     echiquier,
+                     struct.pack('<{}H'.format(nombre), *(encoder_deplacement(*deplacement)
+                                                          for deplacement in etat.deplacements))))
+
+
+def _lire_json(donnees):
+    # Les anciennes sauvegardes ne conservent que l'échiquier, le joueur actif et les temps totaux.
+    try:
+        dictionnaire = json.loads(donnees.decode('utf-8'))
+        pieces = {position: PIECES_JSON[nom] for position, nom in dictionnaire['piece'].items()}
+        etat = EtatSauvegarde(pieces, dictionnaire['joueur'], dictionnaire['temps_blanc'], dictionnaire['temps_noir'])
+    except (ValueError, KeyError, TypeError, AttributeError):
+        raise FichierInvalide("Ce fichier n'est pas une sauvegarde de partie")
+
+    if etat.trait not in COULEURS or any(position not in INDEX_CASES for position in pieces):
+        raise FichierInvalide("Ce fichier n'est pas une sauvegarde de partie")
+
+    return etat
+
+
+def lire(donnees):
+    """Lit une sauvegarde, dans le format binaire ou dans l'ancien format JSON.
+
+    Args:
+        donnees (bytes): La sauvegarde.
+
+    Returns:
+        EtatSauvegarde: Le contenu de la sauvegarde.
+
+    Raises:
+        FichierInvalide: Si les données ne sont pas une sauvegarde, ou si sa version n'est pas supportée.
+
+    """
+    if not donnees.startswith(SIGNATURE):
+        return _lire_json(donnees)
+
+    if len(donnees) < ENTETE.size + TAILLE_ECHIQUIER:
+        raise FichierInvalide("Ce fichier n'est pas une sauvegarde de partie")
+    _, version, trait, temps_blanc, temps_noir, nombre = ENTETE.unpack_from(donnees)
+    if (version != VERSION or trait >= len(COULEURS)
+            or len(donnees) != ENTETE.size + TAILLE_ECHIQUIER + 2 * nombre):
+        raise FichierInvalide("Ce fichier n'est pas une sauvegarde de partie, ou sa version n'est pas supportée")
+
+    echiquier = donnees[ENTETE.size:ENTETE.size + TAILLE_ECHIQUIER]
+    if max(echiquier) > len(PIECES):
+        raise FichierInvalide("L'échiquier de cette sauvegarde n'est pas valide")
+    pieces = {CASES[case]: PIECES[valeur - 1] for case, valeur in enumerate(echiquier) if valeur}
+
+    deplacements = [decoder_deplacement(code)
+                    for code in struct.unpack_from('<{}H'.format(nombre), donnees, ENTETE.size + TAILLE_ECHIQUIER)]
+
+    return EtatSauvegarde(pieces, COULEURS[trait], temps_blanc, temps_noir, deplacements)
@@ -0,0 +1,203 @@
+# -*- coding: utf-8 -*-
+"""Module contenant la table de transposition du moteur, qui conserve le résultat de la recherche des positions déjà
+visitées. Une même position est souvent atteinte par plusieurs ordres de déplacements: son résultat est alors réutilisé
+plutôt que cherché de nouveau.
+
+La table occupe une taille fixe, choisie à sa création. Elle est divisée en seaux de deux entrées, indexés par les bits
+de poids faible de la clé de Zobrist de la position (voir le module zobrist):
+    - la première entrée d'un seau conserve le résultat le plus profond (elle n'est remplacée que par une recherche au
+      moins aussi profonde, ou par une entrée d'une recherche plus récente);
+    - la seconde entrée est toujours remplacée.
+
+Chaque entrée occupe deux entiers de 64 bits: la clé complète de la position, puis les données de l'entrée regroupées
+dans un seul entier (voir _compresser). Les entiers sont conservés dans un array, ou dans une mémoire fournie par
+l'appelant, par exemple une mémoire partagée entre plusieurs processus (voir le module parallele).
+
+La clé est conservée combinée (par XOR) avec les données. Si deux processus écrivent la même entrée en même temps, et
+que la clé de l'un se retrouve avec les données de l'autre, la clé lue ne correspond plus à la position cherchée:
+l'entrée est simplement ignorée, sans qu'un verrou soit nécessaire.
+
+"""
+from echecs.cases import CASES, INDEX_CASES
+from array import array
+
+# Le type de score conservé dans une entrée: le score exact, ou seulement une borne inférieure ou supérieure, lorsque la
+# recherche de la position a été interrompue par l'élagage alpha-bêta.
+EXACTE = 1
+INFERIEURE = 2
+SUPERIEURE = 3
+
+# La taille d'une entrée (clé et données), en octets, et le nombre d'entrées par seau.
+TAILLE_ENTREE = 16
+ENTREES_PAR_SEAU = 2
+
+# Le décalage ajouté aux scores, qui sont signés, pour les conserver dans 32 bits non signés.
+DECALAGE_SCORE = 1 << 31
+
+# La position des champs dans les données d'une entrée. Le bit PRESENT est toujours à 1, ce qui distingue une entrée
+# remplie (même de valeurs nulles) d'une entrée vide.
+BIT_PROFONDEUR = 32
+BIT_BORNE = 40
+BIT_SOURCE = 42
+BIT_CIBLE = 48
+BIT_DEPLACEMENT = 54
+BIT_GENERATION = 55
+BIT_PRESENT = 63
+
+
+def _compresser(profondeur, score, borne, deplacement, generation):
+    """Regroupe les données d'une entrée dans un seul entier de 64 bits.
+
+    Args:
+        profondeur (int): La profondeur de la recherche, entre 0 et 255.
+        score (int): Le score, sur 32 bits signés.
+        borne (int): Le type de score (EXACTE, INFERIEURE ou SUPERIEURE).
+        deplacement (tuple or None): La position source et la position cible du meilleur déplacement, ou None.
+        generation (int): La génération de la recherche, entre 0 et 255.
+
+    Returns:
+        int: Les données regroupées.
+
+    """
+    donnees = ((score + DECALAGE_SCORE) | profondeur << BIT_PROFONDEUR | borne << BIT_BORNE
+               | generation << BIT_GENERATION | 1 << BIT_PRESENT)
+
+    if deplacement is not None:
+        donnees |= (INDEX_CASES[deplacement[0]] << BIT_SOURCE | INDEX_CASES[deplacement[1]] << BIT_CIBLE
+                    | 1 << BIT_DEPLACEMENT)
+
+    return donnees
+
+
+class TableTransposition:
+    """Une table de transposition de taille fixe.
+
+    Attributes:
+        nombre_seaux (int): Le nombre de seaux de la table, une puissance de deux.
+        entrees (array or memoryview): Les entrées de la table: pour l'entrée i, la clé (combinée aux données) est à
+            l'index 2i et les données à 2i + 1.
+        generation (int): La génération de la recherche en cours (voir nouvelle_recherche).
+        succes (int): Le nombre de positions trouvées dans la table.
+        echecs (int): Le nombre de positions absentes de la table.
+        collisions (int): Parmi les positions absentes, le nombre dont le seau était occupé par d'autres positions.
+
+    Args:
+        taille_mo (float): La taille maximale de la table, en mégaoctets.
+        memoire (buffer): La mémoire où conserver les entrées, d'au moins taille_mo mégaoctets, ou None pour l'allouer.
+            Son contenu est utilisé tel quel: une mémoire neuve doit être remplie de zéros.
+
+    """
+
+    def __init__(self, taille_mo=16, memoire=None):
+        # Le nombre de seaux est arrondi à la puissance de deux inférieure, afin de trouver le seau d'une clé par un
+        # simple masque de bits.
+        nombre_seaux = max(1, int(taille_mo * 1024 * 1024) // (TAILLE_ENTREE * ENTREES_PAR_SEAU))
+        self.nombre_seaux = 1 << (nombre_seaux.bit_length() - 1)
+        self.masque = self.nombre_seaux - 1
+        taille_octets = self.nombre_seaux * TAILLE_ENTREE * ENTREES_PAR_SEAU
+
+        if memoire is None:
+            self.entrees = array('Q', bytes(taille_octets))
+        else:
+            self.entrees = memoryview(memoire)[:taille_octets].cast('Q')
+        self.generation = 0
+        self.succes = 0
+        self.echecs = 0
+        self.collisions = 0
+
+    @property
+    def taille_mo(self):
+        return self.nombre_seaux * TAILLE_ENTREE * ENTREES_PAR_SEAU / (1024 * 1024)
+
+    @property
+    def taux_succes(self):
+        sondages = self.succes + self.echecs
+        return self.succes / sondages if sondages else 0
+
+    def vider(self):
+        """Vide la table et remet ses compteurs à zéro, par exemple entre deux parties.
+
+        """
+        self.entrees[:] = array('Q', bytes(len(self.entrees) * self.entrees.itemsize))
+        self.generation = 0
+        self.succes = 0
+        self.echecs = 0
+        self.collisions = 0
+
+    def nouvelle_recherche(self):
+        """Indique le début d'une nouvelle recherche: les entrées des recherches précédentes pourront être remplacées
+        en priorité, même si elles sont plus profondes.
+
+        """
+        self.generation = (self.generation + 1) & 0xFF
+
+    def liberer(self):
+        """Libère la mémoire fournie à la création de la table, qui ne peut plus être utilisée ensuite. Une mémoire
+        partagée ne peut être fermée qu'une fois libérée par la table.
+
+        """
+        if isinstance(self.entrees, memoryview):
+            self.entrees.release()
+
+    def sonder(self, cle):
+        """Cherche une position dans la table.
+
+        Args:
+            cle (int): La clé de Zobrist de la position.
+
+        Returns:
+            tuple or None: La profondeur, le score, le type de score et le meilleur déplacement (ou None) conservés
+                pour la position, ou None si elle n'est pas dans la table.
+
+        """
+        entrees = self.entrees
+        index = (cle & self.masque) * 2 * ENTREES_PAR_SEAU
+
+        for index_entree in range(index, index + 2 * ENTREES_PAR_SEAU, 2):
+            donnees = entrees[index_entree + 1]
+            if donnees and entrees[index_entree] ^ donnees == cle:
+                self.succes += 1
+                deplacement = None
+                if donnees >> BIT_DEPLACEMENT & 1:
+                    deplacement = CASES[donnees >> BIT_SOURCE & 0x3F], CASES[donnees >> BIT_CIBLE & 0x3F]
+                return ((donnees >> BIT_PROFONDEUR & 0xFF), (donnees & 0xFFFFFFFF) - DECALAGE_SCORE,
+                        donnees >> BIT_BORNE & 0x3, deplacement)
+
+        self.echecs += 1
+        if entrees[index + 1] or entrees[index + 3]:
+            self.collisions += 1
+
+        return None
+
+    def enregistrer(self, cle, profondeur, score, borne, deplacement):
+        """Conserve le résultat de la recherche d'une position, selon la politique de remplacement décrite dans la
+        documentation du module.
+
+        Args:
+            cle (int): La clé de Zobrist de la position.
+            profondeur (int): La profondeur de la recherche.
+            score (int): Le score de la position.
+            borne (int): Le type de score (EXACTE, INFERIEURE ou SUPERIEURE).
+            deplacement (tuple or None): La position source et la position cible du meilleur déplacement, ou None.
+
+        """
+        entrees = self.entrees
+        index = (cle & self.masque) * 2 * ENTREES_PAR_SEAU
+        cle_profonde, donnees_profonde = entrees[index], entrees[index + 1]
+
+        if (not donnees_profonde or cle_profonde ^ donnees_profonde == cle
+                or profondeur >= (donnees_profonde >> BIT_PROFONDEUR & 0xFF)
+                or (donnees_profonde >> BIT_GENERATION & 0xFF) != self.generation):
+            # L'entrée la plus profonde est remplacée. Si elle conservait une autre position, celle-ci est déplacée
+            # dans la seconde entrée plutôt que d'être perdue.
+            if donnees_profonde and cle_profonde ^ donnees_profonde != cle:
+                entrees[index + 2] = cle_profonde
+                entrees[index + 3] = donnees_profonde
+            elif entrees[index + 2] ^ entrees[index + 3] == cle:
+                entrees[index + 3] = 0
+        else:
+            index += 2
+
+        donnees = _compresser(min(profondeur, 0xFF), score, borne, deplacement, self.generation)
+        entrees[index] = cle ^ donnees
+        entrees[index + 1] = donnees
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""Module contenant le travailleur du moteur: un processus séparé qui exécute les recherches, afin que l'interface
+graphique continue de répondre pendant que le moteur réfléchit.
+
+L'interface envoie ses demandes au travailleur et vérifie régulièrement (par exemple avec la méthode after de Tk) si
+un résultat est arrivé, sans jamais attendre. Le processus conserve sa table de transposition d'une recherche à
+l'autre.
+
+Pendant que l'adversaire humain réfléchit, le travailleur peut aussi réfléchir (pondering) sur la position qui suivra
+la réponse prévue par sa dernière recherche. Si l'humain joue bien cette réponse, la réflexion en cours devient la
+recherche du prochain déplacement: elle reçoit simplement une échéance, et tout le travail déjà fait est conservé.
+Sinon, elle est annulée et une nouvelle recherche est demandée.
+
+"""
+from echecs.moteur import budget_selon_chronometres, chercher, ResultatRecherche, COULEUR_ADVERSE
+from echecs.partie import Partie, REPRESENTATIONS
+from echecs.piece import PIECES
+from echecs.transposition import TableTransposition
+from multiprocessing import get_context
+from queue import Empty
+from time import perf_counter
+
+# La taille de la table de transposition du travailleur, en mégaoctets.
+TAILLE_TABLE_TRAVAILLEUR_MO = 32
+
+
+def _boucle_travailleur(requetes, resultats, arret, taille_mo):
+    """Boucle principale du processus travailleur: exécute chaque demande reçue et transmet son résultat, jusqu'à
+    recevoir None.
+
+    Args:
+        requetes (Queue): Les demandes: l'identifiant, la représentation, les paires (position, index de la pièce),
+            la couleur du joueur qui doit jouer et le budget de temps.
+        resultats (Queue): La file où transmettre l'identifiant de la demande et le résultat de la recherche.
+        arret (Event): L'événement qui interrompt la recherche en cours.
+        taille_mo (float): La taille de la table de transposition, en mégaoctets.
+
+    """
+    table = TableTransposition(taille_mo)
+
+    for requete in iter(requetes.get, None):
+        identifiant, representation, pieces, couleur, budget = requete
+
+        partie = Partie(representation, pieces={position: PIECES[index] for position, index in pieces})
+        partie.joueur_actif = couleur
+
+        resultat = chercher(partie, budget, table=table, arret=arret)
+        resultats.put((identifiant, resultat.deplacement, resultat.score, resultat.profondeur, resultat.noeuds,
+                       resultat.duree, resultat.taux_coupure_premier_deplacement, resultat.reponse_prevue))
+
+
+class TravailleurMoteur:
+    """Le côté interface du travailleur: envoie les demandes au processus et reçoit ses résultats. Aucune méthode
+    n'attend le processus, sauf fermer.
+
+    Le processus n'exécute qu'une demande à la fois. Une nouvelle demande annule celle en cours; elle n'est envoyée
+    qu'une fois le résultat (ignoré) de celle-ci reçu, ce qui évite qu'une annulation vise la mauvaise demande.
+
+    Attributes:
+        cle_attendue (int or None): La clé de hachage de la position de la recherche en cours, ou None. Un résultat
+            dont la position ne correspond plus à la partie (par exemple après une annulation de déplacement) peut
+            ainsi être ignoré par l'appelant.
+
+    Args:
+        taille_mo (float): La taille de la table de transposition du processus, en mégaoctets.
+
+    """
+
+    def __init__(self, taille_mo=TAILLE_TABLE_TRAVAILLEUR_MO):
+        # Le processus est démarré sans copier celui de l'interface (et sa connexion à l'affichage).
+        contexte = get_context('spawn')
+        self._requetes = contexte.Queue()
+        self._resultats = contexte.Queue()
+        self._arret = contexte.Event()
+        self._processus = contexte.Process(target=_boucle_travailleur, daemon=True,
+                                           args=(self._requetes, self._resultats, self._arret, taille_mo))
+        self._processus.start()
+
+        self._identifiant = 0
+        self._en_cours = None
+        self._en_attente = None
+        self._reflexion = None
+        self._echeance = None
+        self._resultat_reflexion = None
+        self.cle_attendue = None
+
+    def _demander(self, partie, couleur, budget, pieces=None):
+        if pieces is None:
+            pieces = tuple((position, piece.index) for position, piece in partie.echiquier.dictionnaire_pieces.items())
+        representation = next(nom for nom, classe in REPRESENTATIONS.items() if type(partie.echiquier) is classe)
+
+        self._identifiant += 1
+        self._resultat_reflexion = None
+        requete = (self._identifiant, representation, pieces, couleur, budget)
+
+        if self._en_cours is None:
+            self._envoyer(requete)
+        else:
+            self._en_attente = requete
+            self._arret.set()
+
+        return requete
+
+    def _envoyer(self, requete):
+        # Le processus est inactif: l'événement d'arrêt peut être remis à zéro sans risque.
+        self._arret.clear()
+        self._requetes.put(requete)
+        self._en_cours = requete[0]
+
+    def chercher(self, partie, budget=None):
+        """Demande la recherche du meilleur déplacement du joueur actif d'une partie, en annulant toute recherche ou
+        réflexion en cours.
+
+        Args:
+            partie (Partie): La partie en cours.
+            budget (float): Le temps accordé à la recherche, en secondes. Par défaut, il est calculé à partir des
+                chronomètres de la partie.
+
+        """
+        if budget is None:
+            budget = budget_selon_chronometres(partie)
+
+        self._reflexion = None
+        self._echeance = None
+        self.cle_attendue = partie.echiquier.cle_hash
+        self._demander(partie, partie.joueur_actif, budget)
+
+    def reflechir(self, partie, reponse_prevue):
+        """Commence à réfléchir, sans limite de temps, à la position qui suivra la réponse prévue du joueur actif
+        (l'adversaire du moteur). La réflexion dure jusqu'à ce que la réponse jouée soit connue (voir
+        reponse_jouee).
+
+        Args:
+            partie (Partie): La partie en cours, où c'est à l'adversaire du moteur de jouer.
+            reponse_prevue (tuple): La position source et la position cible de la réponse prévue.
+
+        """
+        position_source, position_cible = reponse_prevue
+        pieces = {position: piece.index for position, piece in partie.echiquier.dictionnaire_pieces.items()}
+        if position_source not in pieces:
+            return
+        pieces[position_cible] = pieces.pop(position_source)
+
+        requete = self._demander(partie, COULEUR_ADVERSE[partie.joueur_actif], float('inf'),
+                                 pieces=tuple(pieces.items()))
+        # La position est conservée avec la réponse: la même réponse, jouée dans une autre position (par exemple
+        # après une annulation), ne doit pas reprendre cette réflexion.
+        self._reflexion = requete[0], reponse_prevue, frozenset(pieces.items())
+        self._echeance = None
+        self.cle_attendue = None
+
+    def reponse_jouee(self, partie, reponse, budget=None):
+        """Indique la réponse que l'adversaire a jouée. Si elle avait été prévue, la réflexion en cours devient la
+        recherche du prochain déplacement, avec le budget reçu. Sinon, une nouvelle recherche est demandée.
+
+        Args:
+            partie (Partie): La partie en cours, où la réponse a été jouée.
+            reponse (tuple): La position source et la position cible de la réponse jouée.
+            budget (float): Le temps accordé à la recherche, en secondes. Par défaut, il est calculé à partir des
+                chronomètres de la partie.
+
+        Returns:
+            bool: True si la réponse avait été prévue, et False autrement.
+
+        """
+        if budget is None:
+            budget = budget_selon_chronometres(partie)
+
+        pieces = frozenset((position, piece.index)
+                           for position, piece in partie.echiquier.dictionnaire_pieces.items())
+        if self._reflexion is not None and self._reflexion[1:] == (tuple(reponse), pieces):
+            self._reflexion = None
+            self.cle_attendue = partie.echiquier.cle_hash
+            # La réflexion a pu se terminer d'elle-même (par exemple en trouvant une victoire): son résultat a alors
+            # été conservé, et sera retourné au prochain appel de resultat.
+            if self._resultat_reflexion is None:
+                self._echeance = perf_counter() + budget
+            return True
+
+        self.chercher(partie, budget)
+        return False
+
+    def annuler(self):
+        """Annule la recherche ou la réflexion en cours: son résultat sera ignoré.
+
+        """
+        self._reflexion = None
+        self._echeance = None
+        self._en_attente = None
+        self._resultat_reflexion = None
+        self.cle_attendue = None
+        if self._en_cours is not None:
+            self._arret.set()
+
+    def resultat(self):
+        """Vérifie, sans attendre, si le résultat de la recherche demandée est arrivé. Doit être appelée régulièrement:
+        c'est aussi elle qui arrête une réflexion devenue recherche lorsque son budget est écoulé.
+
+        Returns:
+            ResultatRecherche or None: Le résultat de la dernière recherche demandée, ou None s'il n'est pas encore
+                arrivé. Les résultats des réflexions et des demandes annulées ne sont jamais retournés.
+
+        """
+        if self._resultat_reflexion is not None and self._reflexion is None and self.cle_attendue is not None:
+            donnees, self._resultat_reflexion = self._resultat_reflexion, None
+            return ResultatRecherche(*donnees)
+
+        if self._echeance is not None and perf_counter() >= self._echeance:
+            self._echeance = None
+            self._arret.set()
+
+        try:
+            identifiant, *donnees = self._resultats.get_nowait()
+        except Empty:
+            return None
+
+        self._en_cours = None
+        if self._en_attente is not None:
+            self._envoyer(self._en_attente)
+            self._en_attente = None
+            return None
+
+        # Le résultat d'une demande remplacée ou annulée est ignoré. Celui d'une réflexion n'est utile que si elle
+        # devient une recherche: il est conservé en attendant la réponse jouée.
+        if identifiant != self._identifiant:
+            return None
+        if self._reflexion is not None:
+            self._resultat_reflexion = donnees
+            return None
+        if self.cle_attendue is None:
+            return None
+
+        self._echeance = None
+        return ResultatRecherche(*donnees)
+
+    def fermer(self):
+        """Arrête la recherche en cours et termine le processus.
+
+        """
+        self._arret.set()
+        self._requetes.put(None)
+        self._processus.join(timeout=1)
+        if self._processus.is_alive():
+            self._processus.terminate()
@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""Module contenant les clés de hachage de Zobrist, qui servent à calculer la clé d'une position.
+
+La clé d'une position est le ou exclusif (XOR) des clés de chaque pièce sur sa case, auquel on ajoute CLE_TRAIT
+lorsque c'est au joueur noir de jouer. Déplacer une pièce ne demande donc que de retirer (par XOR) la clé de la pièce
+sur sa case source, puis d'ajouter celle de la pièce sur sa case cible.
+
+Les clés sont tirées d'un générateur initialisé avec une graine fixe: une même position a la même clé d'une exécution
+à l'autre, ce qui permet de les conserver dans des fichiers.
+
+"""
+import random
+
+GRAINE = 20200415
+
+_generateur = random.Random(GRAINE)
+
+# CLES_PIECES[index_piece][case] contient la clé de la pièce PIECES[index_piece] (voir le module piece) sur la case.
+CLES_PIECES = tuple(tuple(_generateur.getrandbits(64) for case in range(64)) for index_piece in range(12))
+
+# Clé ajoutée lorsque c'est au joueur noir de jouer.
+CLE_TRAIT = _generateur.getrandbits(64)
@@ -1,18 +1,19 @@
 import webbrowser
-import json
 from tkinter import Canvas, Label, Tk, Button, LabelFrame, messagebox
 from echecs.partie import Partie
-from echecs.exceptions import ExceptionDeplacer, MauvaiseCouleur
-from echecs.piece import Pion, Tour, Fou, Cavalier, Roi, Dame
+from echecs.exceptions import ExceptionDeplacer, MauvaiseCouleur, FichierInvalide
+from echecs.travailleur import TravailleurMoteur
+from echecs.journal import Journal
 
 # Variables globales utilisées
 theme = '#4897c7'
 theme_echiquier = '#74a6c4'
 theme_selection = '#3d5869'
 position = None
-piece_mangee = {}
-qte_pieces_avant = 0
-qte_pieces_apres = 0
+
+# Le délai entre deux vérifications du travailleur du moteur, en millisecondes. Chaque vérification ne fait que lire
+# une file sans attendre: l'interface reste fluide pendant que le moteur cherche.
+INTERVALLE_MOTEUR = 16
 
 
 class CanvasEchiquier(Canvas):
@@ -182,30 +183,10 @@ class CanvasInformation(Canvas):
         self.chrono_blanc.grid(row=2, column=0)
 
     def annuler_deplacement(self):
-        # Ouvre le fichier et retrouve les positions souhaitées (à la dernière ligne)
-        with open('historique.txt', 'r') as historique:
-            # Trouve la dernière ligne de l'historique et y récupère les informations sur le tour précédent
-            for derniere_ligne in historique:
-                pass
-            derniere_ligne = derniere_ligne.strip()
-            derniere_ligne = derniere_ligne.split(' ')
-            position_a_retrouver = derniere_ligne[-3]
-            position_actuelle = derniere_ligne[-1]
-
-            # Déplace la pièce à sa position antérieure
-            self.partie.echiquier.dictionnaire_pieces[position_a_retrouver] = self.partie.echiquier.dictionnaire_pieces[position_actuelle]
-            del self.partie.echiquier.dictionnaire_pieces[position_actuelle]
-
-            # Repasse au joueur précédent
-            self.partie.joueur_suivant()
-
-        if qte_pieces_avant != qte_pieces_apres:
-            # Rajoute la piece précédemment mangée
-            self.partie.echiquier.dictionnaire_pieces[position_actuelle] = piece_mangee[position_actuelle]
-
-        # Indique qu'un déplacement a été annulé
-        with open('historique.txt', 'a') as historique:
-            historique.write('DÉPLACEMENT ANNULÉ\n')
+        # Annule le dernier déplacement conservé par la partie, s'il y en a un
+        if self.partie.annuler() is None:
+            return
+
         # Raffraichit l'affichage
         self.raffraichir_info()
         self.echiquier.raffraichir_echiquier()
@@ -216,22 +197,8 @@ class CanvasInformation(Canvas):
             self.sauvegarder()
 
         # Remet tout à zéro
-        self.partie.echiquier.initialiser_echiquier_depart()
-        self.partie.joueur_actif = 'blanc'
+        self.partie.recommencer()
         self.position_selectionnee = None
-        self.supprimer_historique()
-
-        self.partie.temps_total_blanc = 0
-        self.partie.temps_total_noir = 0
-
-        self.partie.chrono_blanc_debut = 0
-        self.partie.chrono_noir_debut = 0
-
-        self.partie.chrono_blanc_fin = 0
-        self.partie.chrono_noir_fin = 0
-
-        self.partie.temps_str_blanc = '-'
-        self.partie.temps_str_noir = '-'
 
         self.raffraichir_info()
         self.echiquier.raffraichir_echiquier()
@@ -242,62 +209,23 @@ class CanvasInformation(Canvas):
             self.sauvegarder()
 
         nom_fichier = input("Entrez un nom de sauvegarde à charger: ")
-        with open(nom_fichier, "r") as file:
-            dic = json.load(file)
-            piece = dic['piece']
-            joueur = dic['joueur']
-            temps_blanc = dic['temps_blanc']
-            temps_noir = dic['temps_noir']
-
-            table = {'Pion' : Pion, 'Tour': Tour, 'Cavalier': Cavalier, 'Fou': Fou, 'Roi': Roi, 'Dame': Dame}
-            dic_cls = {}
-            for i in piece:
-                clsname, color = piece[i].split()
-                cls = table[clsname]
-                color = color.lower()
-                instance = cls(color)
-                dic_cls[i] = instance
-
-            # Charge les différentes composantes de la partie
-            self.partie.echiquier.dictionnaire_pieces = dic_cls
-            self.partie.joueur_actif = joueur
-
-            self.partie.temps_total_blanc = temps_blanc
-            self.partie.temps_total_noir = temps_noir
-            self.partie.temps_str_blanc = self.partie.temps_total_a_string(temps_blanc)
-            self.partie.temps_str_noir = self.partie.temps_total_a_string(temps_noir)
-
-            self.raffraichir_info()
-            self.echiquier.raffraichir_echiquier()
+        try:
+            self.partie.charger(nom_fichier)
+        except (OSError, FichierInvalide) as exception:
+            messagebox.showerror("Chargement d'une partie...", str(exception))
+            return
+
+        self.raffraichir_info()
+        self.echiquier.raffraichir_echiquier()
 
     def sauvegarder(self):
         nom_fichier = input("Entrez un nom pour la sauvegarde: ")
-        dic_piece = self.partie.echiquier.dictionnaire_pieces
-        ser_piece = {}
-        for piece in dic_piece:
-            ser_piece[piece] = str(dic_piece[piece])
-
-        # Sauvegarde les différentes composantes de la partie dans un dictionnaire, puis enregistre ce dictionnaire dans un fichier
-        ser_joueur = self.partie.joueur_actif
-        temps_blanc = self.partie.temps_total_blanc
-        temps_noir = self.partie.temps_total_noir
-        dic = {'piece': ser_piece, 'joueur': ser_joueur, 'temps_blanc': temps_blanc, 'temps_noir': temps_noir}
+        # Sauvegarde l'échiquier, le joueur actif, les temps et les déplacements de la partie (voir echecs.sauvegarde)
+        self.partie.sauvegarder(nom_fichier)
 
-        with open(nom_fichier, "w") as file:
-            json.dump(dic, file)
-
-    @staticmethod
-    def afficher_historique():
-        with open('historique.txt', 'r') as historique:
-            info_deplacement = ""
-            for ligne in historique:
-                info_deplacement += ligne.strip() + '\n'
-            messagebox.showinfo(title="Historique des déplacements", message=info_deplacement)
-
-    @staticmethod
-    def supprimer_historique():
-        with open('historique.txt', 'w') as historique:
-            historique.write('')
+    def afficher_historique(self):
+        # Les entrées du journal sont conservées en mémoire: le fichier n'est pas relu.
+        messagebox.showinfo(title="Historique des déplacements", message=str(self.partie.journal))
 
 
 class CanvasMenuPrincipal(Canvas):
@@ -410,15 +338,24 @@ class CanvasMenuPrincipal(Canvas):
 
 
 class Fenetre(Tk):
-    def __init__(self):
+    def __init__(self, representation='dictionnaire', couleur_moteur=None):
         super().__init__()
 
         # Quelques paramètres d'initialisation
         self.title("Jeu d'échec IFT-1004")
 
-        self.partie = Partie()
+        # Les déplacements sont inscrits dans le journal historique.txt, vidé à chaque lancement du jeu.
+        self.partie = Partie(representation, Journal('historique.txt'))
         self.position_selectionnee = None
-        self.supprimer_historique()
+
+        # Le moteur joue les pièces de cette couleur, s'il y en a une. Il cherche dans un processus séparé, que la
+        # fenêtre vérifie régulièrement.
+        self.couleur_moteur = couleur_moteur
+        self.moteur = None
+        self.canvas_information = None
+        if couleur_moteur is not None:
+            self.moteur = TravailleurMoteur()
+            self.after(INTERVALLE_MOTEUR, self.verifier_moteur)
 
         self.canvas_echiquier = CanvasEchiquier(self, 60, self.partie, self.position_selectionnee)
         self.canvas_echiquier.grid(row=0, column=0)
@@ -441,7 +378,50 @@ class Fenetre(Tk):
 
         self.canvas_echiquier.bind('<Button-1>', self.selectionner)
 
+    def destroy(self):
+        if self.moteur is not None:
+            self.moteur.fermer()
+            self.moteur = None
+        self.partie.journal.fermer()
+        super().destroy()
+
+    def verifier_moteur(self):
+        # Joue le déplacement trouvé par le moteur, s'il est arrivé et que la position n'a pas changé entre-temps.
+        resultat = self.moteur.resultat()
+        # Le moteur attend que la partie soit affichée (et non le menu principal) pour jouer.
+        tour_du_moteur = (self.canvas_information is not None and self.partie.joueur_actif == self.couleur_moteur
+                          and not self.partie.partie_terminee())
+
+        if tour_du_moteur and self.moteur.cle_attendue != self.partie.echiquier.cle_hash:
+            # La position a changé sans que le moteur le sache (début de partie, annulation, chargement, etc.)
+            self.moteur.chercher(self.partie)
+        elif tour_du_moteur and resultat is not None and resultat.deplacement is not None:
+            self.jouer_deplacement(*resultat.deplacement)
+            # Réfléchit à la suite pendant que l'adversaire choisit sa réponse
+            if resultat.reponse_prevue is not None and not self.partie.partie_terminee():
+                self.moteur.reflechir(self.partie, resultat.reponse_prevue)
+
+        self.after(INTERVALLE_MOTEUR, self.verifier_moteur)
+
+    def jouer_deplacement(self, position_source, position_cible):
+        # La partie inscrit le déplacement dans son journal
+        self.partie.deplacer_piece(position_source, position_cible)
+
+        self.canvas_information.raffraichir_info()
+        self.canvas_echiquier.raffraichir_echiquier()
+
+        # Regarde si la partie est terminée
+        if self.canvas_echiquier.partie.partie_terminee():
+            self.messages = Label(self.canvas_information.boite_dialogue, text=f"Partie terminée\n Bravo {self.partie.determiner_gagnant()}!", fg="dark red")
+            self.gagnant = messagebox.showinfo(title='Partie Terminée!', message=f"Partie terminée\n Bravo joueur {self.partie.determiner_gagnant()}!")
+            self.messages.pack()
+            self.canvas_echiquier.bind = self.canvas_echiquier.unbind('<Button-1>')
+
     def selectionner(self, event):
+        # Les pièces du moteur ne peuvent pas être déplacées à la souris
+        if self.partie.joueur_actif == self.couleur_moteur:
+            return
+
         # On trouve le numéro de ligne/colonne en divisant les positions en y/x par le nombre de pixels par case.
         ligne = event.y // self.canvas_echiquier.n_pixels_par_case
         colonne = event.x // self.canvas_echiquier.n_pixels_par_case
@@ -481,35 +461,14 @@ class Fenetre(Tk):
                 self.canvas_echiquier.raffraichir_echiquier()
             else:
                 try:
-                    global piece_mangee
-                    global qte_pieces_avant
-                    global qte_pieces_apres
-
-                    # Bloc qui prend en compte si le déplacement a mangé un pion ou pas
-                    piece_mangee = {}
-                    qte_pieces_avant = len(self.partie.echiquier.dictionnaire_pieces)
-                    if self.partie.echiquier.recuperer_piece_a_position(position):
-                        piece_mangee[position] = self.partie.echiquier.recuperer_piece_a_position(position)
-                    self.partie.deplacer_piece(self.position_selectionnee, position)
-                    qte_pieces_apres = len(self.partie.echiquier.dictionnaire_pieces)
-                    # Différents messages selon si une pièce mange ou pas
-                    if qte_pieces_avant != qte_pieces_apres:
-                        self.sauvegarder_historique_mange(self.canvas_echiquier.partie.echiquier.dictionnaire_pieces[position], piece_mangee[position], self.position_selectionnee, position)
-                    else:
-                        self.sauvegarder_historique(self.canvas_echiquier.partie.echiquier.dictionnaire_pieces[position], self.position_selectionnee, position)
-
-                    self.canvas_information.raffraichir_info()
-
+                    deplacement = self.position_selectionnee, position
                     self.position_selectionnee = None
                     position = None
-                    self.canvas_echiquier.raffraichir_echiquier()
+                    self.jouer_deplacement(*deplacement)
 
-                    # Regarde si la partie est terminée
-                    if self.canvas_echiquier.partie.partie_terminee():
-                        self.messages = Label(self.canvas_information.boite_dialogue, text=f"Partie terminée\n Bravo {self.partie.determiner_gagnant()}!", fg="dark red")
-                        self.gagnant = messagebox.showinfo(title='Partie Terminée!', message=f"Partie terminée\n Bravo joueur {self.partie.determiner_gagnant()}!")
-                        self.messages.pack()
-                        self.canvas_echiquier.bind = self.canvas_echiquier.unbind('<Button-1>')
+                    # Le moteur cherche sa réponse, ou poursuit sa réflexion s'il avait prévu ce déplacement
+                    if self.moteur is not None and not self.partie.partie_terminee():
+                        self.moteur.reponse_jouee(self.partie, deplacement)
                 # Exception si le déplacement ne peut être effectué
                 except ExceptionDeplacer:
                     self.messages = Label(self.canvas_information.boite_dialogue, text="Déplacement invalide", fg="dark red")
@@ -520,21 +479,6 @@ class Fenetre(Tk):
 
         self.canvas_echiquier.raffraichir_echiquier()
 
-    @staticmethod
-    def sauvegarder_historique(piece, depart, arrivee):
-        with open('historique.txt', 'a') as historique:
-            historique.write(f'{piece} de {depart} vers {arrivee}\n')
-
-    @staticmethod
-    def sauvegarder_historique_mange(piece_deplacee, piece_mangee, depart, arrivee):
-        with open('historique.txt', 'a') as historique:
-            historique.write(f'{piece_deplacee} MANGE {piece_mangee} de {depart} vers {arrivee}\n')
-
-    @staticmethod
-    def supprimer_historique():
-        with open('historique.txt', 'w') as historique:
-            historique.write('')
-
 
 if __name__ == "__main__":
     Fenetre().mainloop()